@@ -0,0 +1,64 @@
+"""Benchmark of the time taken by ``import easystac``.
+
+Each run imports the package in a fresh interpreter, so the modules cached by a
+previous run do not hide the cost. The heavy dependencies (stackstac, xarray, dask,
+rasterio, pystac_client) are only imported when a stack or a search is built, so they
+should not show up in the list of loaded modules.
+
+Usage::
+
+    python benchmarks/bench_import.py --repeat 10
+    python -X importtime -c "import easystac" 2> importtime.log
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY = ["stackstac", "xarray", "dask", "rasterio", "pystac_client", "pystac"]
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {modules}
+seconds = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+def run(modules):
+    """Imports the modules in a fresh interpreter and returns the measurement."""
+    script = SCRIPT.format(modules=", ".join(modules), heavy=HEAVY)
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--modules",
+        nargs="+",
+        default=["easystac", "easystac.planetary", "easystac.radiant"],
+    )
+    args = parser.parse_args()
+
+    # The first run warms up the bytecode and the filesystem caches
+    run(args.modules)
+    runs = [run(args.modules) for _ in range(args.repeat)]
+    seconds = [r["seconds"] for r in runs]
+
+    print(f"import {', '.join(args.modules)}")
+    print(f"  best:   {min(seconds) * 1000:8.1f} ms")
+    print(f"  median: {statistics.median(seconds) * 1000:8.1f} ms")
+    print(f"  heavy modules loaded: {', '.join(runs[0]['heavy']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
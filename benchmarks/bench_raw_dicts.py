@@ -0,0 +1,85 @@
+"""Microbenchmark of the raw-dict search pipeline against the pystac.Item round trip.
+
+Runs against a local stub STAC API, so no network access is needed. Both pipelines
+sign the items with :code:`easystac.planetary.signing.sign_items()`, as the Planetary
+Computer flavor does. The token cache is seeded with a fake SAS token, so signing does
+not hit the token endpoint either.
+
+Usage::
+
+    python benchmarks/bench_raw_dicts.py --items 20000 --page-size 1000
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+from stac_stub import StubSTAC, make_items  # noqa: E402
+
+from easystac.client import open_client  # noqa: E402
+from easystac.planetary.signing import (  # noqa: E402
+    TokenCache,
+    set_token_cache,
+    sign_items,
+)
+
+
+def seed_token(directory):
+    expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+    path = os.path.join(directory, "tokens.json")
+    with open(path, "w") as f:
+        json.dump(
+            {"stub/data": {"token": "se=fake&sig=fake", "expiry": expiry.isoformat()}},
+            f,
+        )
+    set_token_cache(TokenCache(path=path))
+
+
+def item_objects(search):
+    """Previous pipeline: pystac.Item -> to_dict -> signing."""
+    return sign_items([item.to_dict() for item in search.items()])
+
+
+def raw_dicts(search):
+    """Raw-dict pipeline: page JSON -> in-place signing of each page."""
+    items = []
+    for page in search.pages_as_dicts():
+        items.extend(sign_items(page["features"]))
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        seed_token(directory)
+
+    with StubSTAC(make_items(args.items), page_size=args.page_size) as stac:
+        catalog = open_client(stac.url)
+        for pipeline in [item_objects, raw_dicts]:
+            timings = []
+            for _ in range(args.repeat):
+                search = catalog.search(collections=["stub-collection"])
+                start = time.perf_counter()
+                items = pipeline(search)
+                timings.append(time.perf_counter() - start)
+            assert len(items) == args.items
+            best = min(timings)
+            print(
+                f"{pipeline.__name__:>13}: {best:.3f} s "
+                f"({args.items / best:,.0f} items/s, best of {args.repeat})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Benchmark suite of the query pipeline against a local STAC API and synthetic COGs.
+
+A local stub STAC API serves synthetic items (with a configurable page size and
+latency) whose assets are small Cloud Optimized GeoTIFFs generated on the fly and read
+from disk or through the local HTTP server. For each ImageCollection flavor, the suite
+measures the search throughput, the stack construction time, the peak memory and the
+pixel read rate. The signing cost of the Planetary Computer flavor is measured with a
+seeded token cache, so no network access is needed.
+
+Each run is done in a new process after a discarded warm-up run, so the imports and
+the first connections are not measured and the peak memory (the maximum resident set
+size of the process) includes the native buffers of GDAL and numpy. The median of each
+metric over the runs is reported.
+
+Results are written as JSON, so runs can be compared::
+
+    python benchmarks/suite.py --items 5000 --latency 0.02 --output before.json
+    python benchmarks/suite.py --items 5000 --latency 0.02 --compare before.json
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_bounds
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+from stac_stub import StubSTAC, make_items  # noqa: E402
+
+import easystac  # noqa: E402
+import easystac.planetary as pc  # noqa: E402
+import easystac.radiant as rd  # noqa: E402
+from easystac.planetary.signing import TokenCache, sign_items  # noqa: E402
+
+BANDS = ["B02", "B03", "B04"]
+
+# Each item covers one of the ten tiles laid out by make_items()
+TILES = 10
+
+
+def write_cogs(directory, size):
+    """Writes one synthetic COG per tile and band."""
+    rng = np.random.default_rng(0)
+    for tile in range(TILES):
+        x = -76.5 + tile * 0.1
+        transform = from_bounds(x, 4.0, x + 0.1, 4.1, size, size)
+        for band in BANDS:
+            data = rng.integers(0, 10000, (size, size), dtype="uint16")
+            with rasterio.open(
+                os.path.join(directory, f"{tile}_{band}.tif"),
+                "w",
+                driver="COG",
+                width=size,
+                height=size,
+                count=1,
+                dtype="uint16",
+                crs="EPSG:4326",
+                transform=transform,
+                nodata=0,
+                blocksize=min(size, 256),
+            ) as dst:
+                dst.write(data, 1)
+
+
+def synthetic_items(n, size, base):
+    """Returns items whose assets point to the synthetic COGs."""
+    items = make_items(n)
+    for i, item in enumerate(items):
+        tile = i % TILES
+        bbox = item["bbox"]
+        item["properties"]["proj:shape"] = [size, size]
+        transform = from_bounds(*bbox, size, size)
+        item["properties"]["proj:transform"] = list(transform)[:6] + [0, 0, 1]
+        for band in BANDS:
+            item["assets"][band]["href"] = f"{base}/{tile}_{band}.tif"
+    return items
+
+
+def flavors(url):
+    """Returns the ImageCollection classes benchmarked, pointed to the stub."""
+
+    class Planetary(pc.ImageCollection):
+        def _connection(self):
+            return url, None
+
+    class Radiant(rd.ImageCollection):
+        def _connection(self):
+            return url, {"key": "benchmark"}
+
+    return {
+        "generic": lambda c: easystac.ImageCollection(c).fromSTAC(url),
+        "planetary": Planetary,
+        "radiant": Radiant,
+    }
+
+
+def measure(collection, args):
+    """Runs the search, stack and read stages of a collection."""
+    easystac.clear_clients()
+
+    start = time.perf_counter()
+    items = collection._items(cache=False)
+    search = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stack = collection._stack(items, resolution=0.1 / args.size)
+    build = time.perf_counter() - start
+
+    subset = stack.isel(time=slice(0, args.read))
+    start = time.perf_counter()
+    subset.compute()
+    read = time.perf_counter() - start
+
+    return {
+        "items": len(items),
+        "search_seconds": search,
+        "search_items_per_second": len(items) / search,
+        "stack_seconds": build,
+        "stack_tasks": len(stack.data.__dask_graph__()),
+        "read_seconds": read,
+        "read_pixels_per_second": subset.size / read,
+    }
+
+
+def peak_memory():
+    """Returns the maximum resident set size of the process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run(name, url, args):
+    """Measures a flavor in the current (new) process after a warm-up run."""
+    flavor = flavors(url)[name]
+    measure(flavor("stub-collection"), args)
+    result = measure(flavor("stub-collection"), args)
+    result["peak_memory_bytes"] = peak_memory()
+
+    return result
+
+
+def signing(args, directory):
+    """Measures the batched signing of items with a seeded token cache."""
+    expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+    path = os.path.join(directory, "tokens.json")
+    with open(path, "w") as f:
+        json.dump(
+            {"stub/data": {"token": "se=fake&sig=fake", "expiry": expiry.isoformat()}},
+            f,
+        )
+    default = pc.get_token_cache()
+    pc.set_token_cache(TokenCache(url="http://127.0.0.1:9/token", path=path))
+    try:
+        sign_items(make_items(args.items))
+        items = make_items(args.items)
+        start = time.perf_counter()
+        sign_items(items)
+        seconds = time.perf_counter() - start
+    finally:
+        pc.set_token_cache(default)
+
+    return {
+        "items": args.items,
+        "seconds": seconds,
+        "items_per_second": args.items / seconds,
+    }
+
+
+def median(runs):
+    """Returns the median of each metric over the runs (the lower one if even)."""
+    return {name: statistics.median_low(run[name] for run in runs) for name in runs[0]}
+
+
+def compare(previous, current):
+    """Prints the ratio of each metric against a previous run."""
+    for flavor, metrics in current["results"].items():
+        before = previous.get("results", {}).get(flavor, {})
+        for name, value in metrics.items():
+            if isinstance(value, (int, float)) and before.get(name):
+                print(f"{flavor:>10} {name:>26}: {value / before[name]:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--size", type=int, default=256, help="COG width in pixels")
+    parser.add_argument("--read", type=int, default=10, help="Items read per flavor")
+    parser.add_argument("--assets", choices=["file", "http"], default="file")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_cogs(directory, args.size)
+        with StubSTAC(
+            [], page_size=args.page_size, latency=args.latency, files=directory
+        ) as stac:
+            base = directory if args.assets == "file" else f"{stac.url}/files"
+            stac.items = synthetic_items(args.items, args.size, base)
+            results = {}
+            context = multiprocessing.get_context("spawn")
+            for name in flavors(stac.url):
+                runs = []
+                for _ in range(args.repeat):
+                    with ProcessPoolExecutor(1, mp_context=context) as executor:
+                        runs.append(executor.submit(run, name, stac.url, args).result())
+                results[name] = median(runs)
+            results["signing"] = signing(args, directory)
+
+    report = {
+        "config": vars(args),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "easystac": easystac.__version__,
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+    content = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(content)
+    else:
+        print(content)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
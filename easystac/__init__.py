@@ -3,3 +3,16 @@
 __version__ = "0.0.1"
 
 from .base import ImageCollection
+from .cache import FileCache, SQLiteCache, get_cache, set_cache
+from .client import clear_clients, open_client, set_pool_size, set_rate_limit
+from .filters import Filter
+from .instrumentation import (
+    CounterExporter,
+    LoggingExporter,
+    add_callback,
+    remove_callback,
+    set_instrumentation,
+)
+from .planner import set_worker_memory
+from .saved import SavedQuery
+from .table import ItemTable
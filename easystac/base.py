@@ -1,5 +1,38 @@
-import stackstac
-from pystac_client import Client
+import copy
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from . import dedup, export, instrumentation, planner, reducers, sampling
+from .cache import BaseCache, get_cache, query_key
+from .client import open_client
+from .filters import TOP_LEVEL_FIELDS, Filter, apply_filter, property_column
+from .geometry import MAX_VERTICES, intersecting, prepare_geometry
+from .local import open_local
+from .partition import geometry_bounds, merge_items, split_datetime, split_geometry
+from .saved import SavedQuery
+from .table import ItemTable
+
+PAGE_SIZE = 100
+
+# Properties used by stackstac.stack() to build the stack
+STACK_PROPERTIES = {
+    "datetime",
+    "proj:epsg",
+    "proj:code",
+    "proj:wkt2",
+    "proj:bbox",
+    "proj:shape",
+    "proj:transform",
+}
+
+
+def _store(cache):
+    """Returns the cache of search results to use, or None."""
+    if isinstance(cache, BaseCache):
+        return cache
+
+    return get_cache() if cache else None
 
 
 class BaseImageCollection:
@@ -14,68 +47,1345 @@ class BaseImageCollection:
     collection: str
         Collection name.
 
-    Examples
-    --------
-    >>> import easystac.planetary as pc
-    >>> from geojson import Point
-    >>> pc.Authenticate()
-    >>> pc.Initialize()
-    >>> geom = Point([-76.1,4.3])
-    >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
-            .filterBounds(geom)
-            .filterDate("2020-01-01","2021-01-01")
-            .getInfo(resolution = 10))
-    """
+    Examples
+    --------
+    >>> import easystac.planetary as pc
+    >>> from geojson import Point
+    >>> pc.Authenticate()
+    >>> pc.Initialize()
+    >>> geom = Point([-76.1,4.3])
+    >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+            .filterBounds(geom)
+            .filterDate("2020-01-01","2021-01-01")
+            .getInfo(resolution = 10))
+    """
+
+    def __init__(self, collection):
+        """Initializes the BaseImageCollection object."""
+
+        self.collection = collection
+        """Collection ID."""
+
+        self.datetime = None
+        """Datetime string used to search items."""
+
+        self.geometry = None
+        """GeoJSON geometry used to search items."""
+
+        self.max_vertices = MAX_VERTICES
+        """Maximum number of vertices of the geometry sent to the STAC."""
+
+        self.local = None
+        """Path to the local dump of items used instead of the STAC."""
+
+        self.filter = None
+        """Filter applied to the item properties."""
+
+        self.bands = None
+        """Assets selected from each item."""
+
+        self.properties = None
+        """Properties selected from each item."""
+
+        self.max_items = None
+        """Maximum number of items to retrieve."""
+
+        self.sort = None
+        """Property and direction (True for ascending) used to sort the items."""
+
+        self.window = None
+        """Size in days of the datetime sub-windows searched concurrently."""
+
+        self.tiles = None
+        """Grid of tiles used to split the geometry into concurrent searches."""
+
+        self.workers = 1
+        """Maximum number of concurrent searches."""
+
+        self.merged = []
+        """Collections merged into this collection."""
+
+        self.band_names = {}
+        """Common names of the assets of each merged collection (by collection ID)."""
+
+        self.dedup = None
+        """Options of the de-duplication of the items before stacking."""
+
+    def filterDate(self, initialDate, finalDate):
+        """Initializes the initial and final date for datetime filtering.
+
+        Parameters
+        ----------
+        initialDate: str
+            Initial date in format %Y-%m-%d.
+        finalDate: str
+            Final date in format %Y-%m-%d.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Authenticate()
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterDate("2020-01-01","2021-01-01"))
+        """
+        self.datetime = f"{initialDate}/{finalDate}"
+
+        return self
+
+    def filterBounds(self, geometry, max_vertices=MAX_VERTICES):
+        """Initializes the geometry for bounds filtering.
+
+        Complex geometries (e.g. coastlines or watersheds) are not sent verbatim: the
+        STAC is searched with a simpler geometry that covers them (see
+        :code:`easystac.geometry.prepare_geometry()`) and the returned items are
+        intersected exactly with the geometry client-side, so the items are the same.
+        This requires :code:`shapely`. The stacks are clipped to the bounds of the
+        geometry unless :code:`bounds` or :code:`bounds_latlon` are given.
+
+        Parameters
+        ----------
+        geometry: dict
+            GeoJSON object of dictionary-like object representing a GeoJSON.
+        max_vertices: int
+            Maximum number of vertices of the geometry sent to the STAC. If None, the
+            geometry is always sent verbatim.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> from geojson import Point
+        >>> pc.Authenticate()
+        >>> pc.Initialize()
+        >>> geom = Point([-76.1,4.3])
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom))
+        """
+        self.geometry = geometry
+        self.max_vertices = max_vertices
+
+        return self
+
+    def fromLocal(self, path):
+        """Initializes a local dump of items (NDJSON or Parquet) for querying.
+
+        The dump is loaded once per process and indexed by datetime and geometry, so
+        the filters are answered without any network request. Use
+        :code:`easystac.local.sync()` to build or update the dump.
+
+        Parameters
+        ----------
+        path: str
+            Path to the NDJSON or Parquet file.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac as es
+        >>> S2 = (es.ImageCollection("sentinel-2-l2a")
+                .fromLocal("sentinel-2-l2a.ndjson")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01"))
+        """
+        self.local = path
+
+        return self
+
+    def filterMetadata(self, name, operator, value):
+        """Filters the items by a property.
+
+        The filter is sent to the STAC as a CQL2 :code:`filter` or as a :code:`query`
+        parameter when the STAC supports them, otherwise it is evaluated client-side.
+
+        Parameters
+        ----------
+        name: str
+            Property name (e.g. :code:`eo:cloud_cover`).
+        operator: str
+            One of :code:`equals`, :code:`less_than`, :code:`greater_than`,
+            :code:`not_equals`, :code:`not_less_than`, :code:`not_greater_than`,
+            :code:`starts_with`, :code:`ends_with`, :code:`contains`,
+            :code:`not_starts_with`, :code:`not_ends_with`, :code:`not_contains`, or
+            a comparison symbol such as :code:`<` or :code:`>=`.
+        value: object
+            Value to compare with.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterDate("2020-01-01","2021-01-01")
+                .filterMetadata("eo:cloud_cover","less_than",20))
+        """
+        return self.filterBy(Filter.metadata(name, operator, value))
+
+    def filterBy(self, filter):
+        """Filters the items by a (compound) filter.
+
+        Parameters
+        ----------
+        filter: Filter
+            Filter to apply. It is combined with the previous filters using :code:`and`.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac as es
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBy(es.Filter.Or(
+                    es.Filter.lt("eo:cloud_cover",10),
+                    es.Filter.eq("s2:mgrs_tile","18NVL"),
+                )))
+        """
+        if self.filter is None:
+            self.filter = filter
+        else:
+            self.filter = Filter.And(self.filter, filter)
+
+        return self
+
+    def select(self, bands, properties=None):
+        """Selects the assets (and optionally the properties) to retrieve.
+
+        The STAC fields extension is used when the STAC supports it, so only the
+        selected assets are transferred; otherwise, the other assets are dropped
+        client-side. The selected assets are also passed to :code:`stackstac.stack()`.
+
+        Parameters
+        ----------
+        bands: list
+            Asset keys to retrieve.
+        properties: list
+            Property names to retrieve. The properties needed for stacking and
+            filtering are always retrieved. If None, all the properties are retrieved.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterDate("2020-01-01","2021-01-01")
+                .select(["B02","B03","B04"]))
+        """
+        self.bands = list(bands)
+        self.properties = list(properties) if properties is not None else None
+
+        return self
+
+    def limit(self, max, property=None, ascending=True):
+        """Limits the number of items, optionally sorted by a property.
+
+        Pagination stops as soon as the maximum number of items is reached. Sorting is
+        done by the STAC when it supports the sort extension, otherwise all the items
+        are retrieved and sorted client-side.
+
+        Parameters
+        ----------
+        max: int
+            Maximum number of items.
+        property: str
+            Property used to sort the items (e.g. :code:`eo:cloud_cover`).
+        ascending: bool
+            Whether to sort in ascending order.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .limit(10, "eo:cloud_cover"))
+        """
+        self.max_items = max
+        self.sort = (property, ascending) if property is not None else None
+
+        return self
+
+    def deduplicate(self, by=None, tolerance=dedup.TOLERANCE, prefer=None, merge=False):
+        """Drops the duplicated scenes and the redundant overlapping tiles.
+
+        Before stacking, the items are grouped by acquisition (same collection,
+        platform and relative orbit, and datetimes at most :code:`tolerance` seconds
+        apart). Within each acquisition, the items are ranked by the fraction of the
+        geometry that they cover and then by their processing version, and the items
+        that add no coverage (e.g. reprocessed copies of a scene) are dropped. This
+        requires :code:`shapely`.
+
+        Parameters
+        ----------
+        by: list
+            Properties whose values must be equal for items of the same acquisition.
+            If None, :code:`constellation`, :code:`platform` and
+            :code:`sat:relative_orbit` are used.
+        tolerance: float
+            Maximum number of seconds between the items of an acquisition.
+        prefer: list
+            Properties giving the processing version of the items (the greatest value
+            is preferred). If None, :code:`s2:processing_baseline`,
+            :code:`processing:version`, :code:`updated` and :code:`created` are used.
+        merge: bool
+            Whether to mosaic the kept tiles of each acquisition into a single time
+            slice.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .deduplicate(merge = True))
+        """
+        self.dedup = {
+            "by": by,
+            "tolerance": tolerance,
+            "prefer": prefer,
+            "merge": merge,
+        }
+
+        return self
+
+    def size(self):
+        """Returns the number of items matched by the search.
+
+        The count reported by the STAC is used when available (a single one-item page
+        is requested). Otherwise, the item ids are counted with a search restricted to
+        the minimum fields.
+
+        Returns
+        -------
+        int
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> (pc.ImageCollection("sentinel-2-l2a")
+            .filterBounds(geom)
+            .filterDate("2020-01-01","2021-01-01")
+            .size())
+        """
+        if self.local is not None:
+            return len(self._localItems())
+
+        if self._others():
+            return len(self._items(cache=False))
+
+        url, parameters = self._connection()
+        catalog = open_client(url, parameters=parameters)
+
+        matched = None
+
+        _, exact = self._prepare(self._query())
+
+        if exact is None and (self.filter is None or self._pushdown(catalog)):
+            search = self._search(url=url, parameters=parameters)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                matched = search.matched()
+
+        if matched is None:
+            collection = copy.copy(self).select([], properties=[])
+            matched = sum(len(page) for page in collection.iterPages(cache=False))
+
+        if self.max_items is not None:
+            matched = min(matched, self.max_items)
+
+        return matched
+
+    def first(self):
+        """Returns the first item of the search.
+
+        Returns
+        -------
+        dict
+            STAC item as a dictionary, or None if the search is empty.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> item = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .limit(1, "eo:cloud_cover")
+                .first())
+        """
+        collection = copy.copy(self)
+        collection.max_items = 1 if self.max_items is None else min(self.max_items, 1)
+
+        return next(collection.iterItems(cache=False), None)
+
+    def merge(self, collection, bands=None):
+        """Merges another collection into this collection.
+
+        Collections of the same STAC with the same filters are retrieved with a single
+        multi-collection search. Collections of other STAC are searched concurrently.
+        The items are sorted by datetime and, unless assets are selected, only the
+        assets shared by all the items are stacked.
+
+        Collections often name the same band differently (e.g. :code:`B04` and
+        :code:`red`) or give the same name to different bands (e.g. :code:`B05` of
+        HLS L30 and S30), so their assets can be renamed to common names before
+        stacking. The assets of a collection with common names that are not mapped
+        are not stacked.
+
+        Parameters
+        ----------
+        collection: BaseImageCollection
+            Collection to merge.
+        bands: dict
+            Common names of the assets of each collection: a dictionary of collection
+            IDs (of this or the merged collection) to dictionaries of asset keys to
+            common names.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> L30 = (pc.ImageCollection("hls2-l30")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01"))
+        >>> HLS = (pc.ImageCollection("hls2-s30")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .merge(L30, bands = {
+                    "hls2-s30": {"B04": "red", "B8A": "nir"},
+                    "hls2-l30": {"B04": "red", "B05": "nir"},
+                })
+                .getInfo(resolution = 30))
+        """
+        parts = []
+        for part in [collection] + collection.merged:
+            part = copy.copy(part)
+            part.merged = []
+            parts.append(part)
+        self.merged = self.merged + parts
+        self.band_names = {**self.band_names, **collection.band_names, **(bands or {})}
+
+        return self
+
+    def save(self, path):
+        """Returns a saved query that persists the items of the collection.
+
+        Refreshing the saved query only fetches the items that are newer than the last
+        :code:`datetime` (or :code:`updated`) value seen, so a query over a growing
+        datetime interval costs the same as the new items.
+
+        Parameters
+        ----------
+        path: str
+            Directory where the state and the items are stored.
+
+        Returns
+        -------
+        SavedQuery
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2030-01-01")
+                .save("~/easystac/s2-site"))
+        >>> S2.refresh()
+        >>> image_collection = S2.getInfo(resolution = 10)
+        """
+        return SavedQuery(self, path)
+
+    def partitionDate(self, days=30, workers=4):
+        """Splits the datetime interval into sub-windows that are searched concurrently.
+
+        The items found in all the sub-windows are merged, de-duplicated by id and
+        sorted by datetime and id.
+
+        Parameters
+        ----------
+        days: float
+            Size of each sub-window in days.
+        workers: int
+            Maximum number of concurrent searches.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterDate("2018-01-01","2022-01-01")
+                .partitionDate(days = 90, workers = 8))
+        """
+        self.window = days
+        self.workers = workers
+
+        return self
+
+    def partitionBounds(self, tiles=None, workers=4):
+        """Splits the geometry into parts that are searched concurrently.
+
+        Multi-part geometries are always split into their parts. If :code:`tiles` is
+        given, the geometry is also split into a grid of tiles (this requires
+        :code:`shapely`). The items found in all the parts are merged, de-duplicated by
+        id and sorted by datetime and id.
+
+        Parameters
+        ----------
+        tiles: int | tuple
+            Number of tiles of the grid along x and y. An integer is used for both axes.
+        workers: int
+            Maximum number of concurrent searches.
+
+        Returns
+        -------
+        BaseImageCollection
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(country)
+                .filterDate("2020-01-01","2021-01-01")
+                .partitionBounds(tiles = (4, 4), workers = 16))
+        """
+        self.tiles = tiles if tiles is not None else 1
+        self.workers = workers
+
+        return self
+
+    def _search(self, url, parameters=None, query=None):
+        """Computes the searching process through the STAC catalog.
+
+        Parameters
+        ----------
+        url: str
+            STAC Catalog url.
+        parameters: dict
+            Dictionary of query parameters.
+        query: dict
+            Dictionary of search parameters. If None, the search parameters of the
+            collection are used.
+
+        Returns
+        -------
+        ItemSearch
+        """
+        from pystac_client.conformance import ConformanceClasses
+
+        catalog = open_client(url, parameters=parameters)
+
+        query = dict(query or self._query())
+
+        if query.pop("filter", None) is not None:
+            pushdown = self._pushdown(catalog)
+            query.update(pushdown)
+            if not pushdown:
+                # The items are filtered client-side, so the limit is applied later
+                query.pop("max_items", None)
+
+        if not self._sorted(catalog):
+            # The items are sorted client-side, so all of them are needed
+            query.pop("sortby", None)
+            query.pop("max_items", None)
+
+        fields = query.pop("fields", None)
+
+        if fields is not None and catalog.conforms_to(ConformanceClasses.FIELDS):
+            query["fields"] = fields
+
+        search = catalog.search(**query)
+
+        return search
+
+    def _sorted(self, catalog):
+        """Returns whether the STAC sorts the items (if a sort was requested)."""
+        from pystac_client.conformance import ConformanceClasses
+
+        return self.sort is None or catalog.conforms_to(ConformanceClasses.SORT)
+
+    def _pushdown(self, catalog):
+        """Returns the search parameters that send the filter to the STAC.
+
+        Parameters
+        ----------
+        catalog: pystac_client.Client
+            Opened STAC client.
+
+        Returns
+        -------
+        dict
+            Empty if the STAC supports neither CQL2 filters nor the query extension.
+        """
+        from pystac_client.conformance import ConformanceClasses
+
+        if catalog.conforms_to(ConformanceClasses.FILTER):
+            return {"filter": self.filter.to_cql2(), "filter_lang": "cql2-json"}
+
+        query = self.filter.to_query()
+
+        if query is not None and catalog.conforms_to(ConformanceClasses.QUERY):
+            return {"query": query}
+
+        return {}
+
+    def _partitions(self):
+        """Returns the search parameters of each concurrent sub-search.
+
+        Returns
+        -------
+        list
+        """
+        query = self._query()
+
+        windows = [self.datetime]
+        if self.window is not None and self.datetime is not None:
+            windows = split_datetime(self.datetime, self.window)
+
+        geometries = [self.geometry]
+        if self.tiles is not None and self.geometry is not None:
+            geometries = self._tiles()
+
+        return [
+            dict(query, datetime=window, intersects=geometry)
+            for geometry in geometries
+            for window in windows
+        ]
+
+    def _tiles(self):
+        """Returns the parts of the geometry searched concurrently."""
+        return split_geometry(self.geometry, None if self.tiles == 1 else self.tiles)
+
+    def _prepare(self, query):
+        """Replaces a complex geometry of the search parameters by a simpler cover.
+
+        Parameters
+        ----------
+        query: dict
+            Dictionary of search parameters.
+
+        Returns
+        -------
+        tuple
+            Search parameters sent to the STAC, and the geometry that the returned
+            items must intersect client-side (None if it was sent verbatim).
+        """
+        geometry = query.get("intersects")
+        if geometry is None:
+            return query, None
+
+        cover = prepare_geometry(geometry, self.max_vertices)
+        if cover is geometry:
+            return query, None
+
+        # The STAC returns a superset of the items, so the limit is applied later
+        query = dict(query, intersects=cover)
+        query.pop("max_items", None)
+
+        return query, geometry
+
+    def _shares(self, other):
+        """Returns whether a merged collection can be retrieved in the same search."""
+        if type(other) is not type(self) or self.local or other.local:
+            return False
+
+        attributes = ["datetime", "bands", "properties", "max_items", "sort"]
+        attributes += ["window", "tiles", "geometry"]
+        if any(getattr(self, a) != getattr(other, a) for a in attributes):
+            return False
+
+        filters = [c.filter.to_cql2() if c.filter else None for c in (self, other)]
+
+        return filters[0] == filters[1] and self._connection() == other._connection()
+
+    def _collections(self):
+        """Returns the collection IDs retrieved in the search of the collection."""
+        shared = [c.collection for c in self.merged if self._shares(c)]
+
+        return [self.collection] + shared
+
+    def _others(self):
+        """Returns the merged collections that need their own search."""
+        return [c for c in self.merged if not self._shares(c)]
+
+    def _fetch(self, url, parameters=None):
+        """Fetches the items of the STAC search as dictionaries.
+
+        Parameters
+        ----------
+        url: str
+            STAC Catalog url.
+        parameters: dict
+            Dictionary of query parameters.
+
+        Returns
+        -------
+        list
+        """
+
+        def fetch(query):
+            query, exact = self._prepare(query)
+            with instrumentation.span("search") as span:
+                search = self._search(url=url, parameters=parameters, query=query)
+                items = []
+                pages = 0
+                start = time.perf_counter()
+                for page in search.pages_as_dicts():
+                    instrumentation.event(
+                        "search.page",
+                        duration=time.perf_counter() - start,
+                        items=len(page["features"]),
+                    )
+                    items += page["features"]
+                    pages += 1
+                    start = time.perf_counter()
+                span.set(pages=pages, items=len(items))
+            if exact is not None:
+                items = intersecting(items, exact)
+            return self._project(apply_filter(items, self.filter))
+
+        partitions = self._partitions()
+
+        if len(partitions) == 1:
+            return self._limit(fetch(partitions[0]))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(instrumentation.propagate(fetch), partitions))
+
+        return self._limit(merge_items(results))
+
+    def _localItems(self):
+        """Returns the items of the local dump that match the search.
+
+        Returns
+        -------
+        list
+        """
+        catalog = open_local(self.local)
+        items = catalog.search(**self._query())
+
+        return self._limit(self._project(apply_filter(items, self.filter)))
+
+    def _query(self):
+        """Returns the search parameters of the collection.
+
+        Returns
+        -------
+        dict
+        """
+        return {
+            "intersects": self.geometry,
+            "datetime": self.datetime,
+            "collections": self._collections(),
+            "filter": self.filter.to_cql2() if self.filter is not None else None,
+            "fields": self._fields(),
+            "max_items": self.max_items,
+            "sortby": self._sortby(),
+        }
+
+    def _sortby(self):
+        """Returns the sort extension parameter, or None."""
+        if self.sort is None:
+            return None
+
+        name, ascending = self.sort
+        field = name if name in TOP_LEVEL_FIELDS else f"properties.{name}"
+
+        return [{"field": field, "direction": "asc" if ascending else "desc"}]
+
+    def _limit(self, items):
+        """Sorts and truncates the items according to :code:`limit()`.
+
+        Parameters
+        ----------
+        items: list
+            List of STAC items as dictionaries.
+
+        Returns
+        -------
+        list
+        """
+        if self.sort is not None:
+            name, ascending = self.sort
+            column = property_column(items, name)
+            missing = [item for item, value in zip(items, column) if value is None]
+            present = [
+                (value, item) for item, value in zip(items, column) if value is not None
+            ]
+            present.sort(key=lambda pair: pair[0], reverse=not ascending)
+            items = [item for _, item in present] + missing
+
+        if self.max_items is not None:
+            items = items[: self.max_items]
+
+        return items
+
+    def _fields(self):
+        """Returns the fields extension parameter of the selection, or None.
+
+        Returns
+        -------
+        dict
+        """
+        if self.bands is None and self.properties is None:
+            return None
+
+        include = ["id", "type", "stac_version", "stac_extensions", "collection"]
+        include += ["bbox", "geometry"]
+
+        if self.properties is None:
+            include.append("properties")
+        else:
+            properties = self._kept_properties()
+            include += [f"properties.{p}" for p in sorted(properties)]
+
+        if self.bands is None:
+            include.append("assets")
+        else:
+            include += [f"assets.{band}" for band in self.bands]
+
+        return {"include": include}
+
+    def _kept_properties(self):
+        """Returns the properties kept when only some of them are selected."""
+        keep = set(self.properties) | STACK_PROPERTIES
+        if self.filter is not None:
+            keep |= self.filter.properties()
+        if self.dedup is not None:
+            keep |= set(self.dedup["by"] or dedup.ACQUISITION_PROPERTIES)
+            keep |= set(self.dedup["prefer"] or dedup.PROCESSING_PROPERTIES)
+
+        return keep
+
+    def _project(self, items):
+        """Drops the assets and properties that were not selected, in place.
+
+        Parameters
+        ----------
+        items: list
+            List of STAC items as dictionaries.
+
+        Returns
+        -------
+        list
+        """
+        if self.bands is not None:
+            bands = set(self.bands)
+            for item in items:
+                assets = item.get("assets", {})
+                for key in [key for key in assets if key not in bands]:
+                    del assets[key]
+
+        if self.properties is not None:
+            keep = self._kept_properties()
+            for item in items:
+                properties = item.get("properties", {})
+                for key in [key for key in properties if key not in keep]:
+                    del properties[key]
+
+        return items
+
+    def _connection(self):
+        """Returns the STAC Catalog url and the query parameters used to open it.
+
+        Returns
+        -------
+        tuple
+            STAC Catalog url and dictionary of query parameters.
+        """
+        raise NotImplementedError
+
+    def _sign(self, items):
+        """Prepares the items before stacking them (e.g. signing the asset hrefs).
+
+        Parameters
+        ----------
+        items: list
+            List of STAC items as dictionaries.
+
+        Returns
+        -------
+        list
+        """
+        return items
+
+    def _items(self, cache=True):
+        """Returns the items of the STAC search as dictionaries.
+
+        Parameters
+        ----------
+        cache: bool | BaseCache
+            Whether to use the process-wide cache (see :code:`easystac.set_cache()`).
+            A BaseCache object can also be passed to use it instead.
+
+        Returns
+        -------
+        list
+        """
+        others = self._others()
+
+        if others:
+            primary = copy.copy(self)
+            primary.merged = [c for c in self.merged if c not in others]
+            parts = [primary] + others
+            items = instrumentation.propagate(lambda c: c._items(cache=cache))
+            with ThreadPoolExecutor(max_workers=len(parts)) as executor:
+                results = list(executor.map(items, parts))
+            return self._limit(merge_items(results))
+
+        if self.local is not None:
+            return self._sign(self._localItems())
+
+        url, parameters = self._connection()
+        store = _store(cache)
+        items = None
+
+        if store is not None:
+            key = query_key(url, self._query())
+            with instrumentation.span("cache.get") as span:
+                items = store.get(key)
+                span.set(hits=int(items is not None))
+
+        if items is None:
+            items = self._fetch(url=url, parameters=parameters)
+            if store is not None:
+                store.set(key, items)
+
+        if self.merged and self.sort is None:
+            # The items of a multi-collection search are sorted by datetime
+            items = merge_items([items])
+
+        with instrumentation.span("sign", items=len(items)):
+            return self._sign(items)
+
+    def _stack(self, items, **kwargs):
+        """Stacks the items into a DataArray.
+
+        Parameters
+        ----------
+        items: list
+            List of STAC items as dictionaries.
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
+
+        Returns
+        -------
+        xarray.DataArray
+        """
+        import stackstac
+
+        items = self._deduplicate(items)
+
+        if self.geometry is not None and not {"bounds", "bounds_latlon"} & set(kwargs):
+            bounds = geometry_bounds(self.geometry)
+            # Points and lines have no area to clip to
+            if bounds[0] < bounds[2] and bounds[1] < bounds[3]:
+                kwargs["bounds_latlon"] = bounds
+
+        items = self._harmonize(items, kwargs)
+
+        stack = stackstac.stack(items, **kwargs)
+
+        if self.dedup is not None and self.dedup["merge"]:
+            stack = dedup.merge_acquisitions(
+                stack, items, by=self.dedup["by"], tolerance=self.dedup["tolerance"]
+            )
+
+        return stack
+
+    def _harmonize(self, items, kwargs):
+        """Renames the assets of merged collections and selects the stacked assets.
+
+        Parameters
+        ----------
+        items: list
+            List of STAC items as dictionaries.
+        kwargs: dict
+            Arguments of :code:`stackstac.stack()`, updated in place with the assets.
+
+        Returns
+        -------
+        list
+            Items with their assets renamed to the common names.
+        """
+        if self.band_names:
+            renamed = []
+            for item in items:
+                names = self.band_names.get(item.get("collection"))
+                if names is not None:
+                    assets = item.get("assets", {})
+                    item = dict(
+                        item,
+                        assets={names[k]: v for k, v in assets.items() if k in names},
+                    )
+                renamed.append(item)
+            items = renamed
+        elif self.bands is not None:
+            kwargs.setdefault("assets", self.bands)
+            return items
+
+        if (self.merged or self.band_names) and items and "assets" not in kwargs:
+            # Only the assets shared by all the merged collections are stacked
+            common = set(items[0].get("assets", {}))
+            for item in items[1:]:
+                common &= set(item.get("assets", {}))
+            if not common:
+                raise Exception(
+                    "The merged collections share no assets. Map their assets to "
+                    "common names with merge(collection, bands = {...})."
+                )
+            kwargs["assets"] = sorted(common)
+
+        return items
+
+    def _deduplicate(self, items):
+        """Drops the duplicated items according to :code:`deduplicate()`."""
+        if self.dedup is None:
+            return items
+
+        with instrumentation.span("dedup", items=len(items)) as span:
+            kept = dedup.deduplicate(
+                items,
+                geometry=self.geometry,
+                by=self.dedup["by"],
+                tolerance=self.dedup["tolerance"],
+                prefer=self.dedup["prefer"],
+            )
+            span.set(dropped=len(items) - len(kept))
+
+        return kept
+
+    def iterPages(self, cache=True):
+        """Iterates over the pages of the STAC search without materializing all items.
+
+        Each page is yielded as soon as it is received, so the processing of a page can
+        overlap with the search. When the search is partitioned (see
+        :code:`partitionDate()` and :code:`partitionBounds()`) the partitions are
+        consumed one after the other and the duplicated items are skipped.
+
+        Parameters
+        ----------
+        cache: bool | BaseCache
+            Whether to read the results from the cache of search results (see
+            :code:`easystac.set_cache()`) when they are available. Streamed results are
+            not written to the cache.
+
+        Yields
+        ------
+        list
+            List of STAC items as dictionaries.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterDate("2020-01-01","2021-01-01"))
+        >>> for page in S2.iterPages():
+        >>>     print(len(page))
+        """
+        if self._others():
+            # Collections of other STAC are merged, so all the items are needed
+            items = self._items(cache=cache)
+            for i in range(0, len(items), PAGE_SIZE):
+                yield items[i : i + PAGE_SIZE]
+            return
+
+        if self.local is not None:
+            items = self._localItems()
+            for i in range(0, len(items), PAGE_SIZE):
+                yield self._sign(items[i : i + PAGE_SIZE])
+            return
+
+        url, parameters = self._connection()
+        store = _store(cache)
+
+        if store is not None:
+            items = store.get(query_key(url, self._query()))
+            if items is not None:
+                for i in range(0, len(items), PAGE_SIZE):
+                    yield self._sign(items[i : i + PAGE_SIZE])
+                return
+
+        partitions = self._partitions()
+        catalog = open_client(url, parameters=parameters)
+
+        if self.sort is not None and (len(partitions) > 1 or not self._sorted(catalog)):
+            # Sorting needs all the items before the first page
+            items = self._fetch(url=url, parameters=parameters)
+            for i in range(0, len(items), PAGE_SIZE):
+                yield self._sign(items[i : i + PAGE_SIZE])
+            return
+
+        seen = set()
+        remaining = self.max_items
+        for query in partitions:
+            query, exact = self._prepare(query)
+            search = self._search(url=url, parameters=parameters, query=query)
+            for page in search.pages_as_dicts():
+                items = page["features"]
+                if exact is not None:
+                    items = intersecting(items, exact)
+                items = self._project(apply_filter(items, self.filter))
+                items = [item for item in items if item["id"] not in seen]
+                seen.update(item["id"] for item in items)
+                if remaining is not None:
+                    items = items[:remaining]
+                    remaining -= len(items)
+                if items:
+                    yield self._sign(items)
+                if remaining == 0:
+                    return
 
-    def __init__(self, collection):
-        """Initializes the BaseImageCollection object."""
+    def iterItems(self, cache=True):
+        """Iterates over the items of the STAC search without materializing all items.
 
-        self.collection = collection
-        """Collection ID."""
+        Parameters
+        ----------
+        cache: bool | BaseCache
+            Whether to read the results from the cache of search results (see
+            :code:`easystac.set_cache()`) when they are available.
 
-        self.datetime = None
-        """Datetime string used to search items."""
+        Yields
+        ------
+        dict
+            STAC item as a dictionary.
 
-        self.geometry = None
-        """GeoJSON geometry used to search items."""
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterDate("2020-01-01","2021-01-01"))
+        >>> ids = [item["id"] for item in S2.iterItems()]
+        """
+        for page in self.iterPages(cache=cache):
+            yield from page
 
-    def filterDate(self, initialDate, finalDate):
-        """Initializes the initial and final date for datetime filtering.
+    def getTable(self, properties=("eo:cloud_cover",), cache=True):
+        """Returns the items of the STAC search as a columnar ItemTable.
+
+        The table is built page by page, so the item dicts are never held in memory at
+        the same time.
 
         Parameters
         ----------
-        initialDate: str
-            Initial date in format %Y-%m-%d.
-        finalDate: str
-            Final date in format %Y-%m-%d.
+        properties: tuple
+            Properties kept as columns (besides the datetime).
+        cache: bool | BaseCache
+            Whether to read the results from the cache of search results (see
+            :code:`easystac.set_cache()`) when they are available.
 
         Returns
         -------
-        BaseImageCollection
+        ItemTable
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> table = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .getTable())
+        >>> table.to_parquet("s2.parquet")
+        """
+        return ItemTable.from_pages(self.iterPages(cache=cache), properties=properties)
+
+    def iterInfo(self, size=None, cache=True, **kwargs):
+        """Iterates over stacks of consecutive items of the STAC search.
+
+        Parameters
+        ----------
+        size: int
+            Number of items per stack. If None, one stack is yielded per page.
+        cache: bool | BaseCache
+            Whether to read the results from the cache of search results (see
+            :code:`easystac.set_cache()`) when they are available.
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
+
+        Yields
+        ------
+        xarray.DataArray
+            Chunked DataArray with Dask.
 
         Examples
         --------
         >>> import easystac.planetary as pc
-        >>> pc.Authenticate()
         >>> pc.Initialize()
         >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
                 .filterDate("2020-01-01","2021-01-01"))
+        >>> for image_collection in S2.iterInfo(size = 50, resolution = 10):
+        >>>     image_collection.median("time").compute()
         """
-        self.datetime = f"{initialDate}/{finalDate}"
+        if size is None:
+            for items in self.iterPages(cache=cache):
+                yield self._stack(items, **kwargs)
+            return
 
-        return self
+        items = []
+        for item in self.iterItems(cache=cache):
+            items.append(item)
+            if len(items) == size:
+                yield self._stack(items, **kwargs)
+                items = []
 
-    def filterBounds(self, geometry):
-        """Initializes the geometry for bounds filtering.
+        if items:
+            yield self._stack(items, **kwargs)
+
+    def getTiles(self, cache=True, **kwargs):
+        """Returns one stack per part of the geometry (see :code:`partitionBounds()`).
+
+        Each stack is clipped to the bounds of its part unless :code:`bounds` or
+        :code:`bounds_latlon` are given.
 
         Parameters
         ----------
-        geometry: dict
-            GeoJSON object of dictionary-like object representing a GeoJSON.
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`). Set it to False to always query the STAC.
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
 
         Returns
         -------
-        BaseImageCollection
+        list
+            List of chunked DataArrays with Dask (parts without items are skipped).
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> tiles = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(country)
+                .filterDate("2020-01-01","2020-02-01")
+                .partitionBounds(tiles = (4, 4))
+                .getTiles(resolution = 10))
+        """
+        geometries = self._tiles() if self.geometry is not None else [None]
+
+        def stack(geometry):
+            part = copy.copy(self)
+            part.geometry = geometry
+            part.tiles = None
+            items = part._items(cache=cache)
+            if not items:
+                return None
+            options = dict(kwargs)
+            if geometry is not None and not {"bounds", "bounds_latlon"} & set(options):
+                options["bounds_latlon"] = geometry_bounds(geometry)
+            return self._stack(items, **options)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            stacks = list(executor.map(instrumentation.propagate(stack), geometries))
+
+        return [
+            image_collection
+            for image_collection in stacks
+            if image_collection is not None
+        ]
+
+    def plan(self, memory=None, cache=True, **kwargs):
+        """Returns the chunk size, dtype and bounds planned for the stack.
+
+        See :code:`easystac.planner.plan()`.
+
+        Parameters
+        ----------
+        memory: int
+            Memory of each dask worker in bytes. If None, the memory set with
+            :code:`easystac.set_worker_memory()` is used.
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`).
+        **kwargs
+            Arguments for :code:`stackstac.stack()`. The given arguments are kept.
+
+        Returns
+        -------
+        Plan
+            Arguments for :code:`stackstac.stack()` together with the expected shape,
+            number of tasks and bytes of the stack.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> (pc.ImageCollection("sentinel-2-l2a")
+            .filterBounds(geom)
+            .filterDate("2020-01-01","2021-01-01")
+            .plan(resolution = 10))
+        """
+        return self._plan(self._items(cache=cache), memory=memory, **kwargs)
+
+    def _plan(self, items, memory=None, **kwargs):
+        """Plans the stack of the items (see :code:`plan()`)."""
+        items = self._harmonize(self._deduplicate(items), kwargs)
+
+        return planner.plan(items, geometry=self.geometry, memory=memory, **kwargs)
+
+    def getInfo(self, cache=True, plan=False, **kwargs):
+        """Returns all the information from the STAC search.
+
+        Parameters
+        ----------
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`). Set it to False to always query the STAC.
+        plan: bool
+            Whether to choose the chunk size, dtype and bounds of the stack that are
+            not given (see :code:`plan()`).
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`. Some of them are
+            :code:`epsg`, :code:`resolution`, and :code:`bbox`.
+
+        Returns
+        -------
+        xarray.DataArray
+            Chunked DataArray with Dask. When the instrumentation is enabled (see
+            :code:`easystac.set_instrumentation()`), the Summary of the query is in
+            :code:`attrs["easystac:summary"]`.
 
         Examples
         --------
@@ -85,35 +1395,348 @@ class BaseImageCollection:
         >>> pc.Initialize()
         >>> geom = Point([-76.1,4.3])
         >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
-                .filterBounds(geom))
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .getInfo(resolution = 10, cache = False))
         """
-        self.geometry = geometry
+        with instrumentation.trace() as summary:
+            items = self._items(cache=cache)
 
-        return self
+            if plan:
+                kwargs = self._plan(items, **kwargs).kwargs
 
-    def _search(self, url, parameters=None):
-        """Computes the searching process through the STAC catalog.
+            with instrumentation.span("stack", items=len(items)):
+                image_collection = self._stack(items, **kwargs)
+
+        if summary is not None:
+            image_collection.attrs["easystac:summary"] = summary
+
+        return image_collection
+
+    def median(self, mask=None, cache=True, **kwargs):
+        """Reduces the collection over time by computing the median.
 
         Parameters
         ----------
-        url: str
-            STAC Catalog url.
-        parameters: dict
-            Dictionary of query parameters.
+        mask: xarray.DataArray | callable
+            Boolean mask (or function of the stack that returns it) of the values to
+            keep (e.g. a cloud mask).
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`).
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
 
         Returns
         -------
-        ItemSearch
+        xarray.DataArray
+            Chunked DataArray with Dask, without the time dimension.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .median(resolution = 10))
+        """
+        return reducers.median(self.getInfo(cache=cache, **kwargs), mask=mask)
+
+    def mean(self, mask=None, cache=True, **kwargs):
+        """Reduces the collection over time by computing the mean.
+
+        Parameters
+        ----------
+        mask: xarray.DataArray | callable
+            Boolean mask (or function of the stack that returns it) of the values to
+            keep (e.g. a cloud mask).
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`).
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
+
+        Returns
+        -------
+        xarray.DataArray
+            Chunked DataArray with Dask, without the time dimension.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .mean(resolution = 10))
+        """
+        return reducers.mean(self.getInfo(cache=cache, **kwargs), mask=mask)
+
+    def max(self, mask=None, cache=True, **kwargs):
+        """Reduces the collection over time by computing the maximum.
+
+        Parameters
+        ----------
+        mask: xarray.DataArray | callable
+            Boolean mask (or function of the stack that returns it) of the values to
+            keep (e.g. a cloud mask).
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`).
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
+
+        Returns
+        -------
+        xarray.DataArray
+            Chunked DataArray with Dask, without the time dimension.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .max(resolution = 10))
         """
-        catalog = Client.open(url, parameters=parameters)
+        return reducers.max(self.getInfo(cache=cache, **kwargs), mask=mask)
+
+    def percentile(self, percentiles, mask=None, cache=True, **kwargs):
+        """Reduces the collection over time by computing one or more percentiles.
+
+        Parameters
+        ----------
+        percentiles: float | list
+            Percentile (or list of percentiles) between 0 and 100.
+        mask: xarray.DataArray | callable
+            Boolean mask (or function of the stack that returns it) of the values to
+            keep (e.g. a cloud mask).
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`).
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
+
+        Returns
+        -------
+        xarray.DataArray
+            Chunked DataArray with Dask, without the time dimension.
 
-        search = catalog.search(
-            intersects=self.geometry,
-            datetime=self.datetime,
-            collections=[self.collection],
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .percentile([10, 50, 90], resolution = 10))
+        """
+        return reducers.percentile(
+            self.getInfo(cache=cache, **kwargs), percentiles, mask=mask
         )
 
-        return search
+    def mosaic(self, mask=None, cache=True, **kwargs):
+        """Reduces the collection over time by keeping the first valid value of each pixel.
+
+        The items are used in the order of the time dimension, so stack them with
+        :code:`sortby_date = False` to use the order of :code:`limit()`.
+
+        Parameters
+        ----------
+        mask: xarray.DataArray | callable
+            Boolean mask (or function of the stack that returns it) of the values to
+            keep (e.g. a cloud mask).
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`).
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
+
+        Returns
+        -------
+        xarray.DataArray
+            Chunked DataArray with Dask, without the time dimension.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .limit(20, "eo:cloud_cover")
+                .mosaic(resolution = 10, sortby_date = False))
+        """
+        return reducers.mosaic(self.getInfo(cache=cache, **kwargs), mask=mask)
+
+    def qualityMosaic(self, band, mask=None, cache=True, **kwargs):
+        """Reduces the collection over time by keeping the bands at the time where a
+        quality band is the greatest.
+
+        Parameters
+        ----------
+        band: str
+            Quality band.
+        mask: xarray.DataArray | callable
+            Boolean mask (or function of the stack that returns it) of the values to
+            keep (e.g. a cloud mask).
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`).
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
+
+        Returns
+        -------
+        xarray.DataArray
+            Chunked DataArray with Dask, without the time dimension.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .qualityMosaic("B08", resolution = 10))
+        """
+        return reducers.qualityMosaic(
+            self.getInfo(cache=cache, **kwargs), band, mask=mask
+        )
+
+    def sampleRegions(self, points, workers=16, cache=True):
+        """Reads the pixel values of the items at points.
+
+        Instead of stacking the items, only the COG blocks that hold the points are
+        read (see :code:`easystac.sampling.sample()`), so sampling a few thousand
+        points reads a small fraction of the data.
+
+        Parameters
+        ----------
+        points: dict | list
+            GeoJSON FeatureCollection, MultiPoint, or list of Point features, Point
+            geometries or (longitude, latitude) tuples.
+        workers: int
+            Maximum number of assets read concurrently.
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`).
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per point and item with the :code:`point`, :code:`id` and
+            :code:`time` columns and one column per selected band.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> table = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(points)
+                .filterDate("2020-01-01","2021-01-01")
+                .select(["B04","B08"])
+                .sampleRegions(points))
+        """
+        items = self._deduplicate(self._items(cache=cache))
+
+        return sampling.sample(items, points, bands=self.bands, workers=workers)
+
+    def getTimeSeries(self, points, workers=16, cache=True):
+        """Returns the time series of the pixel values at points.
+
+        Parameters
+        ----------
+        points: dict | list
+            GeoJSON FeatureCollection, MultiPoint, or list of Point features, Point
+            geometries or (longitude, latitude) tuples.
+        workers: int
+            Maximum number of assets read concurrently.
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`).
+
+        Returns
+        -------
+        xarray.Dataset
+            One variable per selected band, with :code:`point` and :code:`time`
+            dimensions.
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> series = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(points)
+                .filterDate("2020-01-01","2021-01-01")
+                .select(["B04","B08"])
+                .getTimeSeries(points))
+        """
+        return sampling.to_dataset(
+            self.sampleRegions(points, workers=workers, cache=cache)
+        )
+
+    def export(
+        self,
+        path,
+        format="zarr",
+        workers=4,
+        in_flight=None,
+        worker=None,
+        cache=True,
+        **kwargs,
+    ):
+        """Writes the stack chunk by chunk to Zarr or Cloud Optimized GeoTIFFs.
+
+        At most :code:`in_flight` chunks are held in memory at a time. The written
+        chunks are recorded in a manifest, so running the same export again resumes
+        it, and several processes can write the same export in parallel (see
+        :code:`easystac.export.write()`).
+
+        Parameters
+        ----------
+        path: str
+            Directory of the export.
+        format: str
+            One of :code:`zarr` or :code:`cog` (one COG per time slice).
+        workers: int
+            Number of chunks computed and written concurrently.
+        in_flight: int
+            Maximum number of chunks submitted at a time. If None, twice the number of
+            workers.
+        worker: tuple
+            Index and number of the processes writing the export, e.g. :code:`(0, 4)`.
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`). Keep it enabled so that a resumed export
+            stacks the same items.
+        **kwargs
+            Additional arguments passed to :code:`getInfo()`.
+
+        Returns
+        -------
+        int
+            Number of chunks written (the chunks written by previous runs are skipped).
+
+        Examples
+        --------
+        >>> import easystac.planetary as pc
+        >>> pc.Initialize()
+        >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+                .filterBounds(geom)
+                .filterDate("2020-01-01","2021-01-01")
+                .export("s2.zarr", resolution = 10, workers = 8))
+        """
+        return export.write(
+            self.getInfo(cache=cache, **kwargs),
+            path,
+            format=format,
+            workers=workers,
+            in_flight=in_flight,
+            worker=worker,
+        )
 
 
 class ImageCollection(BaseImageCollection):
@@ -154,7 +1777,8 @@ class ImageCollection(BaseImageCollection):
         Parameters
         ----------
         url: str
-            STAC Catalog url.
+            STAC Catalog url. A local path (or :code:`file://` url) to an NDJSON or
+            Parquet dump of items is also accepted (see :code:`fromLocal()`).
 
         Returns
         -------
@@ -166,16 +1790,26 @@ class ImageCollection(BaseImageCollection):
         >>> HLSS30 = (es.ImageCollection("HLSS30.v2.0")
         >>>     .fromSTAC("https://cmr.earthdata.nasa.gov/stac/LPCLOUD/")
         """
+        if "://" not in url or url.startswith("file://"):
+            return self.fromLocal(url.replace("file://", "", 1))
+
         self.stac = url
         """STAC url used to search items."""
 
         return self
 
-    def getInfo(self, **kwargs):
+    def _connection(self):
+        """Returns the STAC Catalog url and the query parameters used to open it."""
+        return self.stac, None
+
+    def getInfo(self, cache=True, **kwargs):
         """Returns all the information from the STAC search.
 
         Parameters
         ----------
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`). Set it to False to always query the STAC.
         **kwargs
             Additional arguments passed to :code:`stackstac.stack()`. Some of them are
             :code:`epsg`, :code:`resolution`, and :code:`bbox`.
@@ -205,10 +1839,4 @@ class ImageCollection(BaseImageCollection):
         >>>     .filterDate("2021-01-01","2022-01-01")
         >>>     .getInfo(epsg = 4326,resolution = 0.0001,assets = ["B02","B03","B04"]))
         """
-        search = self._search(url=self.stac)
-
-        items = [item.to_dict() for item in search.get_items()]
-
-        image_collection = stackstac.stack(items, **kwargs)
-
-        return image_collection
+        return super().getInfo(cache=cache, **kwargs)
@@ -0,0 +1,447 @@
+"""easystac - Batch queries over many areas of interest"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+from . import reducers, sampling
+from .cache import FileCache, SQLiteCache, get_cache, set_cache
+from .client import clear_clients
+
+# Number of sites sent at a time to a worker process
+BATCH_SIZE = 64
+
+# Seconds between progress reports
+PROGRESS_INTERVAL = 5
+
+
+def _geoparquet(path, id_column):
+    """Reads the geometries of a GeoParquet file as GeoJSON."""
+    try:
+        import pyarrow.parquet as pq
+        import shapely
+        from shapely.geometry import mapping
+    except ImportError:
+        raise ImportError(
+            "Reading GeoParquet files requires pyarrow and shapely. Please install "
+            "them by running:: \n\npip install pyarrow shapely\n"
+        )
+
+    table = pq.read_table(path)
+    metadata = json.loads((table.schema.metadata or {}).get(b"geo", b"{}"))
+    column = metadata.get("primary_column", "geometry")
+    geometries = shapely.from_wkb(table.column(column).to_pylist())
+    ids = table.column(id_column).to_pylist() if id_column else range(len(table))
+
+    return [(str(site), mapping(geometry)) for site, geometry in zip(ids, geometries)]
+
+
+def read_aois(path, id_column=None):
+    """Reads the areas of interest of a GeoJSON or GeoParquet file.
+
+    Parameters
+    ----------
+    path: str
+        Path to a GeoJSON FeatureCollection or a GeoParquet file.
+    id_column: str
+        Property (or column) with the site ids. If None, the feature ids or the row
+        numbers are used.
+
+    Returns
+    -------
+    list
+        List of (site id, GeoJSON geometry) tuples.
+    """
+    path = os.path.expanduser(str(path))
+    if path.endswith((".parquet", ".geoparquet")):
+        return _geoparquet(path, id_column)
+
+    with open(path) as f:
+        collection = json.load(f)
+
+    features = collection.get("features", [collection])
+    sites = []
+    for i, feature in enumerate(features):
+        if id_column is not None:
+            site = feature["properties"][id_column]
+        else:
+            site = feature.get("id", i)
+        sites.append((str(site), feature["geometry"]))
+
+    return sites
+
+
+def collection(spec, geometry):
+    """Builds the ImageCollection of a query spec over a geometry.
+
+    Parameters
+    ----------
+    spec: dict
+        Query spec. The keys are :code:`collection`, :code:`stac` (a STAC URL,
+        :code:`planetary` or :code:`radiant`), :code:`local` (a local dump used
+        instead of the STAC), :code:`datetime` (initial and final dates),
+        :code:`bands`, :code:`properties`, :code:`filters` (list of [name, operator,
+        value]) and :code:`limit` (arguments of :code:`limit()`). Only
+        :code:`collection` is required.
+    geometry: dict
+        GeoJSON geometry of the site.
+
+    Returns
+    -------
+    BaseImageCollection
+    """
+    stac = spec.get("stac")
+    if stac == "planetary":
+        from .planetary import ImageCollection
+    elif stac == "radiant":
+        from .radiant import ImageCollection
+    else:
+        from .base import ImageCollection
+
+    result = ImageCollection(spec["collection"])
+    if spec.get("local") is not None:
+        result = result.fromLocal(spec["local"])
+    elif stac not in (None, "planetary", "radiant"):
+        result = result.fromSTAC(stac)
+
+    result = result.filterBounds(geometry)
+    if spec.get("datetime") is not None:
+        result = result.filterDate(*spec["datetime"])
+    if spec.get("bands") is not None:
+        result = result.select(spec["bands"], spec.get("properties"))
+    for name, operator, value in spec.get("filters", []):
+        result = result.filterMetadata(name, operator, value)
+    if spec.get("limit") is not None:
+        limit = spec["limit"]
+        result = (
+            result.limit(*limit) if isinstance(limit, list) else result.limit(limit)
+        )
+
+    return result
+
+
+def _point_stack(table):
+    """Returns the samples of the points as a stack with one pixel per point."""
+    samples = sampling.to_dataset(table).to_array("band")
+    stack = samples.transpose("time", "band", "point").rename(point="x")
+
+    return stack.expand_dims("y", axis=2).astype("float64").chunk()
+
+
+def _mask(stack, geometry):
+    """Masks the pixels of the stack outside a geometry."""
+    import xarray as xr
+    from affine import Affine
+    from rasterio.features import geometry_mask
+    from rasterio.warp import transform_geom
+
+    x, y = stack["x"].values, stack["y"].values
+    transform = stack.attrs.get("transform")
+    if transform is None:
+        transform = Affine(x[1] - x[0], 0, x[0], 0, y[1] - y[0], y[0])
+    crs = stack.attrs.get("crs") or f"epsg:{int(stack['epsg'].values)}"
+    geometry = transform_geom("EPSG:4326", crs, geometry)
+
+    def rasterize(all_touched):
+        return geometry_mask(
+            [geometry],
+            out_shape=(len(y), len(x)),
+            transform=Affine(*list(transform)[:6]),
+            all_touched=all_touched,
+            invert=True,
+        )
+
+    inside = rasterize(False)
+    # Geometries smaller than a pixel (or lines) keep the pixels that they touch
+    if not inside.any():
+        inside = rasterize(True)
+
+    return stack.where(xr.DataArray(inside, dims=("y", "x")))
+
+
+def _extract(images, items, options):
+    """Returns the mean of each band (and time) of the stack over a site.
+
+    Point sites are sampled at their pixels (see :code:`easystac.sampling`) and the
+    pixels of other sites are masked to their geometry before the mean is taken.
+    """
+    options = dict(options)
+    reducer = options.pop("reducer", None)
+    geometry = getattr(images.geometry, "__geo_interface__", images.geometry)
+    if geometry["type"] in ("Point", "MultiPoint"):
+        bands = images.bands or options.get("assets")
+        table = sampling.sample(images._deduplicate(items), geometry, bands=bands)
+        if table.empty:
+            return []
+        stack = _point_stack(table)
+    else:
+        stack = _mask(images._stack(items, **options), geometry)
+    if reducer is not None:
+        stack = getattr(reducers, reducer)(stack)
+    # The sites already run in parallel, so each stack is computed in its thread
+    values = stack.mean(dim=("y", "x")).compute(scheduler="synchronous")
+
+    rows = []
+    for index, value in np.ndenumerate(values.values):
+        coords = {dim: values[dim].values[i] for dim, i in zip(values.dims, index)}
+        row = {"band": str(coords["band"])}
+        if "time" in coords:
+            row["time"] = str(np.datetime_as_string(coords["time"], unit="s"))
+        row["value"] = None if np.isnan(value) else float(value)
+        rows.append(row)
+
+    return rows
+
+
+def run_site(spec, site, geometry):
+    """Runs the query (and the extraction) of a single site.
+
+    Returns
+    -------
+    dict
+        Result of the site, with :code:`status` set to :code:`ok` or :code:`error`.
+    """
+    start = time.perf_counter()
+    try:
+        images = collection(spec, geometry)
+        items = images._items()
+        result = {
+            "id": site,
+            "status": "ok",
+            "count": len(items),
+            "items": [item["id"] for item in items],
+        }
+        if spec.get("extract") is not None and items:
+            result["values"] = _extract(images, items, spec["extract"])
+    except Exception as e:
+        result = {"id": site, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    result["seconds"] = time.perf_counter() - start
+
+    return result
+
+
+def _open_cache(spec):
+    """Returns the cache shared by the processes of a run, or None."""
+    cache = spec.get("cache")
+    if cache is None:
+        return None
+    cache = os.path.expanduser(cache)
+
+    return SQLiteCache(cache) if cache.endswith(".sqlite") else FileCache(cache)
+
+
+def _initialize(spec):
+    """Prepares a worker process: new HTTP clients and the shared cache."""
+    # Connections opened by the parent process must not be shared with the children
+    clear_clients()
+    cache = _open_cache(spec)
+    if cache is not None:
+        set_cache(cache)
+
+
+def run_batch(spec, sites, threads=8):
+    """Runs the sites of a batch concurrently in the current process.
+
+    Parameters
+    ----------
+    spec: dict
+        Query spec (see :code:`collection()`).
+    sites: list
+        List of (site id, GeoJSON geometry) tuples.
+    threads: int
+        Number of sites searched concurrently.
+
+    Returns
+    -------
+    list
+    """
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(lambda site: run_site(spec, *site), sites))
+
+
+class _Progress:
+    """Reports the number of completed and failed sites."""
+
+    def __init__(self, total, report):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.report = report
+        self._start = time.perf_counter()
+        self._last = 0.0
+
+    def update(self, results, final=False):
+        self.done += len(results)
+        self.failed += sum(result["status"] != "ok" for result in results)
+        now = time.perf_counter()
+        if callable(self.report):
+            self.report(self.done, self.failed, self.total)
+        elif self.report and (final or now - self._last >= PROGRESS_INTERVAL):
+            rate = self.done / max(now - self._start, 1e-9)
+            print(
+                f"{self.done}/{self.total} sites ({self.failed} failed), "
+                f"{rate:.1f} sites/s",
+                file=sys.stderr,
+            )
+            self._last = now
+
+
+def _completed(output):
+    """Returns the ids of the sites that succeeded in a previous run."""
+    if not os.path.exists(output):
+        return set()
+
+    completed = set()
+    with open(output) as f:
+        for line in f:
+            if line.endswith("\n"):
+                result = json.loads(line)
+                if result["status"] == "ok":
+                    completed.add(result["id"])
+
+    return completed
+
+
+def run(
+    aois,
+    spec,
+    output,
+    processes=None,
+    threads=8,
+    batch_size=BATCH_SIZE,
+    progress=True,
+):
+    """Runs the same query over many sites and streams the results to disk.
+
+    The sites are split into batches that are run by a pool of processes (one per
+    core by default), each of them searching several sites concurrently with a pool of
+    threads. The HTTP clients are shared by the threads of a process, and the cache of
+    search results (the :code:`cache` key of the spec, a directory or a
+    :code:`.sqlite` file) by all the processes. One NDJSON line is appended to the
+    output per site as soon as its batch is completed, so a run can be resumed: the
+    sites that succeeded in a previous run are skipped and the failed ones are retried.
+
+    Parameters
+    ----------
+    aois: str | list
+        Path to a GeoJSON or GeoParquet file, or list of (site id, GeoJSON geometry)
+        tuples.
+    spec: dict | str
+        Query spec (see :code:`collection()`) or path to a JSON file with it. The
+        optional :code:`extract` key holds the arguments of :code:`getInfo()` (and an
+        optional temporal :code:`reducer`) used to extract the mean of each band over
+        each site (the pixel values for point sites).
+    output: str
+        Path to the NDJSON file of results.
+    processes: int
+        Number of worker processes. If None, one per core. If 0, the batches are run
+        in the current process, whose cache is restored afterwards.
+    threads: int
+        Number of sites searched concurrently by each process.
+    batch_size: int
+        Number of sites sent at a time to a process.
+    progress: bool | callable
+        Whether to report the progress to stderr, or a function of the number of
+        completed sites, failed sites and total sites.
+
+    Returns
+    -------
+    dict
+        Number of sites, sites run, failed sites and skipped sites.
+
+    Examples
+    --------
+    >>> from easystac.batch import run
+    >>> spec = {"collection": "sentinel-2-l2a", "stac": "planetary",
+                "datetime": ["2020-01-01","2021-01-01"], "cache": "cache.sqlite"}
+    >>> run("sites.geojson", spec, "results.ndjson")
+    """
+    if isinstance(spec, (str, os.PathLike)):
+        with open(os.path.expanduser(str(spec))) as f:
+            spec = json.load(f)
+    if isinstance(aois, (str, os.PathLike)):
+        aois = read_aois(aois)
+
+    completed = _completed(output)
+    sites = [site for site in aois if site[0] not in completed]
+    batches = [sites[i : i + batch_size] for i in range(0, len(sites), batch_size)]
+    tracker = _Progress(len(sites), progress)
+
+    with open(output, "a") as f:
+
+        def write(results):
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+            f.flush()
+            tracker.update(results)
+
+        if processes == 0:
+            # The cache of the run is only used while it runs in the current process
+            previous = get_cache()
+            cache = _open_cache(spec)
+            if cache is not None:
+                set_cache(cache)
+            try:
+                for batch in batches:
+                    write(run_batch(spec, batch, threads))
+            finally:
+                set_cache(previous)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=processes or os.cpu_count(),
+                initializer=_initialize,
+                initargs=(spec,),
+            ) as executor:
+                futures = [
+                    executor.submit(run_batch, spec, batch, threads)
+                    for batch in batches
+                ]
+                for future in as_completed(futures):
+                    write(future.result())
+
+    tracker.update([], final=True)
+
+    return {
+        "sites": len(aois),
+        "run": tracker.done,
+        "failed": tracker.failed,
+        "skipped": len(aois) - len(sites),
+    }
+
+
+def main(argv=None):
+    """Entry point of the :code:`easystac-batch` command."""
+    parser = argparse.ArgumentParser(
+        prog="easystac-batch",
+        description="Runs the same STAC query over many areas of interest.",
+    )
+    parser.add_argument("aois", help="GeoJSON or GeoParquet file with the sites")
+    parser.add_argument("spec", help="JSON file with the query spec")
+    parser.add_argument("-o", "--output", required=True, help="NDJSON results file")
+    parser.add_argument("--id-column", help="Property with the site ids")
+    parser.add_argument("--processes", type=int, help="Worker processes")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per process")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress")
+    args = parser.parse_args(argv)
+
+    summary = run(
+        read_aois(args.aois, id_column=args.id_column),
+        args.spec,
+        args.output,
+        processes=args.processes,
+        threads=args.threads,
+        batch_size=args.batch_size,
+        progress=not args.quiet,
+    )
+    print(json.dumps(summary))
+
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""easystac - Persistent cache for STAC search results"""
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+CACHE_PATH = "~/.cache/easystac/"
+
+_cache = None
+
+
+def query_key(url, query):
+    """Returns a normalized hash for a STAC search.
+
+    Parameters
+    ----------
+    url: str
+        STAC Catalog url.
+    query: dict
+        Dictionary of search parameters (collections, intersects, datetime, etc.).
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest of the normalized query.
+    """
+    normalized = {
+        "url": url.rstrip("/"),
+        "query": {k: _normalize(v) for k, v in query.items() if v is not None},
+    }
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _normalize(value):
+    """Converts a query value to a JSON serializable object."""
+    if hasattr(value, "__geo_interface__"):
+        value = value.__geo_interface__
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _dumps(items):
+    return zlib.compress(json.dumps(items, separators=(",", ":")).encode("utf-8"))
+
+
+def _loads(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class BaseCache:
+    """BaseCache object.
+
+    Base object for the STAC search results caches. Subclasses must implement the
+    :code:`get`, :code:`set` and :code:`clear` methods.
+
+    Parameters
+    ----------
+    ttl: float
+        Time to live of each entry in seconds. If None, entries never expire.
+    max_size: int
+        Maximum size of the cache in bytes. If None, the cache is unbounded. The least
+        recently used entries are evicted first.
+    """
+
+    def __init__(self, ttl=86400, max_size=1024**3):
+        """Initializes the BaseCache object."""
+
+        self.ttl = ttl
+        """Time to live of each entry in seconds."""
+
+        self.max_size = max_size
+        """Maximum size of the cache in bytes."""
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key):
+        """Returns the cached items for a key, or None if missing or expired."""
+        raise NotImplementedError
+
+    def set(self, key, items):
+        """Stores the items for a key."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes all the entries from the cache."""
+        raise NotImplementedError
+
+
+class SQLiteCache(BaseCache):
+    """Cache of STAC search results backed by a SQLite database.
+
+    Parameters
+    ----------
+    path: str
+        Path to the SQLite database file.
+    ttl: float
+        Time to live of each entry in seconds. If None, entries never expire.
+    max_size: int
+        Maximum size of the cache in bytes. If None, the cache is unbounded.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.set_cache(es.SQLiteCache("~/.cache/easystac/search.sqlite", ttl=3600))
+    """
+
+    def __init__(self, path=CACHE_PATH + "search.sqlite", ttl=86400, max_size=1024**3):
+        """Initializes the SQLiteCache object."""
+        super().__init__(ttl=ttl, max_size=max_size)
+
+        self.path = Path(path).expanduser()
+        """Path to the SQLite database file."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, created REAL, accessed REAL, size INTEGER, "
+                "items BLOB)"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Opens a connection that is committed (or rolled back) and closed on exit."""
+        with contextlib.closing(sqlite3.connect(str(self.path), timeout=30)) as con:
+            with con:
+                yield con
+
+    def get(self, key):
+        """Returns the cached items for a key, or None if missing or expired."""
+        with self._lock, self._connect() as con:
+            row = con.execute(
+                "SELECT created, items FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            created, blob = row
+            if self._expired(created):
+                con.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            con.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+
+        return _loads(blob)
+
+    def set(self, key, items):
+        """Stores the items for a key."""
+        blob = _dumps(items)
+        now = time.time()
+        with self._lock, self._connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, len(blob), blob),
+            )
+            self._evict(con)
+
+    def _evict(self, con):
+        if self.ttl is not None:
+            con.execute(
+                "DELETE FROM results WHERE created < ?", (time.time() - self.ttl,)
+            )
+        if self.max_size is None:
+            return
+        total = con.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        rows = con.execute("SELECT key, size FROM results ORDER BY accessed").fetchall()
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            con.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        """Removes all the entries from the cache."""
+        with self._lock, self._connect() as con:
+            con.execute("DELETE FROM results")
+
+
+class FileCache(BaseCache):
+    """Cache of STAC search results backed by compressed JSON files.
+
+    Parameters
+    ----------
+    directory: str
+        Directory where the results are stored.
+    ttl: float
+        Time to live of each entry in seconds. If None, entries never expire.
+    max_size: int
+        Maximum size of the cache in bytes. If None, the cache is unbounded.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.set_cache(es.FileCache("~/.cache/easystac/search", ttl=3600))
+    """
+
+    def __init__(self, directory=CACHE_PATH + "search", ttl=86400, max_size=1024**3):
+        """Initializes the FileCache object."""
+        super().__init__(ttl=ttl, max_size=max_size)
+
+        self.directory = Path(directory).expanduser()
+        """Directory where the results are stored."""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json.z"
+
+    def get(self, key):
+        """Returns the cached items for a key, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            entry = _loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (zlib.error, UnicodeDecodeError, json.JSONDecodeError):
+            # A corrupt entry (e.g. written by a crashed process) is a cache miss
+            path.unlink(missing_ok=True)
+            return None
+        if self._expired(entry["created"]):
+            path.unlink(missing_ok=True)
+            return None
+        # The modification time keeps track of the last access for eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return entry["items"]
+
+    def set(self, key, items):
+        """Stores the items for a key."""
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(_dumps({"created": time.time(), "items": items}))
+        os.replace(tmp, path)
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        if self.max_size is None:
+            return
+        entries = []
+        for path in self.directory.glob("*.json.z"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        """Removes all the entries from the cache."""
+        for path in self.directory.glob("*.json.z"):
+            path.unlink(missing_ok=True)
+
+
+def set_cache(cache):
+    """Sets the process-wide cache used by :code:`getInfo()`.
+
+    Parameters
+    ----------
+    cache: BaseCache
+        Cache object. Use None to disable caching.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.set_cache(es.SQLiteCache())
+    """
+    global _cache
+    _cache = cache
+
+
+def get_cache():
+    """Returns the process-wide cache used by :code:`getInfo()`, or None."""
+    return _cache
@@ -0,0 +1,279 @@
+"""easystac - Process-wide registry of STAC clients"""
+import email.utils
+import math
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+from requests import exceptions
+
+from . import instrumentation
+
+POOL_SIZE = 10
+
+# Retries of the requests that fail with a connection error or a retryable status
+MAX_RETRIES = 5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Base and maximum waits (in seconds) of the exponential backoff
+BACKOFF = 0.5
+MAX_BACKOFF = 60
+
+_clients = {}
+_opening = {}
+_buckets = {}
+_lock = threading.Lock()
+_adapter = None
+
+
+def _client_key(url, parameters):
+    return url.rstrip("/"), tuple(sorted((parameters or {}).items()))
+
+
+def _record_response(response, *args, **kwargs):
+    """Records the size and duration of an HTTP response."""
+    if not instrumentation.enabled():
+        return
+    instrumentation.event(
+        "http.request",
+        duration=response.elapsed.total_seconds(),
+        bytes=len(response.content),
+        status=str(response.status_code),
+    )
+
+
+class TokenBucket:
+    """Token bucket that limits the rate of requests, shared across threads.
+
+    Parameters
+    ----------
+    rate: float
+        Tokens added per second (sustained requests per second).
+    capacity: float
+        Maximum number of tokens (burst size). If None, it is equal to the rate.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """Initializes the TokenBucket object."""
+
+        self.rate = rate
+        """Tokens added per second."""
+
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        """Maximum number of tokens."""
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes a token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def set_rate_limit(url, rate, capacity=None):
+    """Limits the rate of requests sent to a host by all the threads of the process.
+
+    Parameters
+    ----------
+    url: str
+        Url (or host name) of the provider.
+    rate: float
+        Sustained requests per second. If None, the limit is removed.
+    capacity: int
+        Maximum burst of requests. If None, it is equal to the rate.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.set_rate_limit("https://planetarycomputer.microsoft.com", 5)
+    """
+    host = urlparse(url).netloc or url
+    with _lock:
+        if rate is None:
+            _buckets.pop(host, None)
+        else:
+            _buckets[host] = TokenBucket(rate, capacity)
+
+
+def _retry_after(response):
+    """Returns the seconds to wait given by the Retry-After header, or None."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0) if math.isfinite(seconds) else None
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(date.timestamp() - time.time(), 0)
+
+
+def _backoff(attempt):
+    """Returns the wait before a retry: exponential backoff with jitter."""
+    wait = min(MAX_BACKOFF, BACKOFF * 2**attempt)
+
+    return wait / 2 + random.uniform(0, wait / 2)
+
+
+class RetryAdapter(HTTPAdapter):
+    """HTTP adapter that retries failed requests and limits the rate per host.
+
+    Requests that fail with a connection error or with a status in
+    :code:`RETRY_STATUS` are retried with exponential backoff and jitter, waiting
+    at least what the :code:`Retry-After` header asks for (up to :code:`MAX_BACKOFF`
+    seconds). Since each request is retried on its own, a paginated search resumes
+    from the page that failed. Each attempt takes a token from the bucket of the host
+    (see :code:`set_rate_limit()`).
+    """
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        for attempt in range(MAX_RETRIES + 1):
+            bucket = _buckets.get(host)
+            if bucket is not None:
+                bucket.acquire()
+            try:
+                response = super().send(request, **kwargs)
+            except (exceptions.ConnectionError, exceptions.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+                wait, status = _backoff(attempt), "error"
+            else:
+                if response.status_code not in RETRY_STATUS or attempt == MAX_RETRIES:
+                    return response
+                retry_after = _retry_after(response)
+                # A Retry-After longer than the maximum backoff must not stall a worker
+                wait = min(max(_backoff(attempt), retry_after or 0), MAX_BACKOFF)
+                status = str(response.status_code)
+                response.close()
+            instrumentation.event("http.retry", duration=wait, status=status)
+            time.sleep(wait)
+
+
+def get_adapter():
+    """Returns the HTTP adapter shared by all the STAC clients.
+
+    The adapter holds the keep-alive connection pools, so connections (and TLS
+    sessions) are reused across clients and queries.
+
+    Returns
+    -------
+    RetryAdapter
+    """
+    global _adapter
+    with _lock:
+        if _adapter is None:
+            _adapter = RetryAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        return _adapter
+
+
+def set_pool_size(pool_size):
+    """Sets the size of the shared HTTP connection pools.
+
+    The opened clients are discarded so the new pools are used by the next queries.
+
+    Parameters
+    ----------
+    pool_size: int
+        Maximum number of connections kept alive per host.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.set_pool_size(32)
+    """
+    global POOL_SIZE, _adapter
+    with _lock:
+        POOL_SIZE = pool_size
+        old, _adapter = _adapter, None
+    clear_clients()
+    if old is not None:
+        old.close()
+
+
+def open_client(url, parameters=None, refresh=False):
+    """Returns an opened STAC client, reusing it if it was already opened.
+
+    Clients are registered by (url, parameters), so the landing page and conformance
+    classes are only requested once per process.
+
+    Parameters
+    ----------
+    url: str
+        STAC Catalog url.
+    parameters: dict
+        Dictionary of query parameters (e.g. authentication keys).
+    refresh: bool
+        Whether to open the client again even if it was already registered.
+
+    Returns
+    -------
+    pystac_client.Client
+    """
+    key = _client_key(url, parameters)
+
+    with _lock:
+        client = None if refresh else _clients.get(key)
+        opening = _opening.setdefault(key, threading.Lock())
+    if client is not None:
+        return client
+
+    # Concurrent searches wait for the first one to open the client
+    with opening:
+        with _lock:
+            client = None if refresh else _clients.get(key)
+        if client is None:
+            client = _open(url, parameters)
+            with _lock:
+                _clients[key] = client
+
+    return client
+
+
+def _open(url, parameters):
+    """Opens a STAC client that uses the shared HTTP adapter."""
+    from pystac_client import Client
+    from pystac_client.stac_api_io import StacApiIO
+
+    stac_io = StacApiIO(parameters=parameters, max_retries=None)
+    adapter = get_adapter()
+    stac_io.session.mount("http://", adapter)
+    stac_io.session.mount("https://", adapter)
+    stac_io.session.hooks["response"].append(_record_response)
+
+    with instrumentation.span("client.open", url=url):
+        client = Client.open(url, parameters=parameters, stac_io=stac_io)
+
+    return client
+
+
+def clear_clients():
+    """Removes all the registered STAC clients.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.clear_clients()
+    """
+    with _lock:
+        _clients.clear()
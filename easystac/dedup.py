@@ -0,0 +1,240 @@
+"""easystac - De-duplication of scenes and overlapping tiles before stacking"""
+import re
+
+from .partition import item_bounds, parse_date
+
+# Items of the same acquisition are at most this number of seconds apart
+TOLERANCE = 60
+
+# Properties whose values must be equal for items of the same acquisition
+ACQUISITION_PROPERTIES = ["constellation", "platform", "sat:relative_orbit"]
+
+# Properties giving the processing version of an item, newest first
+PROCESSING_PROPERTIES = [
+    "s2:processing_baseline",
+    "processing:version",
+    "updated",
+    "created",
+]
+
+# Items adding less than this fraction of the covered area are dropped
+MIN_COVERAGE = 0.01
+
+
+def _datetime(item):
+    properties = item["properties"]
+
+    return parse_date(properties.get("datetime") or properties["start_datetime"])
+
+
+def _version(value):
+    """Returns a sortable key of a version or datetime string."""
+    if value is None:
+        return ()
+
+    return tuple(int(part) for part in re.findall(r"\d+", str(value)))
+
+
+def _measure(geometry):
+    """Returns the area, the length (lines) or the number of points of a geometry."""
+    if geometry.is_empty:
+        return 0
+    if geometry.area > 0:
+        return geometry.area
+    if geometry.length > 0:
+        return geometry.length
+
+    return len(getattr(geometry, "geoms", [geometry]))
+
+
+def acquisitions(items, by=None, tolerance=TOLERANCE):
+    """Returns the index of the acquisition of each item.
+
+    Items of the same collection with the same values of the :code:`by` properties
+    and datetimes at most :code:`tolerance` seconds apart belong to the same
+    acquisition. Acquisitions are numbered in time order.
+
+    Parameters
+    ----------
+    items: list
+        List of STAC items as dictionaries.
+    by: list
+        Properties whose values must be equal. If None, the constellation, platform
+        and relative orbit are used (when the items have them).
+    tolerance: float
+        Maximum number of seconds between the items of an acquisition.
+
+    Returns
+    -------
+    list
+    """
+    by = ACQUISITION_PROPERTIES if by is None else by
+    keys = [
+        (item.get("collection"),) + tuple(str(item["properties"].get(p)) for p in by)
+        for item in items
+    ]
+    times = [_datetime(item) for item in items]
+
+    groups = []
+    previous = None
+    for i in sorted(range(len(items)), key=lambda i: (keys[i], times[i])):
+        if (
+            previous is None
+            or keys[i] != keys[previous]
+            or (times[i] - times[previous]).total_seconds() > tolerance
+        ):
+            groups.append([])
+        groups[-1].append(i)
+        previous = i
+
+    labels = [None] * len(items)
+    groups.sort(key=lambda group: min(times[i] for i in group))
+    for label, group in enumerate(groups):
+        for i in group:
+            labels[i] = label
+
+    return labels
+
+
+def deduplicate(items, geometry=None, by=None, tolerance=TOLERANCE, prefer=None):
+    """Drops the duplicated scenes and the redundant overlapping tiles.
+
+    The items are grouped by acquisition (see :code:`acquisitions()`). The items of
+    each acquisition are ranked by the fraction of the area of interest that they
+    cover and then by their processing version (newest first), and an item is only
+    kept if it covers at least 1% of the area that is not covered by the better
+    ranked items. Reprocessed copies of a scene are therefore dropped, while adjacent
+    tiles that cover different parts of the area are kept. For lines, the length is
+    used instead of the area, and for points, an item is kept if it covers any point
+    not covered by the better ranked items. This requires :code:`shapely`.
+
+    Parameters
+    ----------
+    items: list
+        List of STAC items as dictionaries.
+    geometry: dict
+        GeoJSON geometry of the area of interest. If None, the union of the
+        footprints of each acquisition is used.
+    by: list
+        Properties whose values must be equal for items of the same acquisition.
+    tolerance: float
+        Maximum number of seconds between the items of an acquisition.
+    prefer: list
+        Properties giving the processing version of the items, compared in order
+        (the greatest value is preferred). If None, the processing baseline, the
+        processing version and the :code:`updated` and :code:`created` datetimes are
+        used.
+
+    Returns
+    -------
+    list
+        Kept items, grouped by acquisition (in time order) and ranked within each
+        acquisition.
+
+    Examples
+    --------
+    >>> from easystac.dedup import deduplicate
+    >>> items = deduplicate(items, geometry = geom)
+    """
+    try:
+        from shapely.geometry import box, shape
+        from shapely.ops import unary_union
+    except ImportError:
+        raise ImportError(
+            "Deduplicating items requires shapely. Please install it by running:: "
+            "\n\npip install shapely\n"
+        )
+
+    prefer = PROCESSING_PROPERTIES if prefer is None else prefer
+    aoi = None
+    if geometry is not None:
+        aoi = shape(getattr(geometry, "__geo_interface__", geometry))
+
+    labels = acquisitions(items, by=by, tolerance=tolerance)
+    groups = {}
+    for i, label in enumerate(labels):
+        groups.setdefault(label, []).append(i)
+
+    kept = []
+    for label in sorted(groups):
+        group = groups[label]
+        footprints = {
+            i: (
+                shape(items[i]["geometry"])
+                if items[i].get("geometry")
+                else box(*item_bounds(items[i]))
+            )
+            for i in group
+        }
+        target = unary_union(list(footprints.values()))
+        if aoi is not None and aoi.intersects(target):
+            target = target.intersection(aoi)
+
+        total = _measure(target)
+        # Items are kept if they add a point, or a fraction of the area or length
+        minimum = MIN_COVERAGE if target.area or target.length else 1 / total
+
+        def coverage(i):
+            return _measure(footprints[i].intersection(target)) / total
+
+        processing = {
+            i: tuple(_version(items[i]["properties"].get(p)) for p in prefer)
+            for i in group
+        }
+        ranked = sorted(
+            group,
+            key=lambda i: (round(coverage(i), 2), processing[i]),
+            reverse=True,
+        )
+
+        covered = None
+        for i in ranked:
+            part = footprints[i].intersection(target)
+            if covered is None:
+                kept.append(items[i])
+                covered = part
+                continue
+            if _measure(part.difference(covered)) / total >= minimum:
+                kept.append(items[i])
+                covered = covered.union(part)
+
+    return kept
+
+
+def merge_acquisitions(stack, items, by=None, tolerance=TOLERANCE):
+    """Mosaics the items of each acquisition into a single time slice.
+
+    Parameters
+    ----------
+    stack: xarray.DataArray
+        Stack of the items, with an :code:`id` coordinate along :code:`time`.
+    items: list
+        Stacked items, ranked within each acquisition (e.g. the result of
+        :code:`deduplicate()`). The first valid value of the best ranked item is kept.
+    by: list
+        Properties whose values must be equal for items of the same acquisition.
+    tolerance: float
+        Maximum number of seconds between the items of an acquisition.
+
+    Returns
+    -------
+    xarray.DataArray
+        Stack with one time slice per acquisition, at the earliest time of its items.
+    """
+    from .reducers import mosaic
+
+    labels = acquisitions(items, by=by, tolerance=tolerance)
+    acquisition = {item["id"]: label for item, label in zip(items, labels)}
+    rank = {item["id"]: position for position, item in enumerate(items)}
+    ids = stack["id"].values
+
+    stack = stack.assign_coords(
+        acquisition=("time", [acquisition[i] for i in ids]),
+        rank=("time", [rank[i] for i in ids]),
+    )
+    times = stack["time"].groupby("acquisition").min()
+    merged = stack.groupby("acquisition").map(
+        lambda group: mosaic(group.sortby("rank"))
+    )
+
+    return merged.assign_coords(acquisition=times.values).rename(acquisition="time")
@@ -0,0 +1,407 @@
+"""easystac - Resumable, chunk-by-chunk export of stacks to Zarr and COG"""
+import glob
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from . import instrumentation
+
+# Directory of the export where the manifest and the metadata are stored
+STATE_DIR = ".easystac"
+
+# Name of the exported variable in the Zarr store
+VARIABLE = "data"
+
+# Seconds after which the initialization lock of a crashed process is taken over
+LOCK_TIMEOUT = 300
+
+
+class Manifest:
+    """Manifest object.
+
+    Record of the chunks of an export that were completely written. Each process
+    appends to its own file, so several processes can export to the same path.
+
+    Parameters
+    ----------
+    path: str
+        Directory of the manifest files.
+    """
+
+    def __init__(self, path):
+        """Initializes the Manifest object."""
+
+        self.path = path
+        """Directory of the manifest files."""
+
+        self.done = set()
+        """Keys of the completed chunks (of this and previous runs)."""
+
+        for name in sorted(glob.glob(os.path.join(path, "manifest-*.ndjson"))):
+            with open(name) as f:
+                for line in f:
+                    # A line cut by a crash is ignored, so its chunk is written again
+                    if line.endswith("\n"):
+                        self.done.add(json.loads(line)["chunk"])
+
+        self._file = None
+        self._lock = threading.Lock()
+
+    def add(self, key):
+        """Records a completed chunk."""
+        with self._lock:
+            if self._file is None:
+                name = os.path.join(self.path, f"manifest-{os.getpid()}.ndjson")
+                self._file = open(name, "a")
+            self._file.write(json.dumps({"chunk": key}) + "\n")
+            self._file.flush()
+            self.done.add(key)
+
+    def close(self):
+        """Closes the manifest file of the process."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _key(block):
+    return ".".join(str(i) for i in block)
+
+
+def _starts(chunks):
+    """Returns the offset of each chunk along each axis."""
+    return [np.concatenate([[0], np.cumsum(c)[:-1]]).astype(int) for c in chunks]
+
+
+def _metadata(stack, format):
+    return {
+        "format": format,
+        "dims": list(stack.dims),
+        "shape": list(stack.shape),
+        "chunks": [list(c) for c in stack.chunks],
+        "dtype": str(stack.dtype),
+    }
+
+
+def _initialize(path, metadata, create):
+    """Creates the export once, even when several processes start at the same time."""
+    state = os.path.join(path, STATE_DIR)
+    if os.path.isdir(path) and os.listdir(path) and not os.path.isdir(state):
+        raise Exception(
+            f"{path} is not empty and does not hold an export. "
+            "Export to a new or empty directory."
+        )
+    os.makedirs(state, exist_ok=True)
+    info = os.path.join(state, "export.json")
+    lock = os.path.join(state, "init.lock")
+
+    while not os.path.exists(info):
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock) > LOCK_TIMEOUT:
+                    os.remove(lock)
+            except FileNotFoundError:
+                pass
+            time.sleep(0.1)
+            continue
+        try:
+            if not os.path.exists(info):
+                create()
+                with open(info + ".tmp", "w") as f:
+                    json.dump(metadata, f)
+                os.replace(info + ".tmp", info)
+        finally:
+            os.close(fd)
+            os.remove(lock)
+
+    with open(info) as f:
+        saved = json.load(f)
+
+    if saved != json.loads(json.dumps(metadata)):
+        raise Exception(
+            f"{path} holds an export with a different shape, chunks or format. "
+            "Remove it or export to another path."
+        )
+
+    return state
+
+
+def _serializable(stack):
+    """Converts the coordinates and drops the attributes unsupported by Zarr."""
+    strings = {
+        name: coord.astype(str)
+        for name, coord in stack.coords.items()
+        if coord.dtype.kind == "O"
+    }
+    stack = stack.assign_coords(strings).copy(deep=False)
+    attrs = {
+        key: value
+        for key, value in stack.attrs.items()
+        if isinstance(value, (str, int, float, bool))
+    }
+    if "transform" in stack.attrs:
+        attrs["transform"] = list(stack.attrs["transform"])[:6]
+    stack.attrs = attrs
+
+    return stack
+
+
+class _ZarrWriter:
+    """Writes the chunks of a stack to the matching chunks of a Zarr store."""
+
+    def __init__(self, stack, path):
+        try:
+            import zarr
+        except ImportError:
+            raise ImportError(
+                "Exporting to Zarr requires zarr. Please install it by running:: "
+                "\n\npip install zarr\n"
+            )
+
+        self.stack = stack
+        self.path = path
+        self._zarr = zarr
+        self._array = None
+        self._lock = threading.Lock()
+
+    def owner(self, block):
+        # Chunks are aligned with the Zarr chunks, so any chunk can go to any process
+        return int(np.ravel_multi_index(block, self.stack.data.numblocks))
+
+    def create(self):
+        # A store left by an initialization that crashed is created again (the
+        # directory only holds files of this export, see _initialize)
+        if os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                if name != STATE_DIR:
+                    target = os.path.join(self.path, name)
+                    if os.path.isdir(target):
+                        shutil.rmtree(target)
+                    else:
+                        os.remove(target)
+        stack = _serializable(self.stack)
+        chunks = tuple(c[0] for c in stack.chunks)
+        stack.to_dataset(name=VARIABLE).to_zarr(
+            self.path,
+            mode="a",
+            compute=False,
+            encoding={VARIABLE: {"chunks": chunks}},
+        )
+
+    def write(self, block, data, starts):
+        with self._lock:
+            if self._array is None:
+                self._array = self._zarr.open_array(
+                    os.path.join(self.path, VARIABLE), mode="r+"
+                )
+        region = tuple(
+            slice(start[i], start[i] + size)
+            for start, i, size in zip(starts, block, data.shape)
+        )
+        self._array[region] = data
+
+    def finish(self, blocks, manifest):
+        pass
+
+
+class _CogWriter:
+    """Writes each time slice of a stack to a Cloud Optimized GeoTIFF.
+
+    The chunks are written to a tiled GeoTIFF per time slice, which is converted to a
+    COG once all its chunks are written.
+    """
+
+    def __init__(self, stack, path):
+        import rasterio  # noqa: F401
+
+        if stack.dims != ("time", "band", "y", "x"):
+            raise Exception(
+                "Exporting to COG requires a stack with (time, band, y, x) dimensions."
+            )
+
+        self.stack = stack
+        self.path = path
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def owner(self, block):
+        # A GeoTIFF can only be written by one process, so time chunks are assigned
+        return block[0]
+
+    def create(self):
+        os.makedirs(self.path, exist_ok=True)
+
+    def name(self, index):
+        """Returns the path of the COG of a time slice."""
+        time = self.stack["time"].values[index]
+        if np.issubdtype(np.asarray(time).dtype, np.datetime64):
+            date = np.datetime_as_string(time, unit="s").replace(":", "")
+            return os.path.join(self.path, f"{index:05d}_{date}.tif")
+
+        return os.path.join(self.path, f"{index:05d}.tif")
+
+    def _profile(self):
+        from affine import Affine
+
+        transform = self.stack.attrs.get("transform")
+        if transform is None:
+            x, y = self.stack["x"].values, self.stack["y"].values
+            transform = Affine(x[1] - x[0], 0, x[0], 0, y[1] - y[0], y[0])
+        floating = np.issubdtype(self.stack.dtype, np.floating)
+
+        return {
+            "driver": "GTiff",
+            "width": self.stack.sizes["x"],
+            "height": self.stack.sizes["y"],
+            "count": self.stack.sizes["band"],
+            "dtype": str(self.stack.dtype),
+            "crs": self.stack.attrs.get("crs"),
+            "transform": Affine(*list(transform)[:6]),
+            "nodata": np.nan if floating else None,
+            "tiled": True,
+            "blockxsize": 256,
+            "blockysize": 256,
+            "sparse_ok": True,
+        }
+
+    def write(self, block, data, starts):
+        import rasterio
+        from rasterio.windows import Window
+
+        t, b, y, x = (start[i] for start, i in zip(starts, block))
+        window = Window(x, y, data.shape[3], data.shape[2])
+        indexes = list(range(b + 1, b + data.shape[1] + 1))
+
+        for k in range(data.shape[0]):
+            partial = self.name(t + k) + ".partial"
+            with self._lock:
+                lock = self._locks.setdefault(partial, threading.Lock())
+            with lock:
+                if os.path.exists(partial):
+                    dst = rasterio.open(partial, "r+")
+                else:
+                    dst = rasterio.open(partial, "w", **self._profile())
+                with dst:
+                    dst.write(data[k], indexes=indexes, window=window)
+
+    def finish(self, blocks, manifest):
+        import rasterio.shutil
+
+        starts = _starts(self.stack.chunks)
+        for t in sorted({block[0] for block in blocks}):
+            remaining = [
+                block
+                for block in blocks
+                if block[0] == t and _key(block) not in manifest.done
+            ]
+            if remaining:
+                continue
+            for k in range(self.stack.chunks[0][t]):
+                index = int(starts[0][t]) + k
+                key = f"cog.{index}"
+                if key in manifest.done:
+                    continue
+                name = self.name(index)
+                rasterio.shutil.copy(
+                    name + ".partial", name, driver="COG", compress="deflate"
+                )
+                os.remove(name + ".partial")
+                manifest.add(key)
+
+
+def write(stack, path, format="zarr", workers=4, in_flight=None, worker=None):
+    """Writes a stack chunk by chunk, skipping the chunks written by previous runs.
+
+    Each chunk is computed on its own and written as soon as it is ready, with at most
+    :code:`in_flight` chunks in memory at a time. The completed chunks are recorded
+    in a manifest in the :code:`.easystac` directory of the export, so an interrupted
+    export is resumed by running it again. Several processes (e.g. the tasks of a
+    batch job) can write the same export in parallel by passing their
+    :code:`worker` index.
+
+    With :code:`format="zarr"`, the stack is written to a Zarr store with one Zarr
+    chunk per dask chunk (this requires :code:`zarr`). With :code:`format="cog"`, each
+    time slice is written to a Cloud Optimized GeoTIFF named after its index and time.
+
+    Parameters
+    ----------
+    stack: xarray.DataArray
+        Chunked stack (e.g. the result of :code:`getInfo()`).
+    path: str
+        Directory of the export.
+    format: str
+        One of :code:`zarr` or :code:`cog`.
+    workers: int
+        Number of chunks computed and written concurrently.
+    in_flight: int
+        Maximum number of chunks submitted at a time. If None, twice the number of
+        workers.
+    worker: tuple
+        Index and number of the processes writing the export, e.g. :code:`(0, 4)`.
+        Each process writes a disjoint part of the chunks. If None, all the chunks
+        are written.
+
+    Returns
+    -------
+    int
+        Number of chunks written (the chunks skipped are not counted).
+
+    Examples
+    --------
+    >>> from easystac.export import write
+    >>> write(stack, "s2.zarr", workers = 8)
+    """
+    writers = {"zarr": _ZarrWriter, "cog": _CogWriter}
+    if format not in writers:
+        raise Exception(f"Unknown export format {format!r}. Use 'zarr' or 'cog'.")
+
+    if stack.chunks is None:
+        stack = stack.chunk()
+
+    writer = writers[format](stack, path)
+    state = _initialize(path, _metadata(stack, format), writer.create)
+    manifest = Manifest(state)
+
+    index, count = worker if worker is not None else (0, 1)
+    blocks = [
+        block
+        for block in itertools.product(*(range(n) for n in stack.data.numblocks))
+        if writer.owner(block) % count == index
+    ]
+    pending = [block for block in blocks if _key(block) not in manifest.done]
+
+    delayed = stack.data.to_delayed()
+    starts = _starts(stack.chunks)
+    in_flight = in_flight or 2 * workers
+
+    def task(block):
+        data = delayed[block].compute(scheduler="synchronous")
+        with instrumentation.span("export.chunk", bytes=data.nbytes):
+            writer.write(block, data, starts)
+        manifest.add(_key(block))
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = set()
+            for block in pending:
+                if len(futures) >= in_flight:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                futures.add(executor.submit(instrumentation.propagate(task), block))
+            for future in wait(futures).done:
+                future.result()
+        writer.finish(blocks, manifest)
+    finally:
+        manifest.close()
+
+    return len(pending)
@@ -0,0 +1,348 @@
+"""easystac - Earth Engine-like metadata filters"""
+import datetime as dt
+import operator
+
+import numpy as np
+
+from .partition import format_date, parse_date
+
+OPERATORS = {
+    "equals": "=",
+    "not_equals": "<>",
+    "less_than": "<",
+    "greater_than": ">",
+    "not_less_than": ">=",
+    "not_greater_than": "<=",
+    "starts_with": "starts_with",
+    "ends_with": "ends_with",
+    "contains": "contains",
+    "=": "=",
+    "==": "=",
+    "!=": "<>",
+    "<>": "<>",
+    "<": "<",
+    ">": ">",
+    "<=": "<=",
+    ">=": ">=",
+}
+
+NEGATED_OPERATORS = {
+    "not_starts_with": "starts_with",
+    "not_ends_with": "ends_with",
+    "not_contains": "contains",
+}
+
+# Operators of the STAC query extension
+QUERY_OPERATORS = {
+    "=": "eq",
+    "<>": "neq",
+    "<": "lt",
+    ">": "gt",
+    "<=": "lte",
+    ">=": "gte",
+    "starts_with": "startsWith",
+    "ends_with": "endsWith",
+    "contains": "contains",
+}
+
+COMPARISONS = {
+    "=": operator.eq,
+    "<>": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+}
+
+# Item fields that are not part of the properties
+TOP_LEVEL_FIELDS = {"id", "collection"}
+
+
+class Filter:
+    """Filter object.
+
+    This object mimics the ee.Filter class of Earth Engine. Filters are translated into
+    a CQL2 :code:`filter` or a :code:`query` parameter when the STAC supports it, and
+    are also evaluated client-side otherwise.
+
+    Parameters
+    ----------
+    op: str
+        Operator: :code:`and`, :code:`or`, :code:`not`, or a comparison operator.
+    args: list
+        Sub-filters for logical operators, or property name and value for comparisons.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> f = es.Filter.And(
+    >>>     es.Filter.lt("eo:cloud_cover", 20),
+    >>>     es.Filter.eq("platform", "Sentinel-2A"),
+    >>> )
+    """
+
+    def __init__(self, op, args):
+        """Initializes the Filter object."""
+
+        self.op = op
+        """Operator of the filter."""
+
+        self.args = list(args)
+        """Arguments of the operator."""
+
+    def __repr__(self):
+        return f"Filter({self.op!r}, {self.args!r})"
+
+    @staticmethod
+    def metadata(name, operator, value):
+        """Returns a filter on an item property.
+
+        Parameters
+        ----------
+        name: str
+            Property name (e.g. :code:`eo:cloud_cover`).
+        operator: str
+            One of :code:`equals`, :code:`less_than`, :code:`greater_than`,
+            :code:`not_equals`, :code:`not_less_than`, :code:`not_greater_than`,
+            :code:`starts_with`, :code:`ends_with`, :code:`contains`,
+            :code:`not_starts_with`, :code:`not_ends_with`, :code:`not_contains`, or
+            a comparison symbol such as :code:`<` or :code:`>=`.
+        value: object
+            Value to compare with. Datetimes (naive UTC) are compared with the
+            timestamps of the property.
+
+        Returns
+        -------
+        Filter
+        """
+        operator = operator.lower()
+        if operator in NEGATED_OPERATORS:
+            return Filter.Not(Filter(NEGATED_OPERATORS[operator], [name, value]))
+        if operator not in OPERATORS:
+            raise Exception(f"Invalid operator: {operator}")
+
+        return Filter(OPERATORS[operator], [name, value])
+
+    @staticmethod
+    def eq(name, value):
+        """Returns a filter for properties equal to a value."""
+        return Filter("=", [name, value])
+
+    @staticmethod
+    def neq(name, value):
+        """Returns a filter for properties not equal to a value."""
+        return Filter("<>", [name, value])
+
+    @staticmethod
+    def lt(name, value):
+        """Returns a filter for properties less than a value."""
+        return Filter("<", [name, value])
+
+    @staticmethod
+    def lte(name, value):
+        """Returns a filter for properties less than or equal to a value."""
+        return Filter("<=", [name, value])
+
+    @staticmethod
+    def gt(name, value):
+        """Returns a filter for properties greater than a value."""
+        return Filter(">", [name, value])
+
+    @staticmethod
+    def gte(name, value):
+        """Returns a filter for properties greater than or equal to a value."""
+        return Filter(">=", [name, value])
+
+    @staticmethod
+    def And(*filters):
+        """Returns a filter that passes if all the filters pass."""
+        return Filter("and", filters)
+
+    @staticmethod
+    def Or(*filters):
+        """Returns a filter that passes if any of the filters passes."""
+        return Filter("or", filters)
+
+    @staticmethod
+    def Not(filter):
+        """Returns a filter that passes if the filter does not pass."""
+        return Filter("not", [filter])
+
+    def properties(self):
+        """Returns the names of the properties used by the filter.
+
+        Returns
+        -------
+        set
+        """
+        if self.op in ("and", "or", "not"):
+            return set().union(*(f.properties() for f in self.args))
+
+        return {self.args[0]}
+
+    def to_cql2(self):
+        """Returns the filter as a CQL2-JSON expression.
+
+        Returns
+        -------
+        dict
+        """
+        if self.op in ("and", "or", "not"):
+            return {"op": self.op, "args": [f.to_cql2() for f in self.args]}
+
+        name, value = self.args
+        prop = {"property": name}
+        if self.op in ("starts_with", "ends_with", "contains"):
+            # The value is matched literally, as in the client-side evaluation
+            value = _escape_like(value)
+        if self.op == "starts_with":
+            return {"op": "like", "args": [prop, f"{value}%"]}
+        if self.op == "ends_with":
+            return {"op": "like", "args": [prop, f"%{value}"]}
+        if self.op == "contains":
+            return {"op": "like", "args": [prop, f"%{value}%"]}
+
+        if isinstance(value, dt.datetime):
+            value = {"timestamp": format_date(value)}
+
+        return {"op": self.op, "args": [prop, value]}
+
+    def to_query(self):
+        """Returns the filter as a STAC query extension parameter.
+
+        Returns
+        -------
+        dict
+            Query parameter, or None if the filter cannot be expressed with the query
+            extension (e.g. it uses :code:`or` or :code:`not`).
+        """
+        if self.op == "and":
+            query = {}
+            for f in self.args:
+                sub = f.to_query()
+                if sub is None:
+                    return None
+                for name, conditions in sub.items():
+                    current = query.setdefault(name, {})
+                    if set(current) & set(conditions):
+                        return None
+                    current.update(conditions)
+            return query
+        if self.op in ("or", "not"):
+            return None
+
+        name, value = self.args
+        if name in TOP_LEVEL_FIELDS:
+            return None
+
+        if isinstance(value, dt.datetime):
+            value = format_date(value)
+
+        return {name: {QUERY_OPERATORS[self.op]: value}}
+
+    def evaluate(self, items):
+        """Evaluates the filter on a list of items.
+
+        Parameters
+        ----------
+        items: list
+            List of STAC items as dictionaries.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the items that pass the filter.
+        """
+        if self.op == "and":
+            mask = np.ones(len(items), dtype=bool)
+            for f in self.args:
+                mask &= f.evaluate(items)
+            return mask
+        if self.op == "or":
+            mask = np.zeros(len(items), dtype=bool)
+            for f in self.args:
+                mask |= f.evaluate(items)
+            return mask
+        if self.op == "not":
+            return ~self.args[0].evaluate(items)
+
+        name, value = self.args
+        column = property_column(items, name)
+
+        if self.op in ("starts_with", "ends_with", "contains"):
+            test = {
+                "starts_with": lambda v: v.startswith(value),
+                "ends_with": lambda v: v.endswith(value),
+                "contains": lambda v: value in v,
+            }[self.op]
+            return np.array(
+                [isinstance(v, str) and test(v) for v in column], dtype=bool
+            )
+
+        compare = COMPARISONS[self.op]
+
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            column = np.array(
+                [v if isinstance(v, (int, float)) else np.nan for v in column],
+                dtype=float,
+            )
+            with np.errstate(invalid="ignore"):
+                mask = compare(column, value)
+            # Missing values never pass a filter
+            return mask & ~np.isnan(column)
+
+        if isinstance(value, dt.datetime):
+            column = [_timestamp(v) for v in column]
+
+        def safe(v):
+            try:
+                return v is not None and bool(compare(v, value))
+            except TypeError:
+                return False
+
+        return np.array([safe(v) for v in column], dtype=bool)
+
+
+def _escape_like(value):
+    """Escapes the wildcards of a CQL2 like pattern."""
+    value = str(value).replace("\\", "\\\\")
+
+    return value.replace("%", "\\%").replace("_", "\\_")
+
+
+def _timestamp(value):
+    """Parses a timestamp property, or returns None if it is not a timestamp."""
+    try:
+        return parse_date(value)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def property_column(items, name):
+    """Returns the values of a property for all the items."""
+    if name in TOP_LEVEL_FIELDS:
+        return [item.get(name) for item in items]
+
+    return [item["properties"].get(name) for item in items]
+
+
+def apply_filter(items, filter):
+    """Returns the items that pass a filter.
+
+    Parameters
+    ----------
+    items: list
+        List of STAC items as dictionaries.
+    filter: Filter
+        Filter to evaluate. If None, all the items are returned.
+
+    Returns
+    -------
+    list
+    """
+    if filter is None or not items:
+        return items
+
+    mask = filter.evaluate(items)
+
+    return [item for item, keep in zip(items, mask) if keep]
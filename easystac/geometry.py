@@ -0,0 +1,151 @@
+"""easystac - Simplified search geometries and exact client-side intersections"""
+import numpy as np
+
+from .partition import geometry_bounds, item_bounds
+
+# Geometries with more vertices are replaced by a simpler cover in the search request
+MAX_VERTICES = 500
+
+# Maximum number of times the tolerance of the simplified hull is doubled
+SIMPLIFY_STEPS = 12
+
+
+def count_vertices(geometry):
+    """Returns the number of vertices of a GeoJSON geometry.
+
+    Parameters
+    ----------
+    geometry: dict
+        GeoJSON object of dictionary-like object representing a GeoJSON.
+
+    Returns
+    -------
+    int
+    """
+    geometry = getattr(geometry, "__geo_interface__", geometry)
+    if geometry["type"] == "GeometryCollection":
+        return sum(count_vertices(part) for part in geometry["geometries"])
+
+    def walk(coordinates):
+        if isinstance(coordinates[0], (int, float)):
+            return 1
+        return sum(walk(part) for part in coordinates)
+
+    return walk(geometry["coordinates"])
+
+
+def _cover(shp, max_vertices):
+    """Returns a geometry with at most max_vertices vertices that covers shp."""
+    import shapely
+
+    hull = shp.convex_hull
+    candidates = [hull]
+    if shp.geom_type.startswith("Multi") or shp.geom_type == "GeometryCollection":
+        # Far apart parts are covered separately, so the gaps are not searched
+        parts = shapely.union_all([part.convex_hull for part in shp.geoms])
+        candidates.insert(0, parts)
+
+    for candidate in candidates:
+        if shapely.get_num_coordinates(candidate) <= max_vertices:
+            return candidate
+
+    # The hull is grown by twice the tolerance before simplifying it, so the
+    # simplified hull (within the tolerance of the grown one) still covers it
+    minx, miny, maxx, maxy = hull.bounds
+    tolerance = max(maxx - minx, maxy - miny) / max_vertices
+    for _ in range(SIMPLIFY_STEPS):
+        cover = hull.buffer(2 * tolerance, join_style="mitre").simplify(tolerance)
+        if shapely.get_num_coordinates(cover) <= max_vertices:
+            return cover
+        tolerance *= 2
+
+    return shapely.box(*hull.bounds)
+
+
+def prepare_geometry(geometry, max_vertices=MAX_VERTICES):
+    """Returns the geometry sent to the STAC in place of a complex geometry.
+
+    Geometries with more than :code:`max_vertices` vertices are replaced by the union
+    of the convex hulls of their parts, their convex hull, a simplified convex hull or
+    their bounding box (the first one that is simple enough). The replacement always
+    covers the geometry, so the STAC returns a superset of the items, which are then
+    filtered client-side with :code:`intersecting()`. This requires :code:`shapely`;
+    without it, the geometry is returned unchanged.
+
+    Parameters
+    ----------
+    geometry: dict
+        GeoJSON object of dictionary-like object representing a GeoJSON.
+    max_vertices: int
+        Maximum number of vertices of the geometry sent to the STAC. If None, the
+        geometry is never replaced.
+
+    Returns
+    -------
+    dict
+        The geometry itself if it is simple enough, otherwise its GeoJSON cover.
+
+    Examples
+    --------
+    >>> from easystac.geometry import prepare_geometry
+    >>> cover = prepare_geometry(coastline, max_vertices = 100)
+    """
+    if max_vertices is None or count_vertices(geometry) <= max_vertices:
+        return geometry
+
+    try:
+        from shapely.geometry import mapping, shape
+    except ImportError:
+        return geometry
+
+    shp = shape(getattr(geometry, "__geo_interface__", geometry))
+
+    return mapping(_cover(shp, max(max_vertices, 5)))
+
+
+def intersecting(items, geometry):
+    """Returns the items whose footprint intersects a geometry.
+
+    The bounding boxes of the items are compared first, and only the items that pass
+    are intersected exactly (in a single vectorized call) with the geometry. Items
+    without a geometry are kept if their bounding box intersects. This requires
+    :code:`shapely`.
+
+    Parameters
+    ----------
+    items: list
+        List of STAC items as dictionaries.
+    geometry: dict
+        GeoJSON object of dictionary-like object representing a GeoJSON.
+
+    Returns
+    -------
+    list
+    """
+    import shapely
+    from shapely.geometry import shape
+
+    if not items:
+        return items
+
+    geometry = getattr(geometry, "__geo_interface__", geometry)
+    bounds = geometry_bounds(geometry)
+    boxes = np.array([item_bounds(item) for item in items], dtype=float)
+    candidates = np.flatnonzero(
+        (boxes[:, 0] <= bounds[2])
+        & (boxes[:, 2] >= bounds[0])
+        & (boxes[:, 1] <= bounds[3])
+        & (boxes[:, 3] >= bounds[1])
+    )
+
+    exact = [i for i in candidates if items[i].get("geometry")]
+    keep = np.zeros(len(items), dtype=bool)
+    keep[[i for i in candidates if not items[i].get("geometry")]] = True
+
+    if exact:
+        target = shape(geometry)
+        shapely.prepare(target)
+        footprints = np.array([shape(items[i]["geometry"]) for i in exact])
+        keep[exact] = shapely.intersects(footprints, target)
+
+    return [item for item, kept in zip(items, keep) if kept]
@@ -0,0 +1,332 @@
+"""easystac - Timing and counters of the query pipeline"""
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+
+_enabled = False
+_callbacks = []
+_trace = contextvars.ContextVar("easystac_trace", default=None)
+
+
+class Span:
+    """Span object.
+
+    Duration and counters (items, pages, bytes, retries, ...) of a stage of the query
+    pipeline.
+
+    Parameters
+    ----------
+    name: str
+        Stage name (e.g. :code:`search.page`).
+    attributes: dict
+        Counters and other attributes of the stage.
+    """
+
+    def __init__(self, name, attributes=None):
+        """Initializes the Span object."""
+
+        self.name = name
+        """Stage name."""
+
+        self.attributes = dict(attributes or {})
+        """Counters and other attributes of the stage."""
+
+        self.start = time.perf_counter()
+        """Start time (from :code:`time.perf_counter()`)."""
+
+        self.duration = None
+        """Duration in seconds."""
+
+    def set(self, **attributes):
+        """Sets attributes of the span."""
+        self.attributes.update(attributes)
+
+    def __repr__(self):
+        return f"Span({self.name!r}, duration={self.duration}, {self.attributes})"
+
+
+class _NullSpan:
+    """Span returned when the instrumentation is disabled."""
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Summary:
+    """Summary object.
+
+    Spans recorded while computing a result, aggregated by stage.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.set_instrumentation(True)
+    >>> S2 = pc.ImageCollection("sentinel-2-l2a").filterBounds(geom).getInfo()
+    >>> S2.attrs["easystac:summary"]
+    """
+
+    def __init__(self):
+        """Initializes the Summary object."""
+
+        self.spans = []
+        """Recorded spans."""
+
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        """Adds a finished span to the summary."""
+        with self._lock:
+            self.spans.append(span)
+
+    def stages(self):
+        """Returns the number of spans, total seconds and summed counters by stage.
+
+        Returns
+        -------
+        dict
+        """
+        stages = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stage = stages.setdefault(span.name, {"count": 0, "seconds": 0.0})
+            stage["count"] += 1
+            stage["seconds"] += span.duration or 0.0
+            for key, value in span.attributes.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stage[key] = stage.get(key, 0) + value
+
+        return stages
+
+    def __repr__(self):
+        lines = ["Summary("]
+        for name, stage in self.stages().items():
+            counters = ", ".join(
+                f"{key}={value}"
+                for key, value in stage.items()
+                if key not in ("count", "seconds")
+            )
+            lines.append(
+                f"  {name}: {stage['count']} x, {stage['seconds']:.3f} s"
+                + (f", {counters}" if counters else "")
+            )
+        lines.append(")")
+
+        return "\n".join(lines)
+
+
+def set_instrumentation(enabled):
+    """Enables or disables the summaries attached to the results.
+
+    Spans are also recorded (without summaries) while there are callbacks.
+
+    Parameters
+    ----------
+    enabled: bool
+        Whether to attach a summary to the results of :code:`getInfo()`.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.set_instrumentation(True)
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def add_callback(callback):
+    """Adds a function that is called with each finished span.
+
+    Parameters
+    ----------
+    callback: callable
+        Function of a Span (e.g. a LoggingExporter or a CounterExporter).
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.add_callback(es.LoggingExporter())
+    """
+    _callbacks.append(callback)
+
+
+def remove_callback(callback):
+    """Removes a function added with :code:`add_callback()`."""
+    _callbacks.remove(callback)
+
+
+def enabled():
+    """Returns whether spans are recorded."""
+    return _enabled or bool(_callbacks)
+
+
+class _Recorder:
+    def __init__(self, name, attributes):
+        self.span = Span(name, attributes)
+
+    def __enter__(self):
+        return self.span
+
+    def __exit__(self, *args):
+        finish(self.span)
+        return False
+
+
+def span(name, **attributes):
+    """Returns a context manager that records a span of a stage.
+
+    Parameters
+    ----------
+    name: str
+        Stage name.
+    **attributes
+        Counters and other attributes of the stage.
+
+    Returns
+    -------
+    contextmanager
+        The span is returned on enter, so attributes can be set with :code:`set()`.
+    """
+    if not enabled():
+        return _NULL_SPAN
+
+    return _Recorder(name, attributes)
+
+
+def finish(span):
+    """Finishes a span and reports it to the summary and the callbacks."""
+    if span.duration is None:
+        span.duration = time.perf_counter() - span.start
+    summary = _trace.get()
+    if summary is not None:
+        summary.add(span)
+    for callback in list(_callbacks):
+        callback(span)
+
+
+def event(name, duration=0.0, **attributes):
+    """Records a span that already finished (e.g. an HTTP response)."""
+    if not enabled():
+        return
+    span = Span(name, attributes)
+    span.duration = duration
+    finish(span)
+
+
+@contextlib.contextmanager
+def trace():
+    """Returns a context manager that collects the spans recorded inside it.
+
+    Yields
+    ------
+    Summary
+        Summary of the spans, or None when the instrumentation is disabled.
+    """
+    if not _enabled:
+        yield None
+        return
+
+    summary = Summary()
+    token = _trace.set(summary)
+    try:
+        yield summary
+    finally:
+        _trace.reset(token)
+
+
+def propagate(function):
+    """Returns a function that runs in a copy of the current context.
+
+    Used to record the spans of worker threads in the summary of the caller.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(function, *args, **kwargs)
+
+    return run
+
+
+class LoggingExporter:
+    """Callback that logs each finished span.
+
+    Parameters
+    ----------
+    logger: logging.Logger
+        Logger. If None, the :code:`easystac` logger is used.
+    level: int
+        Logging level.
+    """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        """Initializes the LoggingExporter object."""
+
+        self.logger = logger or logging.getLogger("easystac")
+        """Logger."""
+
+        self.level = level
+        """Logging level."""
+
+    def __call__(self, span):
+        self.logger.log(
+            self.level, "%s took %.3f s %s", span.name, span.duration, span.attributes
+        )
+
+
+class CounterExporter:
+    """Callback that accumulates Prometheus-style counters of the spans.
+
+    For each stage :code:`name`, the counters :code:`easystac_<name>_total`,
+    :code:`easystac_<name>_seconds_total` and one :code:`easystac_<name>_<key>_total`
+    per numeric attribute are accumulated.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> counters = es.CounterExporter()
+    >>> es.add_callback(counters)
+    >>> print(counters.render())
+    """
+
+    def __init__(self):
+        """Initializes the CounterExporter object."""
+
+        self.counters = {}
+        """Counters by name."""
+
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        prefix = "easystac_" + span.name.replace(".", "_").replace(":", "_")
+        values = {f"{prefix}_total": 1, f"{prefix}_seconds_total": span.duration}
+        for key, value in span.attributes.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[f"{prefix}_{key}_total"] = value
+        with self._lock:
+            for name, value in values.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def render(self):
+        """Returns the counters in the Prometheus text format.
+
+        Returns
+        -------
+        str
+        """
+        with self._lock:
+            counters = sorted(self.counters.items())
+
+        return "".join(
+            f"# TYPE {name} counter\n{name} {value}\n" for name, value in counters
+        )
@@ -0,0 +1,255 @@
+"""easystac - Offline catalogs of STAC items"""
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .partition import geometry_bounds, parse_date
+from .table import ItemTable
+
+_catalogs = {}
+_lock = threading.Lock()
+
+
+def _pages(path, size=1000):
+    """Yields pages of items from an NDJSON file."""
+    page = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                page.append(json.loads(line))
+            if len(page) == size:
+                yield page
+                page = []
+    if page:
+        yield page
+
+
+def _is_parquet(path):
+    return Path(path).suffix.lower() in (".parquet", ".geoparquet", ".pq")
+
+
+class LocalCatalog:
+    """Offline catalog of STAC items with spatial and temporal indexes.
+
+    Items are loaded from an NDJSON file (one item per line) or a Parquet file (see
+    :code:`ItemTable.to_parquet()`). Datetime queries use a sorted index and spatial
+    queries use an STRtree of the item geometries when :code:`shapely` is installed
+    (or the item bboxes otherwise).
+
+    Parameters
+    ----------
+    path: str
+        Path to the NDJSON or Parquet file.
+
+    Examples
+    --------
+    >>> from easystac.local import LocalCatalog
+    >>> catalog = LocalCatalog("sentinel-2-l2a.ndjson")
+    >>> items = catalog.search(datetime="2020-01-01/2020-02-01")
+    """
+
+    def __init__(self, path):
+        """Initializes the LocalCatalog object."""
+
+        self.path = Path(path).expanduser()
+        """Path to the NDJSON or Parquet file."""
+
+        if _is_parquet(self.path):
+            table = ItemTable.from_parquet(str(self.path))
+        else:
+            table = ItemTable.from_pages(_pages(self.path))
+
+        self.table = table
+        """ItemTable with the items of the catalog."""
+
+        self._order = np.argsort(table["datetime"], kind="stable")
+        self._datetimes = table["datetime"][self._order]
+        self._tree = None
+        self._tree_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.table)
+
+    def _strtree(self):
+        """Returns the STRtree of the item geometries, building it on first use."""
+        from shapely import STRtree
+        from shapely.geometry import shape
+
+        with self._tree_lock:
+            if self._tree is None:
+                geometries = [
+                    shape(json.loads(item)["geometry"]) for item in self.table["item"]
+                ]
+                self._tree = STRtree(geometries)
+
+        return self._tree
+
+    def _intersects(self, geometry):
+        """Returns the mask of the items that intersect a geometry."""
+        geometry = getattr(geometry, "__geo_interface__", geometry)
+        mask = np.zeros(len(self.table), dtype=bool)
+
+        try:
+            from shapely.geometry import shape
+        except ImportError:
+            bounds = geometry_bounds(geometry)
+            b = self.table["bbox"]
+            return (
+                (b[:, 0] <= bounds[2])
+                & (b[:, 2] >= bounds[0])
+                & (b[:, 1] <= bounds[3])
+                & (b[:, 3] >= bounds[1])
+            )
+
+        mask[self._strtree().query(shape(geometry), predicate="intersects")] = True
+
+        return mask
+
+    def _between(self, datetime):
+        """Returns the indices of the items within a datetime interval, sorted."""
+        start, separator, end = datetime.partition("/")
+        if not separator:
+            end = start
+        lower, upper = 0, len(self._order)
+        if start not in ("", ".."):
+            lower = np.searchsorted(
+                self._datetimes, np.datetime64(parse_date(start)), side="left"
+            )
+        if end not in ("", "..") and len(end.strip()) == 10:
+            # A date includes the whole day, up to the start of the next day (excluded)
+            following = np.datetime64(parse_date(end)) + np.timedelta64(1, "D")
+            upper = np.searchsorted(self._datetimes, following, side="left")
+        elif end not in ("", ".."):
+            upper = np.searchsorted(
+                self._datetimes, np.datetime64(parse_date(end)), side="right"
+            )
+
+        return self._order[lower:upper]
+
+    def search(self, intersects=None, datetime=None, collections=None, **kwargs):
+        """Returns the items that match the search, sorted by datetime.
+
+        Parameters
+        ----------
+        intersects: dict
+            GeoJSON geometry.
+        datetime: str
+            Datetime interval in the format :code:`initialDate/finalDate`.
+        collections: list
+            Collection IDs.
+        **kwargs
+            Other search parameters are ignored.
+
+        Returns
+        -------
+        list
+            List of STAC items as dictionaries.
+        """
+        if datetime is not None:
+            index = self._between(datetime)
+        else:
+            index = self._order
+
+        if collections:
+            index = index[np.isin(self.table["collection"][index], list(collections))]
+
+        if intersects is not None:
+            index = index[self._intersects(intersects)[index]]
+
+        items = self.table["item"]
+
+        return [json.loads(items[i]) for i in index]
+
+
+def open_local(path, refresh=False):
+    """Returns a loaded LocalCatalog, reusing it if it was already loaded.
+
+    Parameters
+    ----------
+    path: str
+        Path to the NDJSON or Parquet file.
+    refresh: bool
+        Whether to load the file again even if it was already loaded.
+
+    Returns
+    -------
+    LocalCatalog
+    """
+    key = str(Path(path).expanduser().resolve())
+
+    with _lock:
+        catalog = _catalogs.get(key)
+
+    if catalog is None or refresh:
+        catalog = LocalCatalog(key)
+        with _lock:
+            _catalogs[key] = catalog
+
+    return catalog
+
+
+def write_items(items, path):
+    """Writes items to an NDJSON or Parquet file (chosen by the extension).
+
+    Parameters
+    ----------
+    items: list
+        List of STAC items as dictionaries.
+    path: str
+        Output path.
+    """
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+
+    if _is_parquet(path):
+        ItemTable.from_items(items).to_parquet(str(tmp))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item, separators=(",", ":")) + "\n")
+
+    tmp.replace(path)
+
+
+def sync(collection, path):
+    """Builds or updates a local dump of the items matched by a collection.
+
+    The items of the search are merged with the items already in the dump (items with
+    the same id are replaced) and written back. Asset hrefs are stored unsigned.
+
+    Parameters
+    ----------
+    collection: BaseImageCollection
+        Collection with the filters that define the items to dump.
+    path: str
+        Path to the NDJSON or Parquet file.
+
+    Returns
+    -------
+    int
+        Number of items in the dump.
+
+    Examples
+    --------
+    >>> import easystac.planetary as pc
+    >>> from easystac.local import sync
+    >>> sync(pc.ImageCollection("sentinel-2-l2a").filterBounds(geom), "s2.ndjson")
+    >>> S2 = pc.ImageCollection("sentinel-2-l2a").fromLocal("s2.ndjson")
+    """
+    url, parameters = collection._connection()
+    new = collection._fetch(url=url, parameters=parameters)
+
+    items = {}
+    if Path(path).expanduser().is_file():
+        for item in open_local(path).table.to_items():
+            items[item["id"]] = item
+    for item in new:
+        items[item["id"]] = item
+
+    write_items(list(items.values()), path)
+    open_local(path, refresh=True)
+
+    return len(items)
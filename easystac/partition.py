@@ -0,0 +1,239 @@
+"""easystac - Partitioning of STAC searches into concurrent sub-searches"""
+import datetime as dt
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def parse_date(value, end=False):
+    """Parses a date or datetime string into a naive UTC datetime.
+
+    Parameters
+    ----------
+    value: str
+        Date in format %Y-%m-%d or ISO 8601 datetime.
+    end: bool
+        Whether a date should be parsed as the last microsecond of the day.
+
+    Returns
+    -------
+    datetime.datetime
+    """
+    value = value.strip()
+    if len(value) == 10:
+        date = dt.datetime.strptime(value, "%Y-%m-%d")
+        if end:
+            date = date + dt.timedelta(days=1) - dt.timedelta(microseconds=1)
+        return date
+    date = dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if date.tzinfo is not None:
+        date = date.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return date
+
+
+def format_date(date):
+    """Formats a naive UTC datetime as an RFC 3339 string.
+
+    Fractions of a second are only written when the datetime has them.
+
+    Parameters
+    ----------
+    date: datetime.datetime
+        Naive UTC datetime.
+
+    Returns
+    -------
+    str
+    """
+    fraction = f".{date.microsecond:06d}" if date.microsecond else ""
+
+    return f"{date.strftime(DATE_FORMAT)}{fraction}Z"
+
+
+def split_datetime(datetime, days):
+    """Splits a datetime interval into consecutive sub-windows.
+
+    Each sub-window ends one microsecond before the next one starts (the fractions of
+    a second are sent to the STAC), so no item is left between two sub-windows.
+
+    Parameters
+    ----------
+    datetime: str
+        Datetime interval in the format :code:`initialDate/finalDate`.
+    days: float
+        Size of each sub-window in days.
+
+    Returns
+    -------
+    list
+        List of datetime interval strings covering the whole interval.
+
+    Examples
+    --------
+    >>> from easystac.partition import split_datetime
+    >>> split_datetime("2020-01-01/2020-03-01", 30)
+    """
+    start, _, end = datetime.partition("/")
+    if not end or start in ("", "..") or end in ("", ".."):
+        return [datetime]
+
+    start = parse_date(start)
+    end = parse_date(end, end=True)
+    step = dt.timedelta(days=days)
+
+    windows = []
+    while start <= end:
+        stop = min(start + step - dt.timedelta(microseconds=1), end)
+        windows.append(f"{format_date(start)}/{format_date(stop)}")
+        start = start + step
+
+    return windows
+
+
+def geometry_bounds(geometry):
+    """Returns the bounds of a GeoJSON geometry.
+
+    Parameters
+    ----------
+    geometry: dict
+        GeoJSON object of dictionary-like object representing a GeoJSON.
+
+    Returns
+    -------
+    tuple
+        Bounds (minx, miny, maxx, maxy).
+    """
+    geometry = getattr(geometry, "__geo_interface__", geometry)
+    if geometry["type"] == "GeometryCollection":
+        bounds = [geometry_bounds(part) for part in geometry["geometries"]]
+        return (
+            min(b[0] for b in bounds),
+            min(b[1] for b in bounds),
+            max(b[2] for b in bounds),
+            max(b[3] for b in bounds),
+        )
+
+    xs, ys = [], []
+
+    def walk(coordinates):
+        if isinstance(coordinates[0], (int, float)):
+            xs.append(coordinates[0])
+            ys.append(coordinates[1])
+        else:
+            for part in coordinates:
+                walk(part)
+
+    walk(geometry["coordinates"])
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def item_bounds(item):
+    """Returns the 2D bounds of a STAC item.
+
+    The bounds are taken from the 2D or 3D bbox of the item, or from its geometry when
+    it has no bbox.
+
+    Parameters
+    ----------
+    item: dict
+        STAC item as a dictionary.
+
+    Returns
+    -------
+    tuple
+        Bounds (minx, miny, maxx, maxy).
+    """
+    bbox = item.get("bbox")
+    if not bbox:
+        return geometry_bounds(item["geometry"])
+    if len(bbox) == 6:
+        return bbox[0], bbox[1], bbox[3], bbox[4]
+
+    return tuple(bbox)
+
+
+def split_geometry(geometry, tiles=None):
+    """Splits a GeoJSON geometry into parts that can be searched separately.
+
+    Multi-part geometries are split into their parts. If :code:`tiles` is given, the
+    geometry is also intersected with a regular grid over its bounds and the empty
+    tiles are dropped (this requires :code:`shapely`).
+
+    Parameters
+    ----------
+    geometry: dict
+        GeoJSON object of dictionary-like object representing a GeoJSON.
+    tiles: int | tuple
+        Number of tiles of the grid along x and y. An integer is used for both axes.
+
+    Returns
+    -------
+    list
+        List of GeoJSON geometries.
+    """
+    geometry = getattr(geometry, "__geo_interface__", geometry)
+
+    if tiles is None:
+        if geometry["type"] == "GeometryCollection":
+            return list(geometry["geometries"])
+        if geometry["type"].startswith("Multi"):
+            return [
+                {"type": geometry["type"][5:], "coordinates": coordinates}
+                for coordinates in geometry["coordinates"]
+            ]
+        return [geometry]
+
+    try:
+        from shapely.geometry import box, mapping, shape
+    except ImportError:
+        raise ImportError(
+            "Tiling a geometry requires shapely. Please install it by running:: "
+            "\n\npip install shapely\n"
+        )
+
+    nx, ny = (tiles, tiles) if isinstance(tiles, int) else tiles
+    shp = shape(geometry)
+    minx, miny, maxx, maxy = shp.bounds
+    width = (maxx - minx) / nx
+    height = (maxy - miny) / ny
+
+    parts = []
+    for i in range(nx):
+        for j in range(ny):
+            cell = box(
+                minx + i * width,
+                miny + j * height,
+                minx + (i + 1) * width,
+                miny + (j + 1) * height,
+            )
+            part = shp.intersection(cell)
+            if not part.is_empty:
+                parts.append(mapping(part))
+
+    return parts
+
+
+def merge_items(results):
+    """Merges the items of several searches, dropping duplicated ids.
+
+    The merged items are sorted by datetime and id, so the output does not depend on
+    the order in which the searches were completed.
+
+    Parameters
+    ----------
+    results: list
+        List of lists of STAC items as dictionaries.
+
+    Returns
+    -------
+    list
+    """
+    merged = {}
+    for items in results:
+        for item in items:
+            merged.setdefault(item["id"], item)
+
+    return sorted(
+        merged.values(),
+        key=lambda item: (item["properties"].get("datetime") or "", item["id"]),
+    )
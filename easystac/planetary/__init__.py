@@ -6,6 +6,7 @@ from pathlib import Path
 
 from ..logging_utils import obtain_and_write_token
 from .image_collection import ImageCollection
+from .signing import TokenCache, get_token_cache, set_token_cache
 
 warnings.simplefilter("always", UserWarning)
 
@@ -3,10 +3,8 @@ import os
 import warnings
 from pathlib import Path
 
-import planetary_computer as pc
-import stackstac
-
 from ..base import BaseImageCollection
+from .signing import sign_items
 
 warnings.simplefilter("always", UserWarning)
 
@@ -36,11 +34,35 @@ class ImageCollection(BaseImageCollection):
             .getInfo(resolution = 10))
     """
 
-    def getInfo(self, **kwargs):
+    def _connection(self):
+        """Returns the STAC Catalog url and the query parameters used to open it."""
+        parameters = None
+
+        if "PC_SDK_SUBSCRIPTION_KEY" in os.environ:
+            parameters = {"subscription-key": os.environ["PC_SDK_SUBSCRIPTION_KEY"]}
+
+        return "https://planetarycomputer.microsoft.com/api/stac/v1", parameters
+
+    def _sign(self, items):
+        """Signs the asset hrefs of the items in place."""
+        return sign_items(items)
+
+    def _stack(self, items, **kwargs):
+        """Stacks the items, re-signing the expired hrefs at read time."""
+        from .reader import SigningReader
+
+        kwargs.setdefault("reader", SigningReader)
+
+        return super()._stack(items, **kwargs)
+
+    def getInfo(self, cache=True, **kwargs):
         """Returns all the information from the STAC search.
 
         Parameters
         ----------
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`). Set it to False to always query the STAC.
         **kwargs
             Additional arguments passed to :code:`stackstac.stack()`. Some of them are
             :code:`epsg`, :code:`resolution`, and :code:`bbox`.
@@ -62,18 +84,4 @@ class ImageCollection(BaseImageCollection):
                 .filterDate("2020-01-01","2021-01-01")
                 .getInfo(resolution = 10))
         """
-        parameters = None
-
-        if "PC_SDK_SUBSCRIPTION_KEY" in os.environ:
-            parameters = {"subscription-key": os.environ["PC_SDK_SUBSCRIPTION_KEY"]}
-
-        search = self._search(
-            url="https://planetarycomputer.microsoft.com/api/stac/v1",
-            parameters=parameters,
-        )
-
-        items = [pc.sign(item).to_dict() for item in search.get_items()]
-
-        image_collection = stackstac.stack(items, **kwargs)
-
-        return image_collection
+        return super().getInfo(cache=cache, **kwargs)
@@ -0,0 +1,15 @@
+"""easystac - stackstac reader that re-signs Planetary Computer assets"""
+from stackstac.rio_reader import AutoParallelRioReader
+
+from .signing import sign_href
+
+
+class SigningReader(AutoParallelRioReader):
+    """stackstac reader that re-signs the href at read time if its token expired.
+
+    Dask tasks can run long after the items were signed; this reader asks the token
+    cache for a fresh token right before opening the asset when needed.
+    """
+
+    def __init__(self, *, url, **kwargs):
+        super().__init__(url=sign_href(url), **kwargs)
@@ -0,0 +1,261 @@
+"""easystac - Batched signing of Planetary Computer assets"""
+import datetime as dt
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+
+import requests
+
+from .. import instrumentation
+from ..client import get_adapter
+
+SAS_URL = "https://planetarycomputer.microsoft.com/api/sas/v1/token"
+BLOB_STORAGE_DOMAIN = ".blob.core.windows.net"
+PUBLIC_ACCOUNTS = {"ai4edatasetspublicassets"}
+
+# Tokens are refreshed when they have less than this number of seconds left
+EXPIRY_MARGIN = 300
+
+
+def _now():
+    return dt.datetime.now(dt.timezone.utc)
+
+
+def _parse_expiry(value):
+    return dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def parse_blob_url(href):
+    """Returns the storage account and container of an Azure Blob Storage href.
+
+    Parameters
+    ----------
+    href: str
+        Asset href.
+
+    Returns
+    -------
+    tuple
+        Storage account and container, or None if the href does not need signing.
+    """
+    parsed = urlparse(href)
+    if not parsed.netloc.endswith(BLOB_STORAGE_DOMAIN):
+        return None
+    account = parsed.netloc[: -len(BLOB_STORAGE_DOMAIN)]
+    if account in PUBLIC_ACCOUNTS:
+        return None
+    container = parsed.path.lstrip("/").split("/", 1)[0]
+
+    return account, container
+
+
+def href_expiry(href):
+    """Returns the expiry of a signed href, or None if it is not signed."""
+    se = parse_qs(urlparse(href).query).get("se")
+    if not se:
+        return None
+
+    return _parse_expiry(unquote(se[0]))
+
+
+class TokenCache:
+    """Cache of SAS tokens per storage account and container.
+
+    Tokens are requested once per (account, container) and kept in memory (and
+    optionally on disk) until they are close to their expiry.
+
+    Parameters
+    ----------
+    url: str
+        SAS token endpoint.
+    path: str
+        JSON file where the tokens are persisted. If None, tokens are only kept in
+        memory.
+    """
+
+    def __init__(self, url=SAS_URL, path=None):
+        """Initializes the TokenCache object."""
+
+        self.url = url.rstrip("/")
+        """SAS token endpoint."""
+
+        self.path = Path(path).expanduser() if path is not None else None
+        """JSON file where the tokens are persisted."""
+
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.mount("http://", get_adapter())
+        self._session.mount("https://", get_adapter())
+        if self.path is not None and self.path.is_file():
+            self._tokens = {
+                tuple(key.split("/", 1)): (
+                    value["token"],
+                    _parse_expiry(value["expiry"]),
+                )
+                for key, value in json.loads(self.path.read_text()).items()
+            }
+
+    def _valid(self, entry):
+        return (entry[1] - _now()).total_seconds() > EXPIRY_MARGIN
+
+    def get(self, account, container):
+        """Returns a valid SAS token for a storage account and container.
+
+        Parameters
+        ----------
+        account: str
+            Storage account name.
+        container: str
+            Container name.
+
+        Returns
+        -------
+        str
+        """
+        with self._lock:
+            entry = self._tokens.get((account, container))
+        if entry is not None and self._valid(entry):
+            return entry[0]
+
+        headers = {}
+        if "PC_SDK_SUBSCRIPTION_KEY" in os.environ:
+            headers["Ocp-Apim-Subscription-Key"] = os.environ["PC_SDK_SUBSCRIPTION_KEY"]
+        with instrumentation.span("sas.token", account=account, container=container):
+            response = self._session.get(
+                f"{self.url}/{account}/{container}", headers=headers
+            )
+            response.raise_for_status()
+        content = response.json()
+        entry = (content["token"], _parse_expiry(content["msft:expiry"]))
+
+        with self._lock:
+            self._tokens[(account, container)] = entry
+            self._save()
+
+        return entry[0]
+
+    def _save(self):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        content = {
+            f"{account}/{container}": {"token": token, "expiry": expiry.isoformat()}
+            for (account, container), (token, expiry) in self._tokens.items()
+            if (expiry - _now()).total_seconds() > 0
+        }
+        tmp = self.path.with_suffix(".tmp")
+        with os.fdopen(
+            os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w"
+        ) as f:
+            json.dump(content, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        """Removes all the tokens from the cache."""
+        with self._lock:
+            self._tokens.clear()
+            self._save()
+
+
+_tokens = TokenCache()
+
+
+def set_token_cache(cache):
+    """Sets the SAS token cache used to sign Planetary Computer assets.
+
+    Parameters
+    ----------
+    cache: TokenCache
+        Token cache.
+
+    Examples
+    --------
+    >>> import easystac.planetary as pc
+    >>> pc.set_token_cache(pc.TokenCache(path="~/.cache/easystac/sas_tokens.json"))
+    """
+    global _tokens
+    _tokens = cache
+
+
+def get_token_cache():
+    """Returns the SAS token cache used to sign Planetary Computer assets."""
+    return _tokens
+
+
+def _unsigned(href):
+    return href.split("?", 1)[0]
+
+
+def sign_href(href):
+    """Signs an href, re-signing it if its token is expired or close to expiry.
+
+    Parameters
+    ----------
+    href: str
+        Asset href.
+
+    Returns
+    -------
+    str
+    """
+    container = parse_blob_url(href)
+    if container is None:
+        return href
+    expiry = href_expiry(href)
+    if expiry is not None and (expiry - _now()).total_seconds() > EXPIRY_MARGIN:
+        return href
+
+    return f"{_unsigned(href)}?{_tokens.get(*container)}"
+
+
+def sign_items(items, workers=4):
+    """Signs the asset hrefs of a page of items in place.
+
+    The hrefs are grouped by storage account and container, so each SAS token is
+    requested at most once per page (and reused from the token cache afterwards).
+
+    Parameters
+    ----------
+    items: list
+        List of STAC items as dictionaries.
+    workers: int
+        Maximum number of concurrent token requests.
+
+    Returns
+    -------
+    list
+        The same list of items, with signed hrefs.
+    """
+    assets = {}
+    for item in items:
+        for asset in item.get("assets", {}).values():
+            container = parse_blob_url(asset["href"])
+            if container is not None:
+                assets.setdefault(container, []).append(asset)
+
+    if not assets:
+        return items
+
+    containers = list(assets)
+    with ThreadPoolExecutor(max_workers=min(workers, len(containers))) as executor:
+        tokens = list(executor.map(lambda c: _tokens.get(*c), containers))
+
+    for container, token in zip(containers, tokens):
+        for asset in assets[container]:
+            asset["href"] = f"{_unsigned(asset['href'])}?{token}"
+
+    return items
+
+
+def __getattr__(name):
+    # SigningReader imports stackstac, so it lives in its own module
+    if name == "SigningReader":
+        from .reader import SigningReader
+
+        return SigningReader
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,291 @@
+"""easystac - Chunk-size and resolution planner for stackstac.stack()"""
+import math
+
+import numpy as np
+
+from .partition import geometry_bounds, item_bounds
+
+# Memory of each dask worker, in bytes
+WORKER_MEMORY = 4 * 2**30
+
+# Chunks are aligned to multiples of the usual COG block size
+BLOCK_SIZE = 256
+
+# Meters per degree of latitude
+METERS_PER_DEGREE = 111320
+
+
+def set_worker_memory(memory):
+    """Sets the memory of each dask worker used to plan the stacks.
+
+    Parameters
+    ----------
+    memory: int
+        Memory in bytes.
+
+    Examples
+    --------
+    >>> import easystac as es
+    >>> es.set_worker_memory(8 * 2**30)
+    """
+    global WORKER_MEMORY
+    WORKER_MEMORY = memory
+
+
+class Plan:
+    """Plan object.
+
+    Arguments chosen for :code:`stackstac.stack()` together with the expected size of
+    the stack and of its dask graph.
+
+    Parameters
+    ----------
+    kwargs: dict
+        Arguments for :code:`stackstac.stack()`.
+    shape: tuple
+        Expected shape of the stack (time, band, y, x).
+    chunks: tuple
+        Chunk size of the stack (time, band, y, x), or None if it is unknown.
+    """
+
+    def __init__(self, kwargs, shape, chunks):
+        """Initializes the Plan object."""
+
+        self.kwargs = kwargs
+        """Arguments for stackstac.stack()."""
+
+        self.shape = shape
+        """Expected shape of the stack (time, band, y, x)."""
+
+        self.chunks = chunks
+        """Chunk size of the stack (time, band, y, x), or None if it is unknown."""
+
+    @property
+    def itemsize(self):
+        """Bytes per pixel value."""
+        return np.dtype(self.kwargs["dtype"]).itemsize
+
+    @property
+    def tasks(self):
+        """Number of chunks of the stack (and of read tasks in the graph)."""
+        if self.chunks is None:
+            return None
+        return math.prod(
+            math.ceil(size / chunk) for size, chunk in zip(self.shape, self.chunks)
+        )
+
+    @property
+    def nbytes(self):
+        """Expected number of bytes of the stack."""
+        return math.prod(self.shape) * self.itemsize
+
+    @property
+    def chunk_bytes(self):
+        """Number of bytes of each chunk."""
+        if self.chunks is None:
+            return None
+        return math.prod(self.chunks) * self.itemsize
+
+    def __repr__(self):
+        chunk_bytes = self.chunk_bytes
+        if chunk_bytes is not None:
+            chunk_bytes = f"{chunk_bytes / 2**20:.1f} MiB"
+        return (
+            f"Plan(shape={self.shape}, chunks={self.chunks}, "
+            f"dtype={np.dtype(self.kwargs['dtype']).name}, tasks={self.tasks}, "
+            f"nbytes={self.nbytes / 2**30:.2f} GiB, chunk_bytes={chunk_bytes})"
+        )
+
+
+def _degrees(epsg):
+    return epsg == 4326
+
+
+def _item_epsg(item):
+    properties = item.get("properties", {})
+    epsg = properties.get("proj:epsg")
+    if epsg is None and str(properties.get("proj:code", "")).startswith("EPSG:"):
+        epsg = int(properties["proj:code"].split(":")[1])
+
+    return epsg
+
+
+def _item_resolution(items, degrees):
+    """Returns the finest resolution of the items in the units of the output CRS."""
+    resolutions = []
+    for item in items:
+        transform = item.get("properties", {}).get("proj:transform")
+        if transform:
+            resolution = abs(transform[0])
+            item_degrees = _degrees(_item_epsg(item))
+            if item_degrees and not degrees:
+                resolution *= METERS_PER_DEGREE
+            elif degrees and not item_degrees:
+                resolution /= METERS_PER_DEGREE
+            resolutions.append(resolution)
+
+    return min(resolutions) if resolutions else None
+
+
+def _extent(bounds, degrees):
+    """Returns the width and height of lat/lon bounds in the units of the output CRS."""
+    width, height = bounds[2] - bounds[0], bounds[3] - bounds[1]
+    if degrees:
+        return width, height
+    latitude = math.radians((bounds[1] + bounds[3]) / 2)
+
+    return (
+        width * METERS_PER_DEGREE * math.cos(latitude),
+        height * METERS_PER_DEGREE,
+    )
+
+
+def _scaled(items, bands):
+    """Returns whether any of the assets has a scale or an offset."""
+    for item in items:
+        for key, asset in item.get("assets", {}).items():
+            if bands is not None and key not in bands:
+                continue
+            for band in asset.get("raster:bands", []):
+                if band.get("scale", 1) != 1 or band.get("offset", 0) != 0:
+                    return True
+
+    return False
+
+
+def _union(items):
+    bboxes = np.array([item_bounds(item) for item in items])
+
+    return (
+        bboxes[:, 0].min(),
+        bboxes[:, 1].min(),
+        bboxes[:, 2].max(),
+        bboxes[:, 3].max(),
+    )
+
+
+def _chunks(chunksize, shape, dtype):
+    """Returns the chunk size of the stack for a chunksize of stackstac.stack().
+
+    As in stackstac, one or two sizes only chunk the spatial dimensions. Returns None
+    if dask cannot resolve the chunksize.
+    """
+    import dask.array as da
+
+    if isinstance(chunksize, int):
+        chunksize = (1, 1, chunksize, chunksize)
+    elif isinstance(chunksize, tuple) and len(chunksize) == 2:
+        chunksize = (1, 1) + chunksize
+
+    try:
+        chunks = da.core.normalize_chunks(
+            chunksize,
+            shape,
+            dtype=np.dtype(dtype),
+            previous_chunks=((1,) * shape[0], (1,) * shape[1], shape[2:3], shape[3:]),
+        )
+    except (ValueError, TypeError, NotImplementedError):
+        return None
+
+    return tuple(max(c[0], 1) if c else 1 for c in chunks)
+
+
+def plan(items, geometry=None, memory=None, **kwargs):
+    """Chooses the chunk size, dtype and bounds of a stack of items.
+
+    The values are stacked as float32 when the assets have no scale or offset and no
+    integer :code:`dtype` is given. The spatial chunks are aligned to the COG blocks
+    and sized so that several chunks fit in the memory of a worker. When the stack is
+    small, several times are grouped in each chunk to avoid millions of tiny tasks. A
+    given :code:`chunksize` is kept as is. The stack is clipped to the bounds of the
+    geometry unless :code:`bounds` or :code:`bounds_latlon` are given or the geometry
+    has no area (points and lines).
+
+    Parameters
+    ----------
+    items: list
+        List of STAC items as dictionaries.
+    geometry: dict
+        GeoJSON geometry of the area of interest.
+    memory: int
+        Memory of each dask worker in bytes. If None, the memory set with
+        :code:`set_worker_memory()` is used.
+    **kwargs
+        Arguments for :code:`stackstac.stack()`. The given arguments are kept.
+
+    Returns
+    -------
+    Plan
+
+    Examples
+    --------
+    >>> from easystac.planner import plan
+    >>> p = plan(items, geometry = geom, resolution = 10)
+    >>> p
+    Plan(shape=(73, 3, 5000, 5000), chunks=(1, 1, 2048, 2048), ...)
+    >>> stackstac.stack(items, **p.kwargs)
+    """
+    memory = memory or WORKER_MEMORY
+    kwargs = dict(kwargs)
+
+    dtype = kwargs.get("dtype")
+    floating = dtype is None or np.issubdtype(np.dtype(dtype), np.floating)
+    if (
+        floating
+        and not kwargs.get("rescale", False)
+        and not _scaled(items, kwargs.get("assets"))
+    ):
+        # Without scales and offsets, float32 keeps the values and halves the bytes
+        kwargs.setdefault("rescale", False)
+        kwargs.setdefault("dtype", "float32")
+        kwargs.setdefault("fill_value", np.float32(np.nan))
+    kwargs.setdefault("dtype", "float64")
+
+    if geometry is not None and not {"bounds", "bounds_latlon"} & set(kwargs):
+        bounds = geometry_bounds(geometry)
+        # Points and lines have no area to clip to, so the extent of the items is used
+        if bounds[0] < bounds[2] and bounds[1] < bounds[3]:
+            kwargs["bounds_latlon"] = bounds
+
+    epsg = kwargs.get("epsg") or (_item_epsg(items[0]) if items else None)
+    degrees = _degrees(epsg)
+
+    resolution = kwargs.get("resolution") or _item_resolution(items, degrees)
+    if resolution is None:
+        resolution = 1 / METERS_PER_DEGREE if degrees else 1
+    if not isinstance(resolution, (int, float)):
+        resolution = min(resolution)
+
+    if "bounds" in kwargs:
+        b = kwargs["bounds"]
+        extent = (b[2] - b[0], b[3] - b[1])
+    else:
+        bounds = kwargs.get("bounds_latlon") or (_union(items) if items else None)
+        extent = _extent(bounds, degrees) if bounds is not None else (0, 0)
+
+    bands = kwargs.get("assets")
+    if bands is None:
+        bands = set(items[0].get("assets", {})) if items else set()
+    shape = (
+        len(items),
+        len(bands),
+        max(math.ceil(extent[1] / resolution), 1),
+        max(math.ceil(extent[0] / resolution), 1),
+    )
+
+    itemsize = np.dtype(kwargs["dtype"]).itemsize
+    # Each chunk takes 1/16 of the memory, so a worker holds several chunks and copies
+    target = memory // 16
+
+    if "chunksize" in kwargs:
+        return Plan(kwargs, shape, _chunks(kwargs["chunksize"], shape, kwargs["dtype"]))
+
+    side = int(math.sqrt(target / itemsize)) // BLOCK_SIZE * BLOCK_SIZE
+    side = max(side, BLOCK_SIZE)
+    y, x = min(side, shape[2]), min(side, shape[3])
+    times = max(min(target // (y * x * itemsize), shape[0]), 1)
+    chunks = (times, 1, y, x)
+
+    kwargs["chunksize"] = chunks
+
+    return Plan(kwargs, shape, chunks)
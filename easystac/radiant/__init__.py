@@ -3,8 +3,6 @@ import json
 import os
 from pathlib import Path
 
-import stackstac
-
 from ..logging_utils import obtain_and_write_token
 from .image_collection import ImageCollection
 
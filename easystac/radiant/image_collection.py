@@ -1,8 +1,6 @@
 import json
 import os
 
-import stackstac
-
 from ..base import BaseImageCollection
 
 
@@ -27,11 +25,20 @@ class ImageCollection(BaseImageCollection):
             .getInfo(epsg = 4326,resolution = 0.0001))
     """
 
-    def getInfo(self, **kwargs):
+    def _connection(self):
+        """Returns the STAC Catalog url and the query parameters used to open it."""
+        parameters = {"key": os.environ["MLHUB_API_KEY"]}
+
+        return "https://api.radiant.earth/mlhub/v1/", parameters
+
+    def getInfo(self, cache=True, **kwargs):
         """Returns all the information from the STAC search.
 
         Parameters
         ----------
+        cache: bool | BaseCache
+            Whether to use the process-wide cache of search results (see
+            :code:`easystac.set_cache()`). Set it to False to always query the STAC.
         **kwargs
             Additional arguments passed to :code:`stackstac.stack()`. Some of them are
             :code:`epsg`, :code:`resolution`, and :code:`bbox`.
@@ -50,13 +57,4 @@ class ImageCollection(BaseImageCollection):
                 .filterDate("2019-01-01","2019-01-05")
                 .getInfo(epsg = 4326,resolution = 0.0001))
         """
-        search = self._search(
-            url="https://api.radiant.earth/mlhub/v1/",
-            parameters={"key": os.environ["MLHUB_API_KEY"]},
-        )
-
-        items = [item.to_dict() for item in search.get_items()]
-
-        image_collection = stackstac.stack(items, **kwargs)
-
-        return image_collection
+        return super().getInfo(cache=cache, **kwargs)
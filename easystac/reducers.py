@@ -0,0 +1,208 @@
+"""easystac - Earth Engine-like temporal reducers for stacks"""
+import math
+from functools import partial
+
+import numpy as np
+
+# Maximum number of bytes per chunk used by the median and percentile reducers
+MEMORY = 128 * 2**20
+
+
+def _masked(stack, mask):
+    """Masks the stack (True keeps the value) if a mask is given."""
+    if mask is None:
+        return stack
+    if callable(mask):
+        mask = mask(stack)
+
+    return stack.where(mask)
+
+
+def _time_chunks(stack, memory):
+    """Puts the whole time axis in each chunk, shrinking the spatial chunks to fit."""
+    bands = (
+        stack.data.chunksize[stack.dims.index("band")] if "band" in stack.dims else 1
+    )
+    pixels = memory // (stack.dtype.itemsize * stack.sizes["time"] * bands)
+    side = int(math.sqrt(pixels)) or 1
+
+    return stack.chunk(
+        {"time": -1, "y": min(side, stack.sizes["y"]), "x": min(side, stack.sizes["x"])}
+    )
+
+
+def _first_valid(block, axis, keepdims):
+    """Returns the first value that is not NaN along an axis."""
+    axis = axis[0] if isinstance(axis, tuple) else axis
+    index = np.expand_dims(np.argmax(~np.isnan(block), axis=axis), axis)
+    result = np.take_along_axis(block, index, axis=axis)
+
+    return result if keepdims else result.squeeze(axis)
+
+
+def _best(block, axis, keepdims, band):
+    """Returns all the bands at the time where a quality band is the greatest."""
+    axis = axis[0] if isinstance(axis, tuple) else axis
+    quality = np.take(block, [band], axis=1)
+    index = np.argmax(np.where(np.isnan(quality), -np.inf, quality), axis=axis)
+    index = np.broadcast_to(np.expand_dims(index, axis), (1,) + block.shape[1:])
+    result = np.take_along_axis(block, index, axis=axis)
+
+    return result if keepdims else result.squeeze(axis)
+
+
+def _reduction(function, dtype):
+    """Returns a function that reduces a dask array along an axis, chunk by chunk."""
+
+    def reduce(x, axis, **kwargs):
+        import dask.array as da
+
+        return da.reduction(
+            x,
+            chunk=function,
+            combine=function,
+            aggregate=function,
+            axis=axis,
+            dtype=dtype,
+            concatenate=True,
+        )
+
+    return reduce
+
+
+def mean(stack, mask=None):
+    """Reduces a stack over time by computing the mean.
+
+    Parameters
+    ----------
+    stack: xarray.DataArray
+        Stack with a :code:`time` dimension (e.g. the result of :code:`getInfo()`).
+    mask: xarray.DataArray | callable
+        Boolean mask (or function of the stack that returns it) of the values to keep.
+
+    Returns
+    -------
+    xarray.DataArray
+    """
+    return _masked(stack, mask).mean("time", skipna=True)
+
+
+def max(stack, mask=None):
+    """Reduces a stack over time by computing the maximum.
+
+    Parameters
+    ----------
+    stack: xarray.DataArray
+        Stack with a :code:`time` dimension (e.g. the result of :code:`getInfo()`).
+    mask: xarray.DataArray | callable
+        Boolean mask (or function of the stack that returns it) of the values to keep.
+
+    Returns
+    -------
+    xarray.DataArray
+    """
+    return _masked(stack, mask).max("time", skipna=True)
+
+
+def median(stack, mask=None, memory=MEMORY):
+    """Reduces a stack over time by computing the median.
+
+    The whole time series of a pixel is needed, so the stack is rechunked to put the
+    time axis in a single chunk with spatial chunks small enough to fit the memory.
+
+    Parameters
+    ----------
+    stack: xarray.DataArray
+        Stack with a :code:`time` dimension (e.g. the result of :code:`getInfo()`).
+    mask: xarray.DataArray | callable
+        Boolean mask (or function of the stack that returns it) of the values to keep.
+    memory: int
+        Maximum number of bytes per chunk.
+
+    Returns
+    -------
+    xarray.DataArray
+    """
+    stack = _time_chunks(_masked(stack, mask), memory)
+
+    return stack.median("time", skipna=True)
+
+
+def percentile(stack, percentiles, mask=None, memory=MEMORY):
+    """Reduces a stack over time by computing one or more percentiles.
+
+    Parameters
+    ----------
+    stack: xarray.DataArray
+        Stack with a :code:`time` dimension (e.g. the result of :code:`getInfo()`).
+    percentiles: float | list
+        Percentile (or list of percentiles) between 0 and 100.
+    mask: xarray.DataArray | callable
+        Boolean mask (or function of the stack that returns it) of the values to keep.
+    memory: int
+        Maximum number of bytes per chunk.
+
+    Returns
+    -------
+    xarray.DataArray
+        If a list of percentiles is given, the result has a :code:`percentile`
+        dimension.
+    """
+    stack = _time_chunks(_masked(stack, mask), memory)
+    result = stack.quantile(np.asarray(percentiles) / 100, dim="time", skipna=True)
+
+    if np.ndim(percentiles) == 0:
+        return result.drop_vars("quantile")
+
+    result = result.assign_coords(quantile=np.asarray(percentiles))
+
+    return result.rename(quantile="percentile")
+
+
+def mosaic(stack, mask=None):
+    """Reduces a stack over time by keeping the first valid value of each pixel.
+
+    The stack is reduced time chunk by time chunk (in time order), so only a few time
+    chunks per spatial chunk are held in memory.
+
+    Parameters
+    ----------
+    stack: xarray.DataArray
+        Stack with a :code:`time` dimension (e.g. the result of :code:`getInfo()`).
+        Sort the time dimension in the order of preference (e.g. by cloud cover).
+    mask: xarray.DataArray | callable
+        Boolean mask (or function of the stack that returns it) of the values to keep.
+
+    Returns
+    -------
+    xarray.DataArray
+    """
+    stack = _masked(stack, mask)
+
+    return stack.reduce(_reduction(_first_valid, stack.dtype), dim="time")
+
+
+def qualityMosaic(stack, band, mask=None):
+    """Reduces a stack over time by keeping, for each pixel, the bands at the time
+    where a quality band is the greatest.
+
+    Parameters
+    ----------
+    stack: xarray.DataArray
+        Stack with :code:`time` and :code:`band` dimensions (e.g. the result of
+        :code:`getInfo()`).
+    band: str
+        Quality band (e.g. an NDVI band).
+    mask: xarray.DataArray | callable
+        Boolean mask (or function of the stack that returns it) of the values to keep.
+
+    Returns
+    -------
+    xarray.DataArray
+    """
+    stack = _masked(stack, mask).chunk({"band": -1})
+    stack = stack.transpose("time", "band", ...)
+    index = list(stack.band.values).index(band)
+    function = partial(_best, band=index)
+
+    return stack.reduce(_reduction(function, stack.dtype), dim="time")
@@ -0,0 +1,220 @@
+"""easystac - Windowed reads of pixel values at points"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . import instrumentation
+from .partition import item_bounds, parse_date
+
+# GDAL options for reading a few blocks of remote COGs
+GDAL_OPTIONS = {
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "GDAL_HTTP_MERGE_CONSECUTIVE_RANGES": "YES",
+    "GDAL_HTTP_MULTIRANGE": "YES",
+    "VSI_CACHE": "TRUE",
+}
+
+# Media types of the assets sampled when no band is selected
+RASTER_TYPES = ("image/tiff", "image/vnd.stac.geotiff")
+
+
+def _points(points):
+    """Returns the ids, longitudes and latitudes of the points."""
+    points = getattr(points, "__geo_interface__", points)
+    if isinstance(points, dict):
+        if points["type"] == "FeatureCollection":
+            points = points["features"]
+        elif points["type"] == "MultiPoint":
+            points = [
+                {"type": "Point", "coordinates": c} for c in points["coordinates"]
+            ]
+        else:
+            points = [points]
+
+    ids, xs, ys = [], [], []
+    for i, point in enumerate(points):
+        point = getattr(point, "__geo_interface__", point)
+        if isinstance(point, dict) and point.get("type") == "Feature":
+            ids.append(point.get("id", i))
+            point = point["geometry"]
+        else:
+            ids.append(i)
+        x, y = point["coordinates"][:2] if isinstance(point, dict) else point[:2]
+        xs.append(x)
+        ys.append(y)
+
+    return ids, np.array(xs, dtype=float), np.array(ys, dtype=float)
+
+
+def _inside(item, xs, ys):
+    """Returns the indices of the points inside the footprint of an item."""
+    bbox = item_bounds(item)
+    inside = np.flatnonzero(
+        (xs >= bbox[0]) & (xs <= bbox[2]) & (ys >= bbox[1]) & (ys <= bbox[3])
+    )
+
+    try:
+        import shapely
+        from shapely.geometry import shape
+    except ImportError:
+        return inside
+
+    if item.get("geometry") and len(inside):
+        footprint = shape(item["geometry"])
+        inside = inside[shapely.intersects_xy(footprint, xs[inside], ys[inside])]
+
+    return inside
+
+
+def _bands(item, bands):
+    """Returns the keys of the assets sampled from an item."""
+    assets = item.get("assets", {})
+    if bands is not None:
+        return [band for band in bands if band in assets]
+
+    return [
+        key
+        for key, asset in assets.items()
+        if str(asset.get("type", "")).split(";")[0] in RASTER_TYPES
+        or asset.get("href", "").lower().endswith((".tif", ".tiff"))
+    ]
+
+
+def _read(href, xs, ys, asset):
+    """Reads the values of an asset at the points, one block window at a time.
+
+    Returns
+    -------
+    tuple
+        Values (points, bands) and number of blocks read.
+    """
+    import rasterio
+    from rasterio.transform import rowcol
+    from rasterio.warp import transform
+    from rasterio.windows import Window
+
+    with rasterio.Env(**GDAL_OPTIONS), rasterio.open(href) as src:
+        if src.crs is not None and src.crs.to_epsg() != 4326:
+            xs, ys = transform("EPSG:4326", src.crs, xs, ys)
+        rows, cols = rowcol(src.transform, xs, ys)
+        rows, cols = np.asarray(rows), np.asarray(cols)
+
+        values = np.full((len(rows), src.count), np.nan)
+        valid = (rows >= 0) & (rows < src.height) & (cols >= 0) & (cols < src.width)
+        height, width = src.block_shapes[0]
+        blocks = {}
+        for i in np.flatnonzero(valid):
+            blocks.setdefault((rows[i] // height, cols[i] // width), []).append(i)
+
+        full = Window(0, 0, src.width, src.height)
+        for (row, col), indices in blocks.items():
+            window = Window(col * width, row * height, width, height).intersection(full)
+            data = src.read(window=window, masked=True)
+            indices = np.array(indices)
+            block = data[:, rows[indices] - row * height, cols[indices] - col * width]
+            values[indices] = block.astype("float64").filled(np.nan).T
+
+    bands = asset.get("raster:bands", [])
+    for b, band in enumerate(bands[: values.shape[1]]):
+        values[:, b] = values[:, b] * band.get("scale", 1) + band.get("offset", 0)
+
+    return values, len(blocks)
+
+
+def sample(items, points, bands=None, workers=16):
+    """Reads the pixel values of the items at points.
+
+    The points are matched with the footprints of the items and, for each asset, the
+    points are grouped by the COG block that holds them, so only those blocks are read
+    (one windowed read per block, without reprojecting the rasters). The assets are
+    read in parallel. Nodata values are returned as NaN, and the scale and offset of
+    the :code:`raster:bands` are applied.
+
+    Parameters
+    ----------
+    items: list
+        List of STAC items as dictionaries.
+    points: dict | list
+        GeoJSON FeatureCollection, MultiPoint, or list of Point features, Point
+        geometries or (longitude, latitude) tuples. The ids of the features are used
+        as point ids, otherwise their position.
+    bands: list
+        Assets sampled. If None, all the GeoTIFF assets.
+    workers: int
+        Maximum number of assets read concurrently.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per point and item with the :code:`point`, :code:`id` (item id) and
+        :code:`time` columns and one column per band (multi-band assets get one column
+        per band, suffixed with the band number).
+
+    Examples
+    --------
+    >>> from easystac.sampling import sample
+    >>> table = sample(items, points, bands = ["B04", "B08"])
+    """
+    import pandas as pd
+
+    ids, xs, ys = _points(points)
+
+    tasks = []
+    for item in items:
+        inside = _inside(item, xs, ys)
+        if len(inside):
+            for band in _bands(item, bands):
+                tasks.append((item, band, inside))
+
+    def read(task):
+        item, band, inside = task
+        asset = item["assets"][band]
+        with instrumentation.span("sample.read", points=len(inside)) as span:
+            values, blocks = _read(asset["href"], xs[inside], ys[inside], asset)
+            span.set(blocks=blocks)
+        return values
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(instrumentation.propagate(read), tasks))
+
+    rows = {}
+    for (item, band, inside), values in zip(tasks, results):
+        properties = item["properties"]
+        date = parse_date(properties.get("datetime") or properties["start_datetime"])
+        for i, point in enumerate(inside):
+            row = rows.setdefault(
+                (point, item["id"]),
+                {"point": ids[point], "id": item["id"], "time": date},
+            )
+            if values.shape[1] == 1:
+                row[band] = values[i, 0]
+            else:
+                for b in range(values.shape[1]):
+                    row[f"{band}_{b + 1}"] = values[i, b]
+
+    table = pd.DataFrame(
+        list(rows.values()), columns=None if rows else ["point", "id", "time"]
+    )
+
+    return table.sort_values(["point", "time", "id"], ignore_index=True)
+
+
+def to_dataset(table):
+    """Converts a table of samples into a Dataset of time series.
+
+    Points covered by several items at the same time (e.g. overlapping tiles) keep the
+    first valid value.
+
+    Parameters
+    ----------
+    table: pandas.DataFrame
+        Table returned by :code:`sample()`.
+
+    Returns
+    -------
+    xarray.Dataset
+        One variable per band, with :code:`point` and :code:`time` dimensions.
+    """
+    values = table.drop(columns="id").groupby(["point", "time"]).first()
+
+    return values.to_xarray()
@@ -0,0 +1,173 @@
+"""easystac - Incrementally refreshed saved queries"""
+import copy
+import json
+from pathlib import Path
+
+from .cache import query_key
+from .client import open_client
+from .filters import Filter
+from .local import _pages, write_items
+from .partition import parse_date
+
+
+def _max(values):
+    values = [value for value in values if value]
+    return max(values) if values else None
+
+
+class SavedQuery:
+    """SavedQuery object.
+
+    Persists the items of a query together with the watermarks of the newest
+    :code:`datetime` and :code:`updated` values seen. Refreshing the query only fetches
+    the items that are newer than the watermarks and merges them into the stored items.
+
+    Parameters
+    ----------
+    collection: BaseImageCollection
+        Collection with the filters that define the query.
+    path: str
+        Directory where the state and the items are stored.
+
+    Examples
+    --------
+    >>> import easystac.planetary as pc
+    >>> S2 = (pc.ImageCollection("sentinel-2-l2a")
+            .filterBounds(geom)
+            .filterDate("2020-01-01","2030-01-01")
+            .save("~/easystac/s2-site"))
+    >>> S2.refresh()
+    >>> image_collection = S2.getInfo(resolution = 10)
+    """
+
+    def __init__(self, collection, path):
+        """Initializes the SavedQuery object."""
+
+        self.collection = collection
+        """Collection with the filters that define the query."""
+
+        self.path = Path(path).expanduser()
+        """Directory where the state and the items are stored."""
+
+        self.state = None
+        """Saved state (query key, watermarks and number of items)."""
+
+        state = self.path / "state.json"
+        if state.is_file():
+            self.state = json.loads(state.read_text())
+
+    @property
+    def _items_path(self):
+        return self.path / "items.ndjson"
+
+    def _key(self):
+        """Returns the key of the query."""
+        url, _ = self.collection._connection()
+
+        return query_key(url, self.collection._query())
+
+    def _incremental(self):
+        """Returns a copy of the collection restricted to the new items."""
+        collection = copy.copy(self.collection)
+        url, parameters = collection._connection()
+        catalog = open_client(url, parameters=parameters)
+
+        if self.state["updated"] is not None:
+            updated = Filter.gte("updated", parse_date(self.state["updated"]))
+            if self.state["datetime"] is not None:
+                # Items without an updated property are found by their datetime
+                newer = Filter.gte("datetime", parse_date(self.state["datetime"]))
+                updated = Filter.Or(updated, newer)
+            collection.filter = updated
+            if self.collection.filter is not None:
+                collection.filter = Filter.And(self.collection.filter, updated)
+            if collection._pushdown(catalog):
+                return collection
+            collection.filter = self.collection.filter
+
+        # Without a datetime watermark (nothing was found yet) all the items are fetched
+        start = self.state["datetime"]
+        if start is not None:
+            _, _, end = (self.collection.datetime or "../..").partition("/")
+            collection.datetime = f"{start}/{end or '..'}"
+
+        return collection
+
+    def refresh(self):
+        """Fetches the new or updated items and merges them into the stored items.
+
+        The first refresh (or a refresh after the query or its datetime interval
+        changed) fetches all the items. The later ones fetch the items updated after
+        the :code:`updated` watermark or acquired after the :code:`datetime` watermark
+        when the STAC supports filters, and the items after the :code:`datetime`
+        watermark otherwise.
+
+        Returns
+        -------
+        int
+            Number of new or updated items.
+        """
+        key = self._key()
+        items = {}
+
+        if self.state is not None and self.state["key"] == key:
+            collection = self._incremental()
+            for page in _pages(self._items_path):
+                for item in page:
+                    items[item["id"]] = item
+        else:
+            collection = self.collection
+
+        url, parameters = collection._connection()
+        new = collection._fetch(url=url, parameters=parameters)
+
+        changed = 0
+        for item in new:
+            if items.get(item["id"]) != item:
+                changed += 1
+            items[item["id"]] = item
+
+        items = sorted(
+            items.values(),
+            key=lambda item: (item["properties"].get("datetime") or "", item["id"]),
+        )
+        properties = [item["properties"] for item in items]
+
+        self.state = {
+            "key": key,
+            "datetime": _max(p.get("datetime") for p in properties),
+            "updated": _max(p.get("updated") for p in properties),
+            "size": len(items),
+        }
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        write_items(items, self._items_path)
+        (self.path / "state.json").write_text(json.dumps(self.state))
+
+        return changed
+
+    def items(self):
+        """Returns the stored items, signed when the provider requires it.
+
+        Returns
+        -------
+        list
+        """
+        items = [item for page in _pages(self._items_path) for item in page]
+
+        return self.collection._sign(items)
+
+    def getInfo(self, **kwargs):
+        """Returns the stored items as a stack.
+
+        Parameters
+        ----------
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
+
+        Returns
+        -------
+        xarray.DataArray
+            Chunked DataArray with Dask.
+        """
+        return self.collection._stack(self.items(), **kwargs)
@@ -0,0 +1,370 @@
+"""easystac - Columnar representation of STAC items"""
+import json
+
+import numpy as np
+
+from .partition import item_bounds
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "Reading and writing Arrow/Parquet files requires pyarrow. Please install "
+            "it by running:: \n\npip install pyarrow\n"
+        )
+    return pyarrow
+
+
+class ItemTable:
+    """ItemTable object.
+
+    Columnar representation of a list of STAC items. The most used fields are kept as
+    NumPy arrays (so filtering, sorting and grouping are vectorized) and each item is
+    kept as a compact JSON string that is only parsed when the items are stacked.
+
+    Parameters
+    ----------
+    columns: dict
+        Dictionary of NumPy arrays with the same length. It must include :code:`id`,
+        :code:`collection`, :code:`datetime`, :code:`bbox` and :code:`item`.
+
+    Examples
+    --------
+    >>> import easystac.planetary as pc
+    >>> pc.Initialize()
+    >>> table = (pc.ImageCollection("sentinel-2-l2a")
+            .filterBounds(geom)
+            .filterDate("2020-01-01","2021-01-01")
+            .getTable())
+    >>> clear = table[table["eo:cloud_cover"] < 20].sort("datetime")
+    >>> S2 = clear.stack(resolution = 10)
+    """
+
+    def __init__(self, columns):
+        """Initializes the ItemTable object."""
+
+        self.columns = columns
+        """Dictionary of NumPy arrays."""
+
+    @classmethod
+    def from_items(cls, items, properties=("eo:cloud_cover",)):
+        """Builds a table from a list of STAC items.
+
+        Parameters
+        ----------
+        items: list
+            List of STAC items as dictionaries.
+        properties: tuple
+            Properties kept as columns (besides the datetime).
+
+        Returns
+        -------
+        ItemTable
+        """
+        return cls.from_pages([items], properties=properties)
+
+    @classmethod
+    def from_pages(cls, pages, properties=("eo:cloud_cover",)):
+        """Builds a table from an iterable of pages, without keeping the item dicts.
+
+        Parameters
+        ----------
+        pages: iterable
+            Iterable of lists of STAC items as dictionaries (e.g.
+            :code:`ImageCollection.iterPages()`).
+        properties: tuple
+            Properties kept as columns (besides the datetime).
+
+        Returns
+        -------
+        ItemTable
+        """
+        ids, collections, datetimes, bboxes, raw = [], [], [], [], []
+        values = {name: [] for name in properties}
+        hrefs = {}
+        n = 0
+
+        for page in pages:
+            for item in page:
+                props = item.get("properties", {})
+                ids.append(item["id"])
+                collections.append(item.get("collection"))
+                datetimes.append(_datetime(props))
+                bboxes.append(_bbox(item))
+                for name in properties:
+                    value = props.get(name)
+                    values[name].append(np.nan if value is None else value)
+                for key, asset in item.get("assets", {}).items():
+                    # Assets missing in the previous items get None as href
+                    hrefs.setdefault(key, [None] * n).append(asset["href"])
+                n += 1
+                for column in hrefs.values():
+                    if len(column) < n:
+                        column.append(None)
+                raw.append(json.dumps(item, separators=(",", ":")))
+
+        columns = {
+            "id": np.array(ids, dtype=object),
+            "collection": np.array(collections, dtype=object),
+            "datetime": np.array(datetimes, dtype="datetime64[ns]"),
+            "bbox": np.array(bboxes, dtype=float).reshape(-1, 4),
+        }
+        for name, column in values.items():
+            columns[name] = _array(column)
+        for key, column in hrefs.items():
+            columns[f"href:{key}"] = np.array(column, dtype=object)
+        columns["item"] = np.array(raw, dtype=object)
+
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def __repr__(self):
+        return f"ItemTable({len(self)} items, columns={list(self.columns)})"
+
+    def __getitem__(self, key):
+        """Returns a column by name, or the rows selected by a mask or indices."""
+        if isinstance(key, str):
+            return self.columns[key]
+
+        return ItemTable({name: column[key] for name, column in self.columns.items()})
+
+    @property
+    def bands(self):
+        """Asset keys with at least one href in the table."""
+        return [name[5:] for name in self.columns if name.startswith("href:")]
+
+    def filter(self, mask):
+        """Returns the rows where the mask is True.
+
+        Parameters
+        ----------
+        mask: numpy.ndarray
+            Boolean mask (e.g. :code:`table["eo:cloud_cover"] < 20`).
+
+        Returns
+        -------
+        ItemTable
+        """
+        return self[np.asarray(mask, dtype=bool)]
+
+    def intersects(self, bbox):
+        """Returns the rows whose bbox intersects a bounding box.
+
+        Parameters
+        ----------
+        bbox: tuple
+            Bounding box (minx, miny, maxx, maxy).
+
+        Returns
+        -------
+        ItemTable
+        """
+        b = self.columns["bbox"]
+        mask = (
+            (b[:, 0] <= bbox[2])
+            & (b[:, 2] >= bbox[0])
+            & (b[:, 1] <= bbox[3])
+            & (b[:, 3] >= bbox[1])
+        )
+        return self[mask]
+
+    def sort(self, column="datetime", ascending=True):
+        """Returns the rows sorted by a column (stable, missing values last).
+
+        Parameters
+        ----------
+        column: str
+            Column name.
+        ascending: bool
+            Whether to sort in ascending order.
+
+        Returns
+        -------
+        ItemTable
+        """
+        values = self.columns[column]
+        order = np.argsort(values, kind="stable")
+        if not ascending:
+            order = order[::-1]
+            if values.dtype.kind in "fM":
+                missing = np.isnan(values[order])
+                order = np.concatenate([order[~missing], order[missing]])
+
+        return self[order]
+
+    def groupby(self, column="datetime", freq=None):
+        """Groups the rows by the values of a column.
+
+        Parameters
+        ----------
+        column: str
+            Column name.
+        freq: str
+            NumPy datetime unit used to truncate datetimes before grouping (e.g.
+            :code:`D` to group by day).
+
+        Returns
+        -------
+        dict
+            Dictionary of ItemTable objects by value.
+        """
+        values = self.columns[column]
+        if freq is not None:
+            values = values.astype(f"datetime64[{freq}]")
+        keys, inverse = np.unique(values, return_inverse=True)
+
+        return {key: self[inverse == i] for i, key in enumerate(keys)}
+
+    def to_items(self):
+        """Returns the items as a list of dictionaries.
+
+        Returns
+        -------
+        list
+        """
+        return [json.loads(item) for item in self.columns["item"]]
+
+    def stack(self, **kwargs):
+        """Stacks the items with :code:`stackstac.stack()`.
+
+        Parameters
+        ----------
+        **kwargs
+            Additional arguments passed to :code:`stackstac.stack()`.
+
+        Returns
+        -------
+        xarray.DataArray
+        """
+        import stackstac
+
+        return stackstac.stack(self.to_items(), **kwargs)
+
+    def to_arrow(self):
+        """Returns the table as a :code:`pyarrow.Table`.
+
+        Returns
+        -------
+        pyarrow.Table
+        """
+        pa = _require_pyarrow()
+        bbox = self.columns["bbox"]
+        arrays = {
+            "id": pa.array(self.columns["id"], type=pa.string()),
+            "collection": pa.array(self.columns["collection"], type=pa.string()),
+            "datetime": pa.array(self.columns["datetime"]),
+            "bbox": pa.StructArray.from_arrays(
+                [pa.array(bbox[:, i]) for i in range(4)],
+                names=["xmin", "ymin", "xmax", "ymax"],
+            ),
+        }
+        for name, column in self.columns.items():
+            if name not in arrays and name != "item":
+                arrays[name] = pa.array(column, from_pandas=True)
+        arrays["item"] = pa.array(self.columns["item"], type=pa.string())
+
+        return pa.table(arrays)
+
+    @classmethod
+    def from_arrow(cls, table):
+        """Builds a table from a :code:`pyarrow.Table` written by :code:`to_arrow()`.
+
+        Parameters
+        ----------
+        table: pyarrow.Table
+
+        Returns
+        -------
+        ItemTable
+        """
+        pa = _require_pyarrow()
+        columns = {}
+        for name in table.column_names:
+            column = table.column(name)
+            if name == "bbox":
+                columns[name] = np.stack(
+                    [column.combine_chunks().field(f).to_numpy() for f in range(4)],
+                    axis=1,
+                ).astype(float)
+            elif name == "datetime":
+                columns[name] = column.to_numpy().astype("datetime64[ns]")
+            elif pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+                columns[name] = _array(column.to_pylist())
+            else:
+                # Ids, collections, hrefs and strings are kept even if they look numeric
+                columns[name] = np.array(column.to_pylist(), dtype=object)
+
+        return cls(columns)
+
+    def to_parquet(self, path):
+        """Writes the table to a Parquet file.
+
+        Parameters
+        ----------
+        path: str
+            Output path.
+        """
+        _require_pyarrow().parquet.write_table(self.to_arrow(), path)
+
+    @classmethod
+    def from_parquet(cls, path):
+        """Reads a table written by :code:`to_parquet()`.
+
+        Files written by :code:`stac-geoparquet` (without the :code:`item` column) are
+        also supported when :code:`stac-geoparquet` is installed.
+
+        Parameters
+        ----------
+        path: str
+            Input path.
+
+        Returns
+        -------
+        ItemTable
+        """
+        table = _require_pyarrow().parquet.read_table(path)
+
+        if "item" in table.column_names:
+            return cls.from_arrow(table)
+
+        try:
+            from stac_geoparquet.arrow import stac_table_to_items
+        except ImportError:
+            raise ImportError(
+                "Reading stac-geoparquet files requires stac-geoparquet. Please install "
+                "it by running:: \n\npip install stac-geoparquet\n"
+            )
+
+        return cls.from_items(list(stac_table_to_items(table)))
+
+
+def _datetime(properties):
+    """Returns the datetime of an item as a string parseable by NumPy."""
+    date = properties.get("datetime") or properties.get("start_datetime")
+    if not date:
+        return "NaT"
+
+    return date.replace("Z", "").replace("+00:00", "")
+
+
+def _bbox(item):
+    """Returns the 2D bbox of an item."""
+    if not item.get("bbox"):
+        return [np.nan] * 4
+
+    return list(item_bounds(item))
+
+
+def _array(values):
+    """Converts a list of values to a NumPy array, numeric if all values are numbers."""
+    if all(
+        value is None or isinstance(value, (int, float, np.number)) for value in values
+    ):
+        return np.array(values, dtype=float)
+
+    return np.array(values, dtype=object)
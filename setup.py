@@ -24,13 +24,20 @@ setup(
     long_description_content_type="text/markdown",
     packages=find_packages(exclude=("tests",)),
     install_requires=[
-        "planetary_computer",
         "pystac_client",
         "radiant_mlhub",
         "six",
         "stackstac",
         "termcolor",
     ],
+    extras_require={
+        "export": ["zarr"],
+        "table": ["pyarrow"],
+        "tiling": ["shapely"],
+    },
+    entry_points={
+        "console_scripts": ["easystac-batch=easystac.batch:main"],
+    },
     python_requires=">=3.8",
     classifiers=[
         "Development Status :: 2 - Pre-Alpha",
@@ -0,0 +1,424 @@
+"""Local stand-in for a STAC API used by the offline tests."""
+import datetime
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CONFORMANCE = [
+    "https://api.stacspec.org/v1.0.0/core",
+    "https://api.stacspec.org/v1.0.0/item-search",
+]
+
+
+def make_items(n=100, collection="stub-collection", start="2020-01-01", step_days=1):
+    """Returns synthetic STAC items laid out along a row of UTM tiles."""
+    start = datetime.datetime.fromisoformat(start)
+    items = []
+    for i in range(n):
+        x = -76.5 + (i % 10) * 0.1
+        bbox = [x, 4.0, x + 0.1, 4.1]
+        date = start + datetime.timedelta(days=i * step_days)
+        items.append(
+            {
+                "type": "Feature",
+                "stac_version": "1.0.0",
+                "stac_extensions": [],
+                "id": f"item-{i:05d}",
+                "collection": collection,
+                "bbox": bbox,
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [
+                        [
+                            [bbox[0], bbox[1]],
+                            [bbox[2], bbox[1]],
+                            [bbox[2], bbox[3]],
+                            [bbox[0], bbox[3]],
+                            [bbox[0], bbox[1]],
+                        ]
+                    ],
+                },
+                "properties": {
+                    "datetime": date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "eo:cloud_cover": i % 100,
+                    "proj:epsg": 4326,
+                    "proj:bbox": bbox,
+                    "proj:shape": [10, 10],
+                    "proj:transform": [0.01, 0, bbox[0], 0, -0.01, bbox[3], 0, 0, 1],
+                },
+                "links": [],
+                "assets": {
+                    band: {
+                        "href": f"https://stub.blob.core.windows.net/data/{i}/{band}.tif",
+                        "type": "image/tiff; application=geotiff; profile=cloud-optimized",
+                        "roles": ["data"],
+                    }
+                    for band in ["B02", "B03", "B04"]
+                },
+            }
+        )
+    return items
+
+
+def _bbox_of(geometry):
+    coords = []
+
+    def walk(c):
+        if isinstance(c[0], (int, float)):
+            coords.append(c)
+        else:
+            for sub in c:
+                walk(sub)
+
+    walk(geometry["coordinates"])
+    xs = [c[0] for c in coords]
+    ys = [c[1] for c in coords]
+    return [min(xs), min(ys), max(xs), max(ys)]
+
+
+def _parse_datetime(value):
+    return datetime.datetime.fromisoformat(
+        value.replace("Z", "+00:00").replace("+00:00", "")
+    )
+
+
+QUERY_OPS = {"eq": "=", "neq": "<>", "lt": "<", "gt": ">", "lte": "<=", "gte": ">="}
+
+
+def _compare(op, left, right):
+    if left is None:
+        return False
+    return {
+        "=": lambda: left == right,
+        "<>": lambda: left != right,
+        "<": lambda: left < right,
+        ">": lambda: left > right,
+        "<=": lambda: left <= right,
+        ">=": lambda: left >= right,
+    }[op]()
+
+
+def _like(pattern):
+    """Translates a CQL2 like pattern (with backslash escapes) into a regex."""
+    regex = ""
+    escaped = False
+    for char in pattern:
+        if escaped:
+            regex += re.escape(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "%":
+            regex += ".*"
+        elif char == "_":
+            regex += "."
+        else:
+            regex += re.escape(char)
+    return re.compile(regex, re.DOTALL)
+
+
+def _cql2(expr, item):
+    """Evaluates the subset of CQL2-JSON used by the tests."""
+    op, args = expr["op"], expr["args"]
+    if op == "and":
+        return all(_cql2(a, item) for a in args)
+    if op == "or":
+        return any(_cql2(a, item) for a in args)
+    if op == "not":
+        return not _cql2(args[0], item)
+    name = args[0]["property"]
+    value = (
+        item.get(name) if name in ("id", "collection") else item["properties"].get(name)
+    )
+    if op == "like":
+        return isinstance(value, str) and _like(args[1]).fullmatch(value) is not None
+    if isinstance(args[1], dict) and "timestamp" in args[1]:
+        if value is None:
+            return False
+        return _compare(
+            op, _parse_datetime(value), _parse_datetime(args[1]["timestamp"])
+        )
+    return _compare(op, value, args[1])
+
+
+def _include(item, include):
+    """Applies the include list of the fields extension to an item."""
+    if not include:
+        return item
+    result = {}
+    for field in include:
+        key, _, sub = field.partition(".")
+        if key not in item:
+            continue
+        if not sub:
+            result[key] = item[key]
+        elif sub in item[key]:
+            result.setdefault(key, {})[sub] = item[key][sub]
+    return result
+
+
+class StubSTAC:
+    """Serves a list of STAC items through a minimal STAC API on localhost.
+
+    Parameters
+    ----------
+    items: list
+        STAC items as dictionaries.
+    page_size: int
+        Default number of items per page.
+    conformance: list
+        Conformance classes announced by the landing page.
+    latency: float
+        Seconds waited before answering each API request.
+    files: str
+        Directory served under :code:`/files/` (with HTTP range requests).
+    """
+
+    def __init__(self, items, page_size=10, conformance=None, latency=0.0, files=None):
+        self.items = items
+        self.page_size = page_size
+        self.conformance = conformance or list(CONFORMANCE)
+        self.latency = latency
+        self.files = files
+        # (status, Retry-After) answered to the next search requests instead of a page
+        self.failures = []
+        self.requests = []
+        self.queries = []
+        self._searches = {}
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self, "GET")
+
+            def do_POST(self):
+                stub._handle(self, "POST")
+
+            def do_HEAD(self):
+                stub._handle(self, "HEAD")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def searches(self):
+        """Number of requests made to the search endpoint."""
+        return sum(1 for method, path in self.requests if path == "/search")
+
+    def _send(self, handler, body, status=200, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        handler.send_response(status)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _handle(self, handler, method):
+        parsed = urlparse(handler.path)
+        if parsed.path.startswith("/files/") and self.files is not None:
+            return self._send_file(handler, method, parsed.path[len("/files/") :])
+        with self._lock:
+            self.requests.append((method, parsed.path))
+        if self.latency:
+            time.sleep(self.latency)
+        if parsed.path in ("", "/"):
+            return self._send(handler, self._landing())
+        if parsed.path == "/conformance":
+            return self._send(handler, {"conformsTo": self.conformance})
+        if parsed.path == "/search":
+            with self._lock:
+                failure = self.failures.pop(0) if self.failures else None
+            if failure is not None:
+                status, retry_after = failure
+                headers = {"Retry-After": retry_after} if retry_after else None
+                return self._send(handler, {"code": "Error"}, status, headers)
+            query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            if method == "POST":
+                length = int(handler.headers.get("Content-Length") or 0)
+                if length:
+                    query.update(json.loads(handler.rfile.read(length)))
+            with self._lock:
+                self.queries.append(query)
+            return self._send(handler, self._search(query))
+        return self._send(handler, {"code": "NotFound"}, status=404)
+
+    def _send_file(self, handler, method, name):
+        path = os.path.join(self.files, os.path.basename(name))
+        if not os.path.isfile(path):
+            return self._send(handler, {"code": "NotFound"}, status=404)
+        size = os.path.getsize(path)
+        start, end, status = 0, size - 1, 200
+        ranges = handler.headers.get("Range")
+        if ranges and ranges.startswith("bytes="):
+            first, _, last = ranges[len("bytes=") :].split(",")[0].partition("-")
+            start = int(first) if first else max(size - int(last), 0)
+            end = min(int(last), size - 1) if first and last else size - 1
+            status = 206
+        handler.send_response(status)
+        handler.send_header("Content-Type", "image/tiff")
+        handler.send_header("Accept-Ranges", "bytes")
+        handler.send_header("Content-Length", str(end - start + 1))
+        if status == 206:
+            handler.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        handler.end_headers()
+        if method == "HEAD":
+            return
+        with open(path, "rb") as f:
+            f.seek(start)
+            handler.wfile.write(f.read(end - start + 1))
+
+    def _landing(self):
+        return {
+            "type": "Catalog",
+            "id": "stub",
+            "description": "Stub STAC API",
+            "stac_version": "1.0.0",
+            "conformsTo": self.conformance,
+            "links": [
+                {"rel": "self", "href": self.url + "/", "type": "application/json"},
+                {"rel": "root", "href": self.url + "/", "type": "application/json"},
+                {
+                    "rel": "conformance",
+                    "href": self.url + "/conformance",
+                    "type": "application/json",
+                },
+                {
+                    "rel": "search",
+                    "href": self.url + "/search",
+                    "type": "application/geo+json",
+                    "method": "GET",
+                },
+                {
+                    "rel": "search",
+                    "href": self.url + "/search",
+                    "type": "application/geo+json",
+                    "method": "POST",
+                },
+            ],
+        }
+
+    def _filter(self, query):
+        items = self.items
+        collections = query.get("collections")
+        if collections:
+            if isinstance(collections, str):
+                collections = collections.split(",")
+            items = [i for i in items if i["collection"] in collections]
+        intersects = query.get("intersects")
+        bbox = query.get("bbox")
+        if intersects:
+            if isinstance(intersects, str):
+                intersects = json.loads(intersects)
+            bbox = _bbox_of(intersects)
+        elif isinstance(bbox, str):
+            bbox = [float(v) for v in bbox.split(",")]
+        if bbox:
+            items = [
+                i
+                for i in items
+                if i["bbox"][0] <= bbox[2]
+                and i["bbox"][2] >= bbox[0]
+                and i["bbox"][1] <= bbox[3]
+                and i["bbox"][3] >= bbox[1]
+            ]
+        dt = query.get("datetime")
+        if dt:
+            start, _, end = dt.partition("/")
+            if not end:
+                end = start
+            lower = None if start in ("", "..") else _parse_datetime(start)
+            upper = None if end in ("", "..") else _parse_datetime(end)
+            items = [
+                i
+                for i in items
+                if (
+                    lower is None
+                    or _parse_datetime(i["properties"]["datetime"]) >= lower
+                )
+                and (
+                    upper is None
+                    or _parse_datetime(i["properties"]["datetime"]) <= upper
+                )
+            ]
+        cql2 = query.get("filter")
+        if cql2:
+            if isinstance(cql2, str):
+                cql2 = json.loads(cql2)
+            items = [i for i in items if _cql2(cql2, i)]
+        for name, conditions in (query.get("query") or {}).items():
+            for op, value in conditions.items():
+                items = [
+                    i
+                    for i in items
+                    if _compare(QUERY_OPS[op], i["properties"].get(name), value)
+                ]
+        sortby = query.get("sortby")
+        if isinstance(sortby, str):
+            sortby = [
+                {"field": f.lstrip("+-"), "direction": "desc" if f[0] == "-" else "asc"}
+                for f in sortby.split(",")
+            ]
+        for sort in reversed(sortby or []):
+            key, _, sub = sort["field"].partition(".")
+            items = sorted(
+                items,
+                key=lambda i: (i[key][sub] if sub else i[key]),
+                reverse=sort["direction"] == "desc",
+            )
+        return items
+
+    def _search(self, query):
+        token = query.get("token")
+        if token:
+            search_id, _, offset = token.partition(":")
+            with self._lock:
+                matched, limit = self._searches[search_id]
+            offset = int(offset)
+        else:
+            matched = self._filter(query)
+            limit = int(query.get("limit") or self.page_size)
+            search_id = uuid.uuid4().hex
+            with self._lock:
+                self._searches[search_id] = (matched, limit)
+            offset = 0
+        page = matched[offset : offset + limit]
+        if query.get("fields"):
+            page = [_include(item, query["fields"].get("include")) for item in page]
+        links = []
+        if offset + limit < len(matched):
+            links.append(
+                {
+                    "rel": "next",
+                    "href": f"{self.url}/search?token={search_id}:{offset + limit}",
+                    "method": "GET",
+                    "type": "application/geo+json",
+                }
+            )
+        return {
+            "type": "FeatureCollection",
+            "features": page,
+            "links": links,
+            "numberMatched": len(matched),
+            "numberReturned": len(page),
+            "context": {"matched": len(matched), "returned": len(page), "limit": limit},
+        }
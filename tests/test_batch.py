@@ -0,0 +1,128 @@
+import json
+import os
+import tempfile
+import unittest
+
+import rasterio
+from rasterio.features import geometry_mask
+from stac_stub import StubSTAC, make_items
+from test_sampling import expected, make_sampled_items, write_cogs
+
+import easystac as es
+from easystac.batch import main, run, run_site
+
+
+def square(x):
+    """Returns a small square inside the tile starting at x."""
+    return {
+        "type": "Polygon",
+        "coordinates": [
+            [[x + 0.02, 4.02], [x + 0.08, 4.02], [x + 0.08, 4.08], [x + 0.02, 4.02]]
+        ],
+    }
+
+
+sites = [
+    ("first", square(-76.5)),
+    ("sixth", square(-76.0)),
+    ("broken", {"type": "Polygon", "coordinates": []}),
+]
+
+
+class Test(unittest.TestCase):
+    """Tests for the batch runner."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_run(self):
+        """Test that the results are streamed and that a rerun skips the done sites"""
+        reports = []
+        cache = es.get_cache()
+        with StubSTAC(make_items(100)) as stac, tempfile.TemporaryDirectory() as tmp:
+            spec = {
+                "collection": "stub-collection",
+                "stac": stac.url,
+                "cache": os.path.join(tmp, "cache"),
+            }
+            output = os.path.join(tmp, "results.ndjson")
+            summary = run(
+                sites,
+                spec,
+                output,
+                processes=0,
+                threads=2,
+                batch_size=2,
+                progress=lambda *args: reports.append(args),
+            )
+            self.assertEqual(summary, {"sites": 3, "run": 3, "failed": 1, "skipped": 0})
+            # The cache of the run does not replace the cache of the caller
+            self.assertIs(es.get_cache(), cache)
+            self.assertTrue(os.listdir(os.path.join(tmp, "cache")))
+            self.assertEqual(reports[-1], (3, 1, 3))
+            with open(output) as f:
+                results = {r["id"]: r for r in map(json.loads, f)}
+            self.assertEqual(results["first"]["count"], 10)
+            self.assertEqual(results["sixth"]["items"][0], "item-00005")
+            self.assertEqual(results["broken"]["status"], "error")
+            summary = run(sites, spec, output, processes=0, progress=False)
+            self.assertEqual(summary["skipped"], 2)
+
+    def test_extract(self):
+        """Test that points are sampled and polygons are masked before the mean"""
+        with tempfile.TemporaryDirectory() as directory:
+            write_cogs(directory)
+            with StubSTAC(make_sampled_items(directory)) as stac:
+                spec = {
+                    "collection": "stub-collection",
+                    "stac": stac.url,
+                    "bands": ["B02"],
+                    "extract": {"resolution": 0.1 / 512, "reducer": "mean"},
+                }
+                point = {"type": "Point", "coordinates": [-76.41, 4.01]}
+                result = run_site(spec, "point", point)
+                self.assertEqual(result["count"], 2)
+                self.assertEqual(
+                    result["values"],
+                    [
+                        {
+                            "band": "B02",
+                            "value": expected(directory, 0, "B02", -76.41, 4.01),
+                        }
+                    ],
+                )
+                result = run_site(spec, "polygon", square(-76.5))
+                value = result["values"][0]["value"]
+            with rasterio.open(os.path.join(directory, "0_B02.tif")) as src:
+                values = src.read(1)
+                inside = geometry_mask(
+                    [square(-76.5)], values.shape, src.transform, invert=True
+                )
+        # The stack grid is not aligned with the COG grid, so rows can shift by a pixel
+        self.assertAlmostEqual(value, values[inside].mean(), delta=512)
+        box = values[inside.any(1)][:, inside.any(0)]
+        self.assertGreater(abs(value - box.mean()), 512)
+
+    def test_main(self):
+        """Test the command line over a process pool"""
+        features = [
+            {"type": "Feature", "properties": {"site": s}, "geometry": g}
+            for s, g in sites[:2]
+        ]
+        with StubSTAC(make_items(100)) as stac, tempfile.TemporaryDirectory() as tmp:
+            aois = os.path.join(tmp, "sites.geojson")
+            with open(aois, "w") as f:
+                json.dump({"type": "FeatureCollection", "features": features}, f)
+            spec = os.path.join(tmp, "spec.json")
+            with open(spec, "w") as f:
+                json.dump({"collection": "stub-collection", "stac": stac.url}, f)
+            output = os.path.join(tmp, "results.ndjson")
+            args = [aois, spec, "-o", output, "--id-column", "site", "--quiet"]
+            self.assertEqual(main(args + ["--processes", "2", "--batch-size", "1"]), 0)
+            with open(output) as f:
+                ids = sorted(json.loads(line)["id"] for line in f)
+        self.assertEqual(ids, ["first", "sixth"])
+
+
+if __name__ == "__main__":
+    unittest.main()
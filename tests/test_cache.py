@@ -0,0 +1,101 @@
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import xarray as xr
+from geojson import Polygon
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+from easystac.cache import FileCache, SQLiteCache, query_key
+
+geom = Polygon([[[-76.5, 4.0], [-76.0, 4.0], [-76.0, 4.1], [-76.5, 4.1], [-76.5, 4.0]]])
+
+
+class Test(unittest.TestCase):
+    """Tests for the STAC search results cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        es.set_cache(None)
+        self.tmp.cleanup()
+
+    def test_query_key(self):
+        """Test that the query key does not depend on the parameters order"""
+        a = query_key("http://stac/", {"datetime": "2020", "collections": ["a"]})
+        b = query_key("http://stac", {"collections": ["a"], "datetime": "2020"})
+        c = query_key("http://stac", {"collections": ["b"], "datetime": "2020"})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_backends(self):
+        """Test TTL and size-based eviction of both backends"""
+        for cache in [
+            SQLiteCache(self.tmp.name + "/cache.sqlite", ttl=None, max_size=None),
+            FileCache(self.tmp.name + "/files", ttl=None, max_size=None),
+        ]:
+            cache.set("a", [{"id": "a"}])
+            self.assertEqual(cache.get("a"), [{"id": "a"}])
+            self.assertIsNone(cache.get("b"))
+            cache.ttl = 0.01
+            time.sleep(0.05)
+            self.assertIsNone(cache.get("a"))
+            cache.ttl = None
+            cache.max_size = 1
+            cache.set("a", [{"id": "a"}])
+            cache.set("b", [{"id": "b"}])
+            self.assertIsNone(cache.get("a"))
+
+    def test_connections_closed(self):
+        """Test that the SQLite connections are closed after each operation"""
+        connections = []
+        connect = sqlite3.connect
+
+        def tracked(*args, **kwargs):
+            connections.append(connect(*args, **kwargs))
+            return connections[-1]
+
+        with mock.patch("sqlite3.connect", tracked):
+            cache = SQLiteCache(self.tmp.name + "/cache.sqlite")
+            cache.set("a", [{"id": "a"}])
+            self.assertEqual(cache.get("a"), [{"id": "a"}])
+        self.assertEqual(len(connections), 3)
+        for con in connections:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                con.execute("SELECT 1")
+
+    def test_corrupt_entry(self):
+        """Test that a corrupt file entry is a cache miss"""
+        cache = FileCache(self.tmp.name + "/files")
+        cache.set("a", [{"id": "a"}])
+        cache._path("a").write_bytes(b"not compressed")
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", [{"id": "a"}])
+        self.assertEqual(cache.get("a"), [{"id": "a"}])
+
+    def test_getInfo_cached(self):
+        """Test that a repeated query does not hit the STAC"""
+        es.set_cache(SQLiteCache(self.tmp.name + "/cache.sqlite"))
+        with StubSTAC(make_items(30)) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterBounds(geom)
+                .filterDate("2020-01-01", "2020-01-20")
+            )
+            first = collection.getInfo()
+            searches = stac.searches
+            second = collection.getInfo()
+            self.assertEqual(stac.searches, searches)
+            collection.getInfo(cache=False)
+            self.assertGreater(stac.searches, searches)
+        self.assertIsInstance(second, xr.DataArray)
+        self.assertEqual(first.shape, second.shape)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+from easystac import client
+
+
+class Test(unittest.TestCase):
+    """Tests for the STAC clients registry."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_reuse(self):
+        """Test that the landing page is only requested once per client"""
+        with StubSTAC(make_items(20)) as stac:
+            collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+            collection.getInfo(cache=False)
+            landing = [r for r in stac.requests if r[1] == "/"]
+            collection.filterDate("2020-01-01", "2020-01-05").getInfo(cache=False)
+            self.assertEqual(
+                len([r for r in stac.requests if r[1] == "/"]), len(landing)
+            )
+            self.assertIs(es.open_client(stac.url), es.open_client(stac.url + "/"))
+            self.assertIsNot(
+                es.open_client(stac.url), es.open_client(stac.url, {"key": "a"})
+            )
+            client = es.open_client(stac.url)
+            self.assertIsNot(es.open_client(stac.url, refresh=True), client)
+            es.clear_clients()
+            es.set_pool_size(4)
+            self.assertEqual(es.client.get_adapter()._pool_maxsize, 4)
+
+    def test_retries(self):
+        """Test that failed pages are retried honoring Retry-After"""
+        backoff, client.BACKOFF = client.BACKOFF, 0.01
+        try:
+            with StubSTAC(make_items(30)) as stac:
+                collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+                search = collection._search(url=stac.url)
+                pages = search.pages_as_dicts()
+                first = next(pages)
+                stac.failures += [(429, "1"), (503, None)]
+                start = time.perf_counter()
+                items = first["features"] + [i for p in pages for i in p["features"]]
+                self.assertGreaterEqual(time.perf_counter() - start, 1)
+                self.assertEqual(len(items), 30)
+                self.assertEqual(stac.searches, 5)
+        finally:
+            client.BACKOFF = backoff
+
+    def test_retry_after_capped(self):
+        """Test that a long Retry-After is capped to the maximum backoff"""
+        maximum, client.MAX_BACKOFF = client.MAX_BACKOFF, 0.1
+        try:
+            with StubSTAC(make_items(10)) as stac:
+                stac.failures += [(429, "86400"), (503, "inf")]
+                start = time.perf_counter()
+                collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+                self.assertEqual(len(collection._items(cache=False)), 10)
+                self.assertLess(time.perf_counter() - start, 5)
+        finally:
+            client.MAX_BACKOFF = maximum
+
+    def test_rate_limit(self):
+        """Test that the token bucket limits the rate across threads"""
+        bucket = client.TokenBucket(rate=20, capacity=1)
+        start = time.perf_counter()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.45)
+        with StubSTAC(make_items(30)) as stac:
+            es.set_rate_limit(stac.url, 20, capacity=1)
+            try:
+                collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+                start = time.perf_counter()
+                self.assertEqual(len(collection._items(cache=False)), 30)
+                # Landing page and three pages
+                self.assertGreaterEqual(time.perf_counter() - start, 0.15)
+            finally:
+                es.set_rate_limit(stac.url, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import copy
+import unittest
+
+from geojson import LineString, MultiPoint, Polygon
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+from easystac.dedup import acquisitions, deduplicate
+
+# Covers most of the first tile and a sliver of the second one
+geom = Polygon(
+    [[[-76.49, 4.01], [-76.395, 4.01], [-76.395, 4.09], [-76.49, 4.09], [-76.49, 4.01]]]
+)
+
+
+def reprocessed(items):
+    """Returns the items followed by a newer processing of each of them."""
+    copies = copy.deepcopy(items)
+    for item, new in zip(items, copies):
+        item["properties"]["s2:processing_baseline"] = "04.00"
+        new["properties"]["s2:processing_baseline"] = "05.09"
+        new["id"] = item["id"] + "-reprocessed"
+    return items + copies
+
+
+class Test(unittest.TestCase):
+    """Tests for the de-duplication of scenes before stacking."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_deduplicate(self):
+        """Test that the newest processing and the covering tiles are kept"""
+        items = reprocessed(make_items(5))
+        self.assertEqual(acquisitions(items), [0, 1, 2, 3, 4] * 2)
+        kept = deduplicate(items)
+        self.assertEqual(len(kept), 5)
+        self.assertTrue(all(i["id"].endswith("-reprocessed") for i in kept))
+        # Adjacent tiles of the same acquisition
+        tiles = make_items(10, step_days=0)
+        self.assertEqual(len(set(acquisitions(tiles))), 1)
+        self.assertEqual(len(deduplicate(tiles)), 10)
+        kept = deduplicate(tiles, geometry=geom)
+        self.assertEqual([i["id"] for i in kept], ["item-00000", "item-00001"])
+
+    def test_points(self):
+        """Test that the tiles with points or segments of a line are kept"""
+        tiles = make_items(10, step_days=0)
+        points = MultiPoint([(-76.45, 4.05), (-75.95, 4.05)])
+        kept = deduplicate(reprocessed(tiles), geometry=points)
+        ids = [i["id"] for i in kept]
+        self.assertEqual(ids, ["item-00000-reprocessed", "item-00005-reprocessed"])
+        line = LineString([(-76.45, 4.05), (-76.25, 4.05)])
+        kept = deduplicate(tiles, geometry=line)
+        ids = sorted(i["id"] for i in kept)
+        self.assertEqual(ids, ["item-00000", "item-00001", "item-00002"])
+
+    def test_getInfo(self):
+        """Test that the stack has one time slice per acquisition"""
+        items = reprocessed(
+            make_items(10, step_days=0)
+            + make_items(10, start="2020-02-01", step_days=0)
+        )
+        for i, item in enumerate(items):
+            item["id"] = f"{item['id']}-{i}"
+        with StubSTAC(items, page_size=7) as stac:
+            collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+            self.assertEqual(collection.getInfo(cache=False).sizes["time"], 40)
+            stack = collection.deduplicate().getInfo(cache=False)
+            self.assertEqual(stack.sizes["time"], 20)
+            merged = collection.deduplicate(merge=True).getInfo(cache=False)
+        self.assertEqual(merged.sizes["time"], 2)
+        self.assertEqual(merged.sizes["x"], stack.sizes["x"])
+        self.assertEqual(
+            [str(t)[:10] for t in merged.time.values], ["2020-01-01", "2020-02-01"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+
+import dask.array as da
+import numpy as np
+import pandas as pd
+import pytest
+import rasterio
+import xarray as xr
+from affine import Affine
+
+from easystac.export import write
+
+failing = set()
+
+
+def make_stack():
+    """Returns a chunked (time, band, y, x) stack with 4 x 2 x 2 x 2 chunks."""
+    values = np.arange(4 * 2 * 300 * 300, dtype="float32").reshape(4, 2, 300, 300)
+
+    def check(block, block_info=None):
+        if block_info[0]["chunk-location"] in failing:
+            raise RuntimeError("Read failed")
+        return block
+
+    data = da.from_array(values, chunks=(1, 1, 256, 256)).map_blocks(
+        check, dtype="float32"
+    )
+
+    return xr.DataArray(
+        data,
+        dims=("time", "band", "y", "x"),
+        coords={
+            "time": pd.date_range("2020-01-01", periods=4),
+            "id": ("time", np.array([f"item-{i}" for i in range(4)], dtype=object)),
+            "band": ["B02", "B03"],
+            "y": 4.1 - np.arange(300) * 0.001,
+            "x": -76.5 + np.arange(300) * 0.001,
+        },
+        attrs={
+            "crs": "epsg:4326",
+            "transform": Affine(0.001, 0, -76.5, 0, -0.001, 4.1),
+        },
+    )
+
+
+class Test(unittest.TestCase):
+    """Tests for the resumable exports."""
+
+    def tearDown(self):
+        failing.clear()
+
+    def test_cog(self):
+        """Test that an interrupted export resumes from the manifest"""
+        stack = make_stack()
+        with tempfile.TemporaryDirectory() as path:
+            failing.add((2, 1, 1, 0))
+            with self.assertRaises(RuntimeError):
+                write(stack, path, format="cog", workers=2, in_flight=2)
+            failing.clear()
+            written = write(stack, path, format="cog", workers=2)
+            self.assertLess(written, 32)
+            self.assertEqual(write(stack, path, format="cog"), 0)
+            names = sorted(n for n in os.listdir(path) if n.endswith(".tif"))
+            self.assertEqual(names[0], "00000_2020-01-01T000000.tif")
+            self.assertEqual(len(names), 4)
+            with rasterio.open(os.path.join(path, names[2])) as src:
+                self.assertEqual(src.tags(ns="IMAGE_STRUCTURE")["LAYOUT"], "COG")
+                np.testing.assert_array_equal(src.read(), stack[2].values)
+
+    def test_workers(self):
+        """Test that several processes write disjoint parts of the export"""
+        stack = make_stack()
+        with tempfile.TemporaryDirectory() as path:
+            first = write(stack, path, format="cog", worker=(0, 2))
+            second = write(stack, path, format="cog", worker=(1, 2))
+            self.assertEqual((first, second), (16, 16))
+            self.assertEqual(
+                len([n for n in os.listdir(path) if n.endswith(".tif")]), 4
+            )
+            with self.assertRaises(Exception):
+                write(stack.chunk({"time": 2}), path, format="cog")
+
+    def test_existing(self):
+        """Test that a directory with other files is not overwritten"""
+        stack = make_stack()
+        with tempfile.TemporaryDirectory() as path:
+            os.makedirs(os.path.join(path, "folder"))
+            with open(os.path.join(path, "notes.txt"), "w") as f:
+                f.write("notes")
+            for format in ["zarr", "cog"]:
+                with self.assertRaises(Exception):
+                    write(stack, path, format=format)
+            self.assertEqual(sorted(os.listdir(path)), ["folder", "notes.txt"])
+
+    def test_zarr(self):
+        """Test that the Zarr store matches the stack"""
+        pytest.importorskip("zarr")
+        stack = make_stack()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stack.zarr")
+            self.assertEqual(write(stack, path, workers=2), 32)
+            self.assertEqual(write(stack, path), 0)
+            stored = xr.open_zarr(path)["data"]
+            np.testing.assert_array_equal(stored.values, stack.values)
+            self.assertEqual(list(stored["id"].values), list(stack["id"].values))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import datetime
+import unittest
+
+from stac_stub import CONFORMANCE, StubSTAC, make_items
+
+import easystac as es
+from easystac.filters import Filter, apply_filter
+
+
+class Test(unittest.TestCase):
+    """Tests for the metadata filters."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_evaluate(self):
+        """Test the client-side evaluation of compound filters"""
+        items = make_items(100)
+        items[0]["properties"]["eo:cloud_cover"] = None
+        f = Filter.Or(Filter.lt("eo:cloud_cover", 5), Filter.eq("id", "item-00050"))
+        self.assertEqual(len(apply_filter(items, f)), 5)
+        f = Filter.metadata("eo:cloud_cover", "not_less_than", 95)
+        self.assertEqual(len(apply_filter(items, f)), 5)
+        f = Filter.metadata("id", "not_ends_with", "0")
+        self.assertEqual(len(apply_filter(items, f)), 90)
+        f = Filter.gte("datetime", datetime.datetime(2020, 4, 8, 12))
+        self.assertEqual(len(apply_filter(items, f)), 1)
+        self.assertEqual(f.to_cql2()["args"][1], {"timestamp": "2020-04-08T12:00:00Z"})
+
+    def test_translation(self):
+        """Test the translation to CQL2 and the query extension"""
+        f = Filter.And(Filter.lt("eo:cloud_cover", 20), Filter.gte("eo:cloud_cover", 5))
+        self.assertEqual(f.to_query(), {"eo:cloud_cover": {"lt": 20, "gte": 5}})
+        self.assertEqual(f.to_cql2()["op"], "and")
+        self.assertIsNone(Filter.Or(f, f).to_query())
+
+    def test_pushdown(self):
+        """Test that filters are sent to the STAC only when it supports them"""
+        cases = [
+            (
+                CONFORMANCE + ["https://api.stacspec.org/v1.0.0/item-search#filter"],
+                "filter",
+            ),
+            (
+                CONFORMANCE + ["https://api.stacspec.org/v1.0.0/item-search#query"],
+                "query",
+            ),
+            (CONFORMANCE, None),
+        ]
+        for conformance, parameter in cases:
+            with StubSTAC(make_items(100), conformance=conformance) as stac:
+                items = (
+                    es.ImageCollection("stub-collection")
+                    .fromSTAC(stac.url)
+                    .filterMetadata("eo:cloud_cover", "less_than", 20)
+                    ._items(cache=False)
+                )
+                self.assertEqual(len(items), 20)
+                sent = {k for k in ("filter", "query") if k in stac.queries[0]}
+                self.assertEqual(sent, {parameter} if parameter else set())
+
+    def test_like_wildcards(self):
+        """Test that the wildcards of string filters match literally on the STAC"""
+        items = make_items(10)
+        names = ["T18_NZK", "T18XNZK", "T18%NZK", "T19_NZK"]
+        for item, name in zip(items, names):
+            item["properties"]["tile"] = name
+        conformance = CONFORMANCE + [
+            "https://api.stacspec.org/v1.0.0/item-search#filter"
+        ]
+        with StubSTAC(items, conformance=conformance) as stac:
+            for operator, value, expected in [
+                ("starts_with", "T18_", 1),
+                ("contains", "8%N", 1),
+                ("ends_with", "_NZK", 2),
+            ]:
+                filtered = (
+                    es.ImageCollection("stub-collection")
+                    .fromSTAC(stac.url)
+                    .filterMetadata("tile", operator, value)
+                )
+                self.assertEqual(filtered.size(), expected)
+                self.assertEqual(len(filtered._items(cache=False)), expected)
+                self.assertEqual(
+                    len(apply_filter(items, Filter.metadata("tile", operator, value))),
+                    expected,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import math
+import unittest
+
+from geojson import MultiPolygon
+from shapely.geometry import shape
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+from easystac.geometry import count_vertices, intersecting, prepare_geometry
+
+
+def circle(x, y, radius, n=1000):
+    """Returns the ring of a polygon with n vertices approximating a circle."""
+    ring = [
+        [
+            x + radius * math.cos(2 * math.pi * i / n),
+            y + radius * math.sin(2 * math.pi * i / n),
+        ]
+        for i in range(n)
+    ]
+    return [ring + ring[:1]]
+
+
+# Two detailed polygons inside the first and the last tile of make_items()
+geom = MultiPolygon([circle(-76.45, 4.05, 0.04), circle(-75.55, 4.05, 0.04)])
+
+
+class Test(unittest.TestCase):
+    """Tests for the simplified search geometries."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_prepare_geometry(self):
+        """Test that the cover is simple and covers the geometry"""
+        self.assertEqual(count_vertices(geom), 2002)
+        self.assertIs(prepare_geometry(geom, max_vertices=None), geom)
+        self.assertIs(prepare_geometry(geom, max_vertices=5000), geom)
+        cover = prepare_geometry(geom, max_vertices=50)
+        self.assertLessEqual(count_vertices(cover), 50)
+        self.assertTrue(shape(cover).covers(shape(geom)))
+        items = make_items(10)
+        self.assertEqual(
+            [item["id"] for item in intersecting(items, geom)],
+            ["item-00000", "item-00009"],
+        )
+
+    def test_bbox_3d(self):
+        """Test that items with 3D bboxes are matched by their 2D bounds"""
+        items = make_items(10)
+        for item in items:
+            x0, y0, x1, y1 = item["bbox"]
+            item["bbox"] = [x0, y0, 0.0, x1, y1, 0.0]
+        self.assertEqual(
+            [item["id"] for item in intersecting(items, geom)],
+            ["item-00000", "item-00009"],
+        )
+
+    def test_filterBounds(self):
+        """Test that a complex geometry returns the same items and a clipped stack"""
+        with StubSTAC(make_items(100), page_size=7) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterBounds(geom, max_vertices=50)
+            )
+            items = collection._items(cache=False)
+            pages = [
+                item for page in collection.iterPages(cache=False) for item in page
+            ]
+            size = collection.size()
+            stack = collection.getInfo(cache=False, resolution=0.01)
+        # The stub intersects bounding boxes, so the exact filter is client-side
+        self.assertEqual(len(items), 20)
+        self.assertTrue(all(item["bbox"][0] in (-76.5, -75.6) for item in items))
+        self.assertEqual([i["id"] for i in pages], [i["id"] for i in items])
+        self.assertEqual(size, 20)
+        self.assertGreaterEqual(float(stack.x.min()), -76.5)
+        self.assertLessEqual(float(stack.x.max()), -75.5)
+        self.assertEqual(stack.shape[0], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY = ["stackstac", "xarray", "dask", "rasterio", "pystac_client"]
+
+
+class Test(unittest.TestCase):
+    """Tests for the import time of the package."""
+
+    def test_lazy(self):
+        """Test that importing easystac does not import the heavy dependencies"""
+        script = (
+            "import sys, easystac, easystac.planetary, easystac.radiant\n"
+            f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], check=True, capture_output=True, text=True
+        ).stdout
+        self.assertEqual(output.strip(), "")
+
+    def test_reader(self):
+        """Test that the signing reader is still importable from the signing module"""
+        from easystac.planetary import reader, signing
+
+        self.assertIs(signing.SigningReader, reader.SigningReader)
+
+
+if __name__ == "__main__":
+    unittest.main()
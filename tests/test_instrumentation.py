@@ -0,0 +1,53 @@
+import unittest
+
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+from easystac import instrumentation
+
+
+class Test(unittest.TestCase):
+    """Tests for the query-pipeline instrumentation."""
+
+    def tearDown(self):
+        es.set_instrumentation(False)
+        es.clear_clients()
+
+    def test_summary(self):
+        """Test that getInfo attaches a summary of the stages"""
+        es.set_instrumentation(True)
+        with StubSTAC(make_items(25)) as stac:
+            stack = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .partitionDate(days=10, workers=2)
+                .filterDate("2020-01-01", "2020-01-25")
+                .getInfo(cache=False)
+            )
+        stages = stack.attrs["easystac:summary"].stages()
+        self.assertEqual(stages["client.open"]["count"], 1)
+        self.assertEqual(stages["search"]["count"], 3)
+        self.assertEqual(stages["search"]["items"], 25)
+        self.assertEqual(stages["search.page"]["items"], 25)
+        self.assertGreater(stages["http.request"]["bytes"], 0)
+        self.assertEqual(stages["stack"]["items"], 25)
+
+    def test_callbacks(self):
+        """Test the exporters and that nothing is recorded when disabled"""
+        counters = es.CounterExporter()
+        es.add_callback(counters)
+        try:
+            with StubSTAC(make_items(15)) as stac:
+                collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+                stack = collection.getInfo(cache=False)
+        finally:
+            es.remove_callback(counters)
+        self.assertNotIn("easystac:summary", stack.attrs)
+        self.assertEqual(counters.counters["easystac_search_page_total"], 2)
+        self.assertEqual(counters.counters["easystac_search_items_total"], 15)
+        self.assertIn("# TYPE easystac_stack_total counter", counters.render())
+        self.assertIs(instrumentation.span("search"), instrumentation._NULL_SPAN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from stac_stub import CONFORMANCE, StubSTAC, make_items
+
+import easystac as es
+
+SORT = "https://api.stacspec.org/v1.0.0/item-search#sort"
+
+
+class Test(unittest.TestCase):
+    """Tests for size(), limit() and first()."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_size(self):
+        """Test the matched count and the fallback count"""
+        with StubSTAC(make_items(250), page_size=100) as stac:
+            collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+            self.assertEqual(collection.size(), 250)
+            self.assertEqual(stac.searches, 1)
+            self.assertEqual(stac.queries[0]["limit"], 1)
+            filtered = collection.filterMetadata("eo:cloud_cover", "<", 10)
+            self.assertEqual(filtered.size(), 30)
+            self.assertEqual(filtered.limit(5).size(), 5)
+
+    def test_limit(self):
+        """Test early termination and sorting with and without the sort extension"""
+        for conformance in [CONFORMANCE + [SORT], CONFORMANCE]:
+            with StubSTAC(
+                make_items(250), page_size=10, conformance=conformance
+            ) as stac:
+                collection = (
+                    es.ImageCollection("stub-collection")
+                    .fromSTAC(stac.url)
+                    .limit(3, "eo:cloud_cover", ascending=False)
+                )
+                items = collection._items(cache=False)
+                self.assertEqual(
+                    [item["properties"]["eo:cloud_cover"] for item in items],
+                    [99, 99, 98],
+                )
+                first = collection.limit(1).first()
+                searches = stac.searches
+                self.assertEqual(first["id"], "item-00000")
+                self.assertEqual(searches, 2 if SORT in conformance else 26)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+
+from geojson import Polygon
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+from easystac.local import open_local, sync, write_items
+
+geom = Polygon(
+    [[[-76.5, 4.0], [-76.25, 4.0], [-76.25, 4.1], [-76.5, 4.1], [-76.5, 4.0]]]
+)
+
+
+class Test(unittest.TestCase):
+    """Tests for the offline local catalogs."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        es.clear_clients()
+        self.tmp.cleanup()
+
+    def test_fromLocal(self):
+        """Test that local queries match the STAC queries"""
+        items = make_items(200)
+        with StubSTAC(items) as stac:
+            remote = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterBounds(geom)
+                .filterDate("2020-02-01", "2020-04-15")
+                .filterMetadata("eo:cloud_cover", ">", 40)
+            )
+            expected = sorted(item["id"] for item in remote._items(cache=False))
+        for name in ["items.ndjson", "items.parquet"]:
+            path = f"{self.tmp.name}/{name}"
+            write_items(items, path)
+            local = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(path)
+                .filterBounds(geom)
+                .filterDate("2020-02-01", "2020-04-15")
+                .filterMetadata("eo:cloud_cover", ">", 40)
+            )
+            self.assertEqual([item["id"] for item in local._items()], expected)
+            self.assertEqual(local.size(), len(expected))
+            self.assertIs(open_local(path), open_local(path))
+
+    def test_end_of_day(self):
+        """Test that an end date includes the whole day"""
+        items = make_items(5)
+        items[1]["properties"]["datetime"] = "2020-01-02T23:59:59.9999995Z"
+        items[2]["properties"]["datetime"] = "2020-01-03T00:00:00Z"
+        path = f"{self.tmp.name}/items.ndjson"
+        write_items(items, path)
+        catalog = open_local(path)
+        ids = [item["id"] for item in catalog.search(datetime="2020-01-01/2020-01-02")]
+        self.assertEqual(ids, ["item-00000", "item-00001"])
+        ids = [item["id"] for item in catalog.search(datetime="2020-01-03")]
+        self.assertEqual(ids, ["item-00002"])
+
+    def test_sync(self):
+        """Test that sync merges new items into the dump"""
+        path = f"{self.tmp.name}/items.ndjson"
+        with StubSTAC(make_items(50)) as stac:
+            collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+            self.assertEqual(
+                sync(collection.filterDate("2020-01-01", "2020-01-10"), path), 10
+            )
+            self.assertEqual(
+                sync(collection.filterDate("2020-01-05", "2020-01-20"), path), 20
+            )
+        self.assertEqual(
+            es.ImageCollection("stub-collection").fromLocal(path).size(), 20
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
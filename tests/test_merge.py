@@ -0,0 +1,98 @@
+import unittest
+
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+
+
+def _items(n, collection, start):
+    items = make_items(n, collection=collection, start=start, step_days=2)
+    for item in items:
+        item["id"] = f"{collection}-{item['id']}"
+    return items
+
+
+class Test(unittest.TestCase):
+    """Tests for the multi-collection merge."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_merge_same_stac(self):
+        """Test that collections of the same STAC are merged in a single search"""
+        items = _items(20, "l30", "2020-01-01") + _items(20, "s30", "2020-01-02")
+        with StubSTAC(items, page_size=100) as stac:
+            merged = (
+                es.ImageCollection("l30")
+                .fromSTAC(stac.url)
+                .filterDate("2020-01-01", "2020-01-20")
+                .merge(
+                    es.ImageCollection("s30")
+                    .fromSTAC(stac.url)
+                    .filterDate("2020-01-01", "2020-01-20")
+                )
+            )
+            result = merged._items(cache=False)
+            self.assertEqual(stac.searches, 1)
+            self.assertEqual(stac.queries[0]["collections"], ["l30", "s30"])
+        dates = [item["properties"]["datetime"] for item in result]
+        self.assertEqual(len(result), 20)
+        self.assertEqual(dates, sorted(dates))
+
+    def test_merge_other_stac(self):
+        """Test that collections of other STAC are searched and stacked together"""
+        l30 = _items(10, "l30", "2020-01-01")
+        s30 = _items(10, "s30", "2020-01-02")
+        for item in s30:
+            del item["assets"]["B04"]
+        with StubSTAC(l30) as first, StubSTAC(s30) as second:
+            merged = (
+                es.ImageCollection("l30")
+                .fromSTAC(first.url)
+                .merge(es.ImageCollection("s30").fromSTAC(second.url))
+            )
+            self.assertEqual(merged.size(), 20)
+            result = merged._items(cache=False)
+            self.assertEqual(
+                [item["collection"] for item in result[:4]], ["l30", "s30"] * 2
+            )
+            stack = merged._stack(result, epsg=4326, resolution=0.01)
+        self.assertEqual(list(stack.band.values), ["B02", "B03"])
+        self.assertEqual(len(stack.time), 20)
+
+    def test_merge_bands(self):
+        """Test that the assets are renamed to common names before stacking"""
+        l30 = _items(10, "l30", "2020-01-01")
+        s30 = _items(10, "s30", "2020-01-02")
+        for item in s30:
+            assets = item["assets"]
+            item["assets"] = {"blue": assets["B02"], "red": assets["B04"]}
+        with StubSTAC(l30) as first, StubSTAC(s30) as second:
+            merged = (
+                es.ImageCollection("l30")
+                .fromSTAC(first.url)
+                .merge(es.ImageCollection("s30").fromSTAC(second.url))
+            )
+            result = merged._items(cache=False)
+            with self.assertRaises(Exception) as error:
+                merged._stack(result, epsg=4326, resolution=0.01)
+            self.assertIn("share no assets", str(error.exception))
+            merged = (
+                es.ImageCollection("l30")
+                .fromSTAC(first.url)
+                .merge(
+                    es.ImageCollection("s30").fromSTAC(second.url),
+                    bands={"l30": {"B04": "red", "B03": "green"}},
+                )
+            )
+            stack = merged._stack(result, epsg=4326, resolution=0.01)
+            renamed = merged._harmonize(result, {})
+        self.assertEqual(list(stack.band.values), ["red"])
+        self.assertEqual(len(stack.time), 20)
+        self.assertEqual(sorted(renamed[0]["assets"]), ["green", "red"])
+        self.assertTrue(renamed[0]["assets"]["red"]["href"].endswith("B04.tif"))
+        self.assertEqual(result[0]["assets"].keys(), l30[0]["assets"].keys())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+import xarray as xr
+from geojson import MultiPolygon, Polygon
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+from easystac.partition import split_datetime, split_geometry
+
+geom = Polygon(
+    [[[-76.5, 4.0], [-75.55, 4.0], [-75.55, 4.1], [-76.5, 4.1], [-76.5, 4.0]]]
+)
+
+multi = MultiPolygon(
+    [
+        [[[-76.45, 4.05], [-76.42, 4.05], [-76.42, 4.08], [-76.45, 4.05]]],
+        [[[-75.65, 4.05], [-75.62, 4.05], [-75.62, 4.08], [-75.65, 4.05]]],
+    ]
+)
+
+
+class Test(unittest.TestCase):
+    """Tests for the concurrent search partitioning."""
+
+    def test_split_datetime(self):
+        """Test the datetime sub-windows"""
+        windows = split_datetime("2020-01-01/2020-01-10", 4)
+        self.assertEqual(
+            windows,
+            [
+                "2020-01-01T00:00:00Z/2020-01-04T23:59:59.999999Z",
+                "2020-01-05T00:00:00Z/2020-01-08T23:59:59.999999Z",
+                "2020-01-09T00:00:00Z/2020-01-10T23:59:59.999999Z",
+            ],
+        )
+        self.assertEqual(split_datetime("2020-01-01/..", 4), ["2020-01-01/.."])
+
+    def test_partitionDate(self):
+        """Test that the partitioned search returns the same items"""
+        with StubSTAC(make_items(100), page_size=7) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterDate("2020-01-05", "2020-03-20")
+            )
+            serial = collection._items(cache=False)
+            searches = stac.searches
+            parallel = collection.partitionDate(days=10, workers=3)._items(cache=False)
+            self.assertGreater(stac.searches - searches, 8)
+        self.assertEqual(len(parallel), 76)
+        self.assertEqual(
+            sorted(item["id"] for item in serial), [item["id"] for item in parallel]
+        )
+
+    def test_partitionDate_boundaries(self):
+        """Test that the items between two sub-windows are not lost"""
+        items = make_items(100)
+        items[29]["properties"]["datetime"] = "2020-01-30T23:59:59.5Z"
+        with StubSTAC(items) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterDate("2020-01-01", "2020-03-01")
+            )
+            serial = collection._items(cache=False)
+            parallel = collection.partitionDate(days=30)._items(cache=False)
+        ids = [item["id"] for item in parallel]
+        self.assertIn("item-00029", ids)
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(sorted(item["id"] for item in serial), sorted(ids))
+
+    def test_split_geometry(self):
+        """Test the geometry parts and tiles"""
+        self.assertEqual(len(split_geometry(multi)), 2)
+        self.assertEqual(len(split_geometry(geom)), 1)
+        self.assertEqual(len(split_geometry(geom, (4, 1))), 4)
+
+    def test_partitionBounds(self):
+        """Test that the tiled search returns the same items"""
+        with StubSTAC(make_items(100)) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterBounds(geom)
+                .filterDate("2020-01-01", "2020-02-15")
+            )
+            serial = collection._items(cache=False)
+            tiled = collection.partitionBounds(tiles=(4, 1), workers=4)
+            self.assertEqual(
+                sorted(item["id"] for item in serial),
+                [item["id"] for item in tiled._items(cache=False)],
+            )
+            parts = collection.filterBounds(multi).partitionBounds()._items(cache=False)
+            self.assertEqual(len(parts), 9)
+            stacks = collection.getTiles(cache=False)
+            self.assertEqual(len(stacks), 2)
+            self.assertIsInstance(stacks[0], xr.DataArray)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+import numpy as np
+from geojson import Point, Polygon
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+from easystac.planner import plan
+
+geom = Polygon([[[-76.5, 4.0], [-75.5, 4.0], [-75.5, 4.1], [-76.5, 4.1], [-76.5, 4.0]]])
+
+
+class Test(unittest.TestCase):
+    """Tests for the stack planner."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_plan(self):
+        """Test that the planned shape and chunks match the stack"""
+        items = make_items(100)
+        small = plan(items, memory=2**30)
+        self.assertEqual(small.kwargs["dtype"], "float32")
+        # Small stacks group several times in each chunk
+        self.assertEqual(small.chunks, (100, 1, 10, 100))
+        large = plan(items, geometry=geom, memory=2**26, resolution=0.00001)
+        self.assertEqual(large.kwargs["bounds_latlon"], (-76.5, 4.0, -75.5, 4.1))
+        self.assertEqual(large.chunks, (1, 1, 1024, 1024))
+        self.assertLessEqual(large.chunk_bytes, 2**26 // 16)
+        kept = plan(items, chunksize=512, dtype="float64", rescale=True)
+        self.assertEqual(kept.kwargs["chunksize"], 512)
+        self.assertEqual(kept.kwargs["dtype"], "float64")
+        self.assertEqual(kept.chunks, (1, 1, 10, 100))
+
+    def test_chunksize(self):
+        """Test the chunksize forms accepted by stackstac"""
+        items = make_items(100)
+        spatial = plan(items, chunksize=(5, 50))
+        self.assertEqual(spatial.chunks, (1, 1, 5, 50))
+        self.assertEqual(spatial.tasks, 100 * spatial.shape[1] * 2 * 2)
+        full = plan(items, chunksize=(-1, 1, 5, -1))
+        self.assertEqual(full.chunks, (100, 1, 5, 100))
+        auto = plan(items, chunksize="auto")
+        self.assertEqual(auto.kwargs["chunksize"], "auto")
+        self.assertEqual(len(auto.chunks), 4)
+        self.assertIsNone(plan(items, chunksize="unknown").tasks)
+
+    def test_dtype(self):
+        """Test that integer dtypes are not given a NaN fill value"""
+        items = make_items(30)
+        planned = plan(items, dtype="uint16")
+        self.assertNotIn("fill_value", planned.kwargs)
+        self.assertNotIn("rescale", planned.kwargs)
+        with StubSTAC(items) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterBounds(geom)
+                .select(["B02"])
+            )
+            stack = collection.getInfo(
+                plan=True, dtype="uint16", fill_value=np.uint16(0), rescale=False
+            )
+        self.assertEqual(stack.dtype, "uint16")
+
+    def test_getInfo(self):
+        """Test that getInfo uses the plan when requested"""
+        with StubSTAC(make_items(30)) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterBounds(geom)
+                .select(["B02", "B03"])
+            )
+            planned = collection.plan()
+            stack = collection.getInfo(plan=True)
+        self.assertEqual(stack.shape[:2], planned.shape[:2])
+        self.assertEqual(stack.data.chunksize, planned.chunks)
+        self.assertEqual(stack.dtype, "float32")
+
+    def test_point(self):
+        """Test that points are planned over the extent of the items"""
+        with StubSTAC(make_items(30)) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterBounds(Point([-76.45, 4.05]))
+            )
+            planned = collection.plan()
+            stack = collection.getInfo(plan=True)
+        self.assertNotIn("bounds_latlon", planned.kwargs)
+        self.assertEqual(stack.shape, planned.shape)
+
+
+if __name__ == "__main__":
+    unittest.main()
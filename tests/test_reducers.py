@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+import xarray as xr
+
+from easystac import reducers
+
+
+def _stack():
+    rng = np.random.default_rng(0)
+    data = rng.random((12, 3, 20, 20))
+    data[data < 0.3] = np.nan
+    stack = xr.DataArray(
+        data,
+        dims=("time", "band", "y", "x"),
+        coords={"band": ["B02", "B03", "B04"], "time": np.arange(12)},
+    )
+    return data, stack.chunk({"time": 3, "band": 1, "y": 10, "x": 10})
+
+
+class Test(unittest.TestCase):
+    """Tests for the temporal reducers."""
+
+    def test_statistics(self):
+        """Test the mean, max, median and percentile reducers"""
+        data, stack = _stack()
+        np.testing.assert_allclose(reducers.mean(stack), np.nanmean(data, 0))
+        np.testing.assert_allclose(reducers.max(stack), np.nanmax(data, 0))
+        median = reducers.median(stack, memory=4000)
+        self.assertEqual(median.chunks[1], (6, 6, 6, 2))
+        np.testing.assert_allclose(median, np.nanmedian(data, 0))
+        percentiles = reducers.percentile(stack, [10, 90])
+        np.testing.assert_allclose(
+            percentiles.sel(percentile=90), np.nanpercentile(data, 90, axis=0)
+        )
+        masked = reducers.mean(stack, mask=lambda s: s > 0.5)
+        np.testing.assert_allclose(
+            masked, np.nanmean(np.where(data > 0.5, data, np.nan), 0)
+        )
+
+    def test_mosaic(self):
+        """Test the first-valid and quality mosaics"""
+        data, stack = _stack()
+        first = np.argmax(~np.isnan(data), axis=0)[None]
+        np.testing.assert_allclose(
+            reducers.mosaic(stack), np.take_along_axis(data, first, 0)[0]
+        )
+        quality = np.where(np.isnan(data[:, 1]), -np.inf, data[:, 1])
+        best = np.broadcast_to(np.argmax(quality, 0)[None, None], (1, 3, 20, 20))
+        result = reducers.qualityMosaic(stack, "B03")
+        self.assertEqual(result.dims, ("band", "y", "x"))
+        np.testing.assert_allclose(result, np.take_along_axis(data, best, 0)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
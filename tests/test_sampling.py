@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import rasterio
+from geojson import Feature, FeatureCollection, Point
+from rasterio.transform import from_bounds
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+from easystac.sampling import sample
+
+BANDS = ["B02", "B03"]
+
+points = FeatureCollection(
+    [
+        Feature(id="a", geometry=Point([-76.499, 4.099])),
+        Feature(id="b", geometry=Point([-76.41, 4.01])),
+        Feature(id="c", geometry=Point([-76.35, 4.05])),
+        Feature(id="outside", geometry=Point([-70.0, 4.05])),
+    ]
+)
+
+
+def write_cogs(directory, size=512):
+    """Writes one COG per tile and band whose values encode the row and column."""
+    values = np.arange(size * size, dtype="int32").reshape(size, size)
+    for tile in range(2):
+        x = -76.5 + tile * 0.1
+        for b, band in enumerate(BANDS):
+            with rasterio.open(
+                os.path.join(directory, f"{tile}_{band}.tif"),
+                "w",
+                driver="COG",
+                width=size,
+                height=size,
+                count=1,
+                dtype="int32",
+                crs="EPSG:4326",
+                transform=from_bounds(x, 4.0, x + 0.1, 4.1, size, size),
+                blocksize=256,
+            ) as dst:
+                dst.write(values + b, 1)
+
+
+def make_sampled_items(directory):
+    """Returns three items (two dates of the first tile, one of the second one)."""
+    items = make_items(12)
+    items = [items[0], items[10], items[1]]
+    for item in items:
+        tile = 0 if item["bbox"][0] == -76.5 else 1
+        for band in BANDS:
+            item["assets"][band]["href"] = os.path.join(directory, f"{tile}_{band}.tif")
+    return items
+
+
+def expected(directory, tile, band, x, y):
+    """Reads a value with rasterio, for comparison."""
+    with rasterio.open(os.path.join(directory, f"{tile}_{band}.tif")) as src:
+        return float(next(src.sample([(x, y)]))[0])
+
+
+class Test(unittest.TestCase):
+    """Tests for the point sampling."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_sample(self):
+        """Test that only the blocks with points are read"""
+        counters = es.CounterExporter()
+        es.add_callback(counters)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                write_cogs(directory)
+                table = sample(make_sampled_items(directory), points, bands=BANDS)
+                b = table[table["point"] == "b"].iloc[0]
+                self.assertEqual(b["B02"], expected(directory, 0, "B02", -76.41, 4.01))
+                self.assertEqual(b["B03"], expected(directory, 0, "B03", -76.41, 4.01))
+                a = table.iloc[0]["B02"]
+                self.assertEqual(a, expected(directory, 0, "B02", -76.499, 4.099))
+        finally:
+            es.remove_callback(counters)
+        self.assertEqual(list(table["point"]), ["a", "a", "b", "b", "c"])
+        self.assertEqual(list(table["id"][:2]), ["item-00000", "item-00010"])
+        # 6 assets are read: 2 blocks per asset of the first tile (a and b) and 1 of
+        # the second one (c), out of 4 blocks per asset
+        self.assertEqual(counters.counters["easystac_sample_read_total"], 6)
+        self.assertEqual(counters.counters["easystac_sample_read_blocks_total"], 10)
+
+    def test_getTimeSeries(self):
+        """Test the time series of a collection"""
+        with tempfile.TemporaryDirectory() as directory:
+            write_cogs(directory)
+            with StubSTAC(make_sampled_items(directory)) as stac:
+                collection = (
+                    es.ImageCollection("stub-collection")
+                    .fromSTAC(stac.url)
+                    .select(["B03"])
+                )
+                series = collection.getTimeSeries(points)
+        self.assertEqual(list(series.data_vars), ["B03"])
+        self.assertEqual(series["B03"].shape, (3, 3))
+        self.assertEqual(series["B03"].sel(point="c").count(), 1)
+
+    def test_nodata(self):
+        """Test that nodata values of integer COGs are returned as NaN"""
+        with tempfile.TemporaryDirectory() as directory:
+            href = os.path.join(directory, "B02.tif")
+            values = np.arange(256 * 256, dtype="uint16").reshape(256, 256)
+            with rasterio.open(
+                href,
+                "w",
+                driver="COG",
+                width=256,
+                height=256,
+                count=1,
+                dtype="uint16",
+                nodata=0,
+                crs="EPSG:4326",
+                transform=from_bounds(-76.5, 4.0, -76.4, 4.1, 256, 256),
+            ) as dst:
+                dst.write(values, 1)
+            item = make_items(1)[0]
+            item["assets"]["B02"]["href"] = href
+            table = sample([item], [(-76.4999, 4.0999), (-76.41, 4.01)], ["B02"])
+            with rasterio.open(href) as src:
+                value = float(next(src.sample([(-76.41, 4.01)]))[0])
+        self.assertTrue(np.isnan(table["B02"][0]))
+        self.assertEqual(table["B02"][1], value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import tempfile
+import unittest
+
+from stac_stub import CONFORMANCE, StubSTAC, make_items
+
+import easystac as es
+
+
+class Test(unittest.TestCase):
+    """Tests for the incrementally refreshed saved queries."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        es.clear_clients()
+        self.tmp.cleanup()
+
+    def test_refresh_datetime(self):
+        """Test that a refresh only fetches the items after the datetime watermark"""
+        items = make_items(30)
+        with StubSTAC(items[:20]) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterDate("2020-01-01", "2021-01-01")
+            )
+            saved = collection.save(self.tmp.name)
+            self.assertEqual(saved.refresh(), 20)
+            stac.items = items
+            stac.queries.clear()
+            self.assertEqual(saved.refresh(), 10)
+            self.assertTrue(
+                stac.queries[0]["datetime"].startswith("2020-01-20T00:00:00Z/2021")
+            )
+            self.assertEqual(saved.refresh(), 0)
+        reloaded = es.SavedQuery(collection, self.tmp.name)
+        self.assertEqual(reloaded.state["size"], 30)
+        self.assertEqual(
+            [item["id"] for item in reloaded.items()], [item["id"] for item in items]
+        )
+
+    def test_refresh_updated(self):
+        """Test that a refresh uses an updated filter when the STAC supports it"""
+        items = make_items(20)
+        for item in items:
+            item["properties"]["updated"] = "2021-01-01T00:00:00Z"
+        conformance = CONFORMANCE + [
+            "https://api.stacspec.org/v1.0.0/item-search#filter"
+        ]
+        with StubSTAC(items, conformance=conformance) as stac:
+            saved = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .save(self.tmp.name)
+            )
+            self.assertEqual(saved.refresh(), 20)
+            items[3]["properties"]["updated"] = "2021-02-01T00:00:00Z"
+            items[3]["properties"]["eo:cloud_cover"] = 50
+            stac.queries.clear()
+            self.assertEqual(saved.refresh(), 1)
+            updated = stac.queries[0]["filter"]["args"][0]
+            self.assertEqual(updated["args"][1], {"timestamp": "2021-01-01T00:00:00Z"})
+            # New items without an updated property are found by their datetime
+            stac.items = items + make_items(21)[20:]
+            self.assertEqual(saved.refresh(), 1)
+        self.assertEqual(saved.items()[3]["properties"]["eo:cloud_cover"], 50)
+        self.assertEqual(saved.state["updated"], "2021-02-01T00:00:00Z")
+        self.assertEqual(saved.state["size"], 21)
+
+    def test_refresh_empty(self):
+        """Test that a query that found no items fetches all the items again"""
+        items = make_items(20)
+        with StubSTAC([]) as stac:
+            collection = (
+                es.ImageCollection("stub-collection")
+                .fromSTAC(stac.url)
+                .filterDate("2020-01-01", "2021-01-01")
+            )
+            saved = collection.save(self.tmp.name)
+            self.assertEqual(saved.refresh(), 0)
+            self.assertIsNone(saved.state["datetime"])
+            self.assertEqual(saved.refresh(), 0)
+            stac.items = items
+            stac.queries.clear()
+            self.assertEqual(saved.refresh(), 20)
+            self.assertTrue(stac.queries[0]["datetime"].startswith("2020-01-01"))
+        self.assertEqual(saved.state["size"], 20)
+
+    def test_refresh_interval(self):
+        """Test that changing the datetime interval fetches all the items again"""
+        with StubSTAC(make_items(30)) as stac:
+            collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+            saved = collection.filterDate("2020-01-11", "2020-01-20").save(
+                self.tmp.name
+            )
+            self.assertEqual(saved.refresh(), 10)
+            saved = collection.filterDate("2020-01-01", "2020-01-15").save(
+                self.tmp.name
+            )
+            self.assertEqual(saved.refresh(), 15)
+        ids = [item["id"] for item in saved.items()]
+        self.assertEqual(ids, [f"item-{i:05d}" for i in range(15)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import xarray as xr
+from stac_stub import CONFORMANCE, StubSTAC, make_items
+
+import easystac as es
+
+FIELDS = "https://api.stacspec.org/v1.0.0/item-search#fields"
+
+
+class Test(unittest.TestCase):
+    """Tests for the asset and property selection."""
+
+    def tearDown(self):
+        es.clear_clients()
+
+    def test_select(self):
+        """Test that only the selected assets and properties are retrieved"""
+        items = make_items(20)
+        for item in items:
+            item["properties"]["platform"] = "stub"
+        for conformance in [CONFORMANCE + [FIELDS], CONFORMANCE]:
+            with StubSTAC(items, conformance=conformance) as stac:
+                collection = (
+                    es.ImageCollection("stub-collection")
+                    .fromSTAC(stac.url)
+                    .filterMetadata("eo:cloud_cover", "<", 10)
+                    .select(["B02", "B04"], properties=[])
+                )
+                selected = collection._items(cache=False)
+                self.assertEqual(FIELDS in conformance, "fields" in stac.queries[0])
+                result = collection.getInfo(cache=False)
+            self.assertEqual(len(selected), 10)
+            self.assertEqual(set(selected[0]["assets"]), {"B02", "B04"})
+            self.assertIn("eo:cloud_cover", selected[0]["properties"])
+            self.assertIn("proj:transform", selected[0]["properties"])
+            self.assertNotIn("platform", selected[0]["properties"])
+            self.assertIsInstance(result, xr.DataArray)
+            self.assertEqual(list(result.band.values), ["B02", "B04"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import datetime
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from rasterio.enums import Resampling
+from stac_stub import make_items
+from stackstac.raster_spec import RasterSpec
+
+import easystac.planetary as pc
+from easystac.planetary.reader import SigningReader
+from easystac.planetary.signing import href_expiry, sign_href, sign_items
+
+
+class TokenEndpoint:
+    """Local stand-in for the Planetary Computer SAS token endpoint."""
+
+    def __init__(self, minutes=60):
+        self.minutes = minutes
+        self.requests = []
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                endpoint.requests.append(self.path)
+                expiry = datetime.datetime.now(
+                    datetime.timezone.utc
+                ) + datetime.timedelta(minutes=endpoint.minutes)
+                se = expiry.strftime("%Y-%m-%dT%H:%M:%SZ")
+                payload = json.dumps(
+                    {
+                        "msft:expiry": se,
+                        "token": f"se={se}&sp=rl&sig=n{len(endpoint.requests)}",
+                    }
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/token"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class Test(unittest.TestCase):
+    """Tests for the batched Planetary Computer signing."""
+
+    def setUp(self):
+        self.endpoint = TokenEndpoint()
+        self.default = pc.get_token_cache()
+
+    def tearDown(self):
+        pc.set_token_cache(self.default)
+        self.endpoint.close()
+
+    def test_sign_items(self):
+        """Test that one token is requested per container"""
+        pc.set_token_cache(pc.TokenCache(url=self.endpoint.url))
+        items = sign_items(make_items(50))
+        self.assertEqual(self.endpoint.requests, ["/token/stub/data"])
+        href = items[0]["assets"]["B02"]["href"]
+        self.assertTrue(href.endswith("sig=n1"))
+        self.assertIsNotNone(href_expiry(href))
+        sign_items(make_items(10))
+        self.assertEqual(len(self.endpoint.requests), 1)
+
+    def test_resign(self):
+        """Test that expired tokens are refreshed, also from the disk cache"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.endpoint.minutes = 1
+            pc.set_token_cache(
+                pc.TokenCache(url=self.endpoint.url, path=tmp + "/t.json")
+            )
+            href = sign_items(make_items(1))[0]["assets"]["B02"]["href"]
+            self.endpoint.minutes = 60
+            self.assertTrue(sign_href(href).endswith("sig=n2"))
+            pc.set_token_cache(
+                pc.TokenCache(url=self.endpoint.url, path=tmp + "/t.json")
+            )
+            self.assertTrue(sign_href(href).endswith("sig=n2"))
+            self.assertEqual(len(self.endpoint.requests), 2)
+
+    def test_reader(self):
+        """Test that the reader re-signs an expired href when it is created"""
+        self.endpoint.minutes = 1
+        pc.set_token_cache(pc.TokenCache(url=self.endpoint.url))
+        href = sign_items(make_items(1))[0]["assets"]["B02"]["href"]
+        self.endpoint.minutes = 60
+        reader = SigningReader(
+            url=href,
+            spec=RasterSpec(4326, (-76.5, 4.0, -76.4, 4.1), (0.001, 0.001)),
+            resampling=Resampling.nearest,
+            dtype=np.dtype("float32"),
+            fill_value=np.nan,
+            scale_offset=(1, 0),
+        )
+        self.assertTrue(reader.url.endswith("sig=n2"))
+        self.assertEqual(reader.url.split("?")[0], href.split("?")[0])
+        self.assertEqual(len(self.endpoint.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
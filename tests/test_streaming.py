@@ -0,0 +1,29 @@
+import unittest
+
+import xarray as xr
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+
+
+class Test(unittest.TestCase):
+    """Tests for the streaming iteration API."""
+
+    def test_iterPages(self):
+        """Test that pages are yielded as they are received"""
+        with StubSTAC(make_items(25), page_size=10) as stac:
+            collection = es.ImageCollection("stub-collection").fromSTAC(stac.url)
+            pages = collection.iterPages(cache=False)
+            self.assertEqual(len(next(pages)), 10)
+            searches = stac.searches
+            self.assertEqual([len(page) for page in pages], [10, 5])
+            self.assertGreater(stac.searches, searches)
+            ids = [item["id"] for item in collection.iterItems(cache=False)]
+            self.assertEqual(len(set(ids)), 25)
+            stacks = list(collection.iterInfo(size=12, cache=False))
+        self.assertEqual([s.sizes["time"] for s in stacks], [12, 12, 1])
+        self.assertIsInstance(stacks[0], xr.DataArray)
+
+
+if __name__ == "__main__":
+    unittest.main()
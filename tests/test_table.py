@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+
+import numpy as np
+import xarray as xr
+from stac_stub import StubSTAC, make_items
+
+import easystac as es
+
+
+class Test(unittest.TestCase):
+    """Tests for the columnar item table."""
+
+    def test_table(self):
+        """Test filtering, sorting, grouping and stacking"""
+        items = make_items(40)
+        del items[3]["assets"]["B04"]
+        items[5]["properties"]["eo:cloud_cover"] = None
+        table = es.ItemTable.from_items(items)
+        self.assertEqual(len(table), 40)
+        self.assertIsNone(table["href:B04"][3])
+        clear = table.filter(table["eo:cloud_cover"] < 10)
+        self.assertEqual(len(clear), 9)
+        ordered = table.sort("eo:cloud_cover", ascending=False)
+        self.assertEqual(ordered["eo:cloud_cover"][0], 39)
+        self.assertTrue(np.isnan(ordered["eo:cloud_cover"][-1]))
+        self.assertEqual(len(table.intersects((-76.45, 4.0, -76.35, 4.1))), 8)
+        groups = table.groupby("datetime", freq="M")
+        self.assertEqual([len(g) for g in groups.values()], [31, 9])
+        self.assertIsInstance(clear.stack(), xr.DataArray)
+        self.assertEqual(clear.to_items()[0], items[0])
+
+    def test_parquet(self):
+        """Test the round trip to Parquet"""
+        with StubSTAC(make_items(25)) as stac:
+            table = es.ImageCollection("stub-collection").fromSTAC(stac.url).getTable()
+        with tempfile.TemporaryDirectory() as tmp:
+            table.to_parquet(tmp + "/items.parquet")
+            loaded = es.ItemTable.from_parquet(tmp + "/items.parquet")
+        self.assertEqual(loaded.to_items(), table.to_items())
+        np.testing.assert_array_equal(loaded["bbox"], table["bbox"])
+        np.testing.assert_array_equal(loaded["datetime"], table["datetime"])
+        np.testing.assert_array_equal(loaded["eo:cloud_cover"], table["eo:cloud_cover"])
+
+    def test_parquet_strings(self):
+        """Test that numeric-looking strings are kept as strings"""
+        items = make_items(3, collection="100")
+        for i, item in enumerate(items):
+            item["id"] = str(100 + i)
+            item["properties"]["tile"] = f"{i:03d}"
+        table = es.ItemTable.from_items(items, properties=("eo:cloud_cover", "tile"))
+        with tempfile.TemporaryDirectory() as tmp:
+            table.to_parquet(tmp + "/items.parquet")
+            loaded = es.ItemTable.from_parquet(tmp + "/items.parquet")
+        self.assertEqual(list(loaded["id"]), ["100", "101", "102"])
+        self.assertEqual(list(loaded["collection"]), ["100"] * 3)
+        self.assertEqual(list(loaded["tile"]), ["000", "001", "002"])
+        self.assertEqual(loaded["eo:cloud_cover"].dtype, float)
+
+
+if __name__ == "__main__":
+    unittest.main()